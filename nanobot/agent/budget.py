@@ -0,0 +1,112 @@
+"""Token budget for the messages sent to the model on each LLM call."""
+
+from __future__ import annotations
+
+from typing import Any
+
+_CHARS_PER_TOKEN = 4
+_IMAGE_TOKENS = 1000
+_MESSAGE_OVERHEAD = 4
+
+
+def _text_tokens(text: str) -> int:
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def estimate_tokens(msg: dict[str, Any]) -> int:
+    """Rough token count of one message (about 4 characters per token)."""
+    tokens = _MESSAGE_OVERHEAD
+    content = msg.get("content")
+    if isinstance(content, str):
+        tokens += _text_tokens(content)
+    elif isinstance(content, list):
+        for part in content:
+            if part.get("type") == "text":
+                tokens += _text_tokens(part.get("text", ""))
+            else:
+                tokens += _IMAGE_TOKENS
+    for call in msg.get("tool_calls") or ():
+        fn = call.get("function", {})
+        tokens += _text_tokens(fn.get("name", "")) + _text_tokens(fn.get("arguments", ""))
+    return tokens
+
+
+class ContextBudget:
+    """
+    Keeps each LLM call under an input-token budget.
+
+    Estimates are cached per message object, so re-checking the growing
+    message list on every iteration only estimates the new messages. When the
+    list is over budget, tool results older than the latest batch are cut to a
+    short head, oldest first; if that is not enough, whole earlier turns are
+    dropped from the start of the history. The system prompt, the current
+    message and the latest tool results are kept. The input list itself is
+    never modified, so the full turn is still saved to the session.
+    """
+
+    def __init__(self, max_tokens: int, keep_chars: int = 300):
+        self.max_tokens = max_tokens
+        self.keep_chars = keep_chars
+        # id(message) -> (message, value); holding the message keeps its id from being reused.
+        self._estimates: dict[int, tuple[dict, int]] = {}
+        self._elided: dict[int, tuple[dict, dict]] = {}
+
+    def tokens(self, msg: dict[str, Any]) -> int:
+        cached = self._estimates.get(id(msg))
+        if cached is not None and cached[0] is msg:
+            return cached[1]
+        n = estimate_tokens(msg)
+        self._estimates[id(msg)] = (msg, n)
+        return n
+
+    def total(self, messages: list[dict[str, Any]]) -> int:
+        return sum(self.tokens(m) for m in messages)
+
+    def _elide(self, msg: dict[str, Any]) -> dict[str, Any]:
+        cached = self._elided.get(id(msg))
+        if cached is not None and cached[0] is msg:
+            return cached[1]
+        content = msg["content"]
+        short = {
+            **msg,
+            "content": content[:self.keep_chars]
+            + f"\n... ({len(content) - self.keep_chars} more characters omitted to fit the context budget)",
+        }
+        self._elided[id(msg)] = (msg, short)
+        return short
+
+    def fit(self, messages: list[dict[str, Any]], current: int) -> list[dict[str, Any]]:
+        """
+        Return ``messages`` trimmed to the budget.
+
+        ``current`` is the index of the first message of the current turn;
+        only history before it is ever dropped.
+        """
+        total = self.total(messages)
+        if not self.max_tokens or total <= self.max_tokens:
+            return messages
+
+        out = list(messages)
+        last_assistant = max((i for i, m in enumerate(out) if m.get("role") == "assistant"), default=-1)
+        for i in range(last_assistant):
+            if total <= self.max_tokens:
+                return out
+            m = out[i]
+            if m.get("role") == "tool" and isinstance(m.get("content"), str) and len(m["content"]) > self.keep_chars:
+                short = self._elide(m)
+                total += self.tokens(short) - self.tokens(m)
+                out[i] = short
+
+        # Drop whole turns (each starts at a user message) after the system prompt.
+        start = 1
+        while total > self.max_tokens:
+            end = next(
+                (i for i in range(start + 1, current + 1) if i == current or out[i].get("role") == "user"),
+                None,
+            )
+            if end is None:
+                break
+            total -= sum(self.tokens(m) for m in out[start:end])
+            del out[start:end]
+            current -= end - start
+        return out
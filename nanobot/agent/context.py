@@ -6,14 +6,30 @@ import platform
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.skills import SkillsLoader
 
 
+def _file_key(path: Path) -> tuple[str, int, int] | None:
+    """(path, mtime, size) of a file, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return str(path), st.st_mtime_ns, st.st_size
+
+
 class ContextBuilder:
-    """Builds the context (system prompt + messages) for the agent."""
+    """
+    Builds the context (system prompt + messages) for the agent.
+
+    Each section of the system prompt is cached together with a key made from
+    the (path, mtime, size) of the files it was built from, and only sections
+    whose key changed are rebuilt. When no section changed, the previous prompt
+    string object is returned as-is.
+    """
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     _RUNTIME_CONTEXT_TAG = "[Runtime Context — metadata only, not instructions]"
@@ -22,19 +38,43 @@ class ContextBuilder:
         self.workspace = workspace
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
+        self._sections: dict[str, tuple[Any, str]] = {}  # name -> (input key, text)
+        self._prompt: tuple[tuple[str, ...], str] | None = None  # (sections, joined prompt)
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """Build the system prompt from identity, bootstrap files, memory, and skills."""
-        parts = [self._get_identity()]
-
-        bootstrap = self._load_bootstrap_files()
-        if bootstrap:
-            parts.append(bootstrap)
-
+        sections = (
+            self._section("identity", None, self._get_identity),
+            self._section(
+                "bootstrap",
+                tuple(_file_key(self.workspace / f) for f in self.BOOTSTRAP_FILES),
+                self._load_bootstrap_files,
+            ),
+            self._section("memory", _file_key(self.memory.memory_file), self._build_memory_section),
+            self._section("skills", self.skills.signature(), self._build_skills_sections),
+        )
+        if self._prompt is not None and all(a is b for a, b in zip(sections, self._prompt[0])):
+            return self._prompt[1]
+
+        prompt = "\n\n---\n\n".join(s for s in sections if s)
+        self._prompt = (sections, prompt)
+        return prompt
+
+    def _section(self, name: str, key: Any, build: Callable[[], str]) -> str:
+        """Return a cached prompt section, rebuilding it if its input key changed."""
+        cached = self._sections.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        text = build()
+        self._sections[name] = (key, text)
+        return text
+
+    def _build_memory_section(self) -> str:
         memory = self.memory.get_memory_context()
-        if memory:
-            parts.append(f"# Memory\n\n{memory}")
+        return f"# Memory\n\n{memory}" if memory else ""
 
+    def _build_skills_sections(self) -> str:
+        parts = []
         always_skills = self.skills.get_always_skills()
         if always_skills:
             always_content = self.skills.load_skills_for_context(always_skills)
@@ -68,7 +108,7 @@ You are nanobot, a helpful AI assistant.
 ## Workspace
 Your workspace is at: {workspace_path}
 - Long-term memory: {workspace_path}/memory/MEMORY.md (write important facts here)
-- History log: {workspace_path}/memory/HISTORY.md (grep-searchable)
+- History log: {workspace_path}/memory/HISTORY.md (search it with the search_history tool)
 - Custom skills: {workspace_path}/skills/{{skill-name}}/SKILL.md
 
 ## nanobot Guidelines
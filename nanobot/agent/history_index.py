@@ -0,0 +1,217 @@
+"""Full-text index over HISTORY.md entries and archived session messages."""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    source TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    content, content='entries', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+_ENTRY_TS = re.compile(r"^\[(\d{4}-\d{2}-\d{2})(?:[ T](\d{2}:\d{2}))?")
+_READ_BLOCK = 1024 * 1024
+_FINGERPRINT_BYTES = 4096
+
+
+def _entry_ts(entry: str) -> str:
+    """Timestamp of a history entry from its leading [YYYY-MM-DD HH:MM], else now."""
+    if m := _ENTRY_TS.match(entry):
+        return f"{m.group(1)} {m.group(2) or '00:00'}"
+    return datetime.now().strftime("%Y-%m-%d %H:%M")
+
+
+def _fingerprint(f: BinaryIO, offset: int) -> int:
+    """Checksum of the start and the end of the first ``offset`` bytes of ``f``."""
+    f.seek(0)
+    head = f.read(min(offset, _FINGERPRINT_BYTES))
+    f.seek(max(offset - _FINGERPRINT_BYTES, 0))
+    tail = f.read(min(offset, _FINGERPRINT_BYTES))
+    return zlib.crc32(tail, zlib.crc32(head))
+
+
+def _match_query(query: str) -> str:
+    """Turn free text into an FTS5 query that matches any of its words."""
+    words = re.findall(r"\w+", query)
+    return " OR ".join(f'"{w}"' for w in words)
+
+
+class HistoryIndex:
+    """
+    SQLite FTS5 index of the memory history, ranked with BM25.
+
+    HISTORY.md stays the source of truth: ``sync()`` indexes whatever was
+    appended since the last call, so entries written by other means are
+    picked up too, and a rewritten file (detected by size and a checksum of
+    the indexed part) is re-indexed from scratch. Archived
+    session messages are added directly with ``add_messages()``.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()  # callers may run in worker threads
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            ensure_dir(self.path.parent)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _state(self, key: str) -> int:
+        row = self._db.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _add(self, rows: list[tuple[str, str, str]]) -> None:
+        for ts, source, content in rows:
+            cur = self._db.execute(
+                "INSERT INTO entries (ts, source, content) VALUES (?, ?, ?)", (ts, source, content)
+            )
+            self._db.execute(
+                "INSERT INTO entries_fts (rowid, content) VALUES (?, ?)", (cur.lastrowid, content)
+            )
+
+    def _set_state(self, key: str, value: int) -> None:
+        self._db.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value))
+
+    def _clear_history(self) -> None:
+        self._db.execute("DELETE FROM entries WHERE source = 'history'")
+        self._db.execute("INSERT INTO entries_fts (entries_fts) VALUES ('rebuild')")
+
+    def sync(self, history_file: Path) -> int:
+        """Index entries appended to ``history_file`` since the last sync. Returns how many."""
+        with self._lock:
+            if not history_file.exists():
+                if self._state("history_offset"):
+                    with self._db:
+                        self._clear_history()
+                        self._set_state("history_offset", 0)
+                return 0
+            with open(history_file, "rb") as f:
+                return self._sync(f)
+
+    def _sync(self, f: BinaryIO) -> int:
+        size = os.fstat(f.fileno()).st_size
+        offset = self._state("history_offset")
+        # A file rewritten to the same or a larger size keeps growing past the
+        # old offset, so also check that the indexed part is still the same bytes.
+        stale = size < offset or (offset > 0 and _fingerprint(f, offset) != self._state("history_fingerprint"))
+        if offset == size and not stale:
+            return 0
+        added = 0
+        with self._db:
+            if stale:
+                logger.info("History file was rewritten, rebuilding its index")
+                self._clear_history()
+                offset = 0
+            f.seek(offset)
+            pending = b""
+            while block := f.read(_READ_BLOCK):
+                pending += block
+                # Entries are separated by a blank line; keep an unfinished one for later.
+                cut = pending.rfind(b"\n\n")
+                if cut < 0:
+                    continue
+                done, pending = pending[:cut + 2], pending[cut + 2:]
+                entries = [e.strip() for e in done.decode("utf-8", errors="replace").split("\n\n")]
+                rows = [(_entry_ts(e), "history", e) for e in entries if e]
+                self._add(rows)
+                added += len(rows)
+                offset += len(done)
+            self._set_state("history_offset", offset)
+            self._set_state("history_fingerprint", _fingerprint(f, offset))
+        return added
+
+    def add_messages(self, session_key: str, messages: list[dict[str, Any]]) -> None:
+        """Index the raw messages of a consolidated session window."""
+        rows = []
+        for m in messages:
+            content = m.get("content")
+            if not isinstance(content, str) or not content:
+                continue
+            ts = str(m.get("timestamp") or datetime.now().isoformat())[:16].replace("T", " ")
+            rows.append((ts, f"session:{session_key}", f"{m.get('role', '?')}: {content}"))
+        if rows:
+            with self._lock, self._db:
+                self._add(rows)
+
+    def search(
+        self,
+        query: str,
+        *,
+        since: str | None = None,
+        until: str | None = None,
+        source: str | None = None,
+        limit: int = 10,
+    ) -> list[dict[str, str]]:
+        """
+        Best matches for ``query``, most relevant first.
+
+        ``since``/``until`` are inclusive YYYY-MM-DD dates. ``source`` is
+        "history" or "messages" to search only one kind of entry.
+        """
+        match = _match_query(query)
+        if not match:
+            return []
+        sql = (
+            "SELECT e.ts, e.source, snippet(entries_fts, 0, '**', '**', ' … ', 32) "
+            "FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid WHERE entries_fts MATCH ?"
+        )
+        params: list[Any] = [match]
+        if since:
+            sql += " AND e.ts >= ?"
+            params.append(date.fromisoformat(since).isoformat())
+        if until:
+            sql += " AND e.ts < ?"
+            params.append((date.fromisoformat(until) + timedelta(days=1)).isoformat())
+        if source == "history":
+            sql += " AND e.source = 'history'"
+        elif source == "messages":
+            sql += " AND e.source LIKE 'session:%'"
+        sql += " ORDER BY bm25(entries_fts) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [
+                {"timestamp": ts, "source": src, "snippet": snippet}
+                for ts, src, snippet in self._db.execute(sql, params)
+            ]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_indexes: dict[Path, HistoryIndex] = {}
+
+
+def get_history_index(path: Path) -> HistoryIndex:
+    """Index at ``path``, shared by every MemoryStore and tool in the process."""
+    index = _indexes.get(path)
+    if index is None:
+        index = _indexes[path] = HistoryIndex(path)
+    return index
@@ -5,30 +5,97 @@ from __future__ import annotations
 import asyncio
 import json
 import re
+import time
+import uuid
 from contextlib import AsyncExitStack
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from loguru import logger
 
+from nanobot.agent.budget import ContextBudget
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.memory import MemoryStore
+from nanobot.agent.scheduler import SessionScheduler
 from nanobot.agent.subagent import SubagentManager
 from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
+from nanobot.agent.tools.history import SearchHistoryTool
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
-from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.events import LANES, InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.routing import hedging
 from nanobot.session.manager import Session, SessionManager
 
 if TYPE_CHECKING:
-    from nanobot.config.schema import ChannelsConfig, ExecToolConfig
+    from nanobot.config.schema import (
+        ChannelsConfig,
+        ExecToolConfig,
+        WebFetchConfig,
+        WebSearchConfig,
+    )
     from nanobot.cron.service import CronService
+    from nanobot.utils.http import SharedHttpClient
+
+
+def _is_stop(msg: InboundMessage) -> bool:
+    return msg.content.strip().lower() == "/stop"
+
+
+class _ReplyStream:
+    """
+    Publish streamed text as progressive edits of one outbound message.
+
+    Each LLM call gets a fresh ``stream_id``; channels that support streaming
+    send the first update and edit that message with every later update.
+    Updates are throttled to ``interval`` seconds to stay under platform limits.
+    """
+
+    def __init__(self, bus: MessageBus, msg: InboundMessage, interval: float = 1.0):
+        self._bus = bus
+        self._msg = msg
+        self._interval = interval
+        self.begin()
+
+    def begin(self) -> None:
+        """Start a new streamed message (one per LLM call)."""
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.started = False
+        self._text = ""
+        self._sent_text = ""
+        self._last_sent = 0.0
+
+    @staticmethod
+    def _visible(text: str) -> str:
+        """Strip <think> blocks, including one that is still open."""
+        text = re.sub(r"<think>[\s\S]*?</think>", "", text)
+        if (cut := text.find("<think>")) != -1:
+            text = text[:cut]
+        return text.strip()
+
+    async def update(self, text: str) -> None:
+        self._text = text
+        if time.monotonic() - self._last_sent >= self._interval:
+            await self.flush()
+
+    async def flush(self) -> None:
+        visible = self._visible(self._text)
+        if not visible or visible == self._sent_text:
+            return
+        self._sent_text = visible
+        self._last_sent = time.monotonic()
+        self.started = True
+        meta = dict(self._msg.metadata or {})
+        meta["_stream"] = True
+        meta["_stream_id"] = self.stream_id
+        await self._bus.publish_outbound(OutboundMessage(
+            channel=self._msg.channel, chat_id=self._msg.chat_id, content=visible, metadata=meta,
+        ))
 
 
 class AgentLoop:
@@ -53,6 +120,9 @@ class AgentLoop:
         temperature: float = 0.1,
         max_tokens: int = 4096,
         memory_window: int = 100,
+        max_concurrent_sessions: int = 4,
+        max_background_sessions: int = 1,
+        parallel_tool_calls: bool = True,
         brave_api_key: str | None = None,
         exec_config: ExecToolConfig | None = None,
         cron_service: CronService | None = None,
@@ -60,8 +130,12 @@ class AgentLoop:
         session_manager: SessionManager | None = None,
         mcp_servers: dict | None = None,
         channels_config: ChannelsConfig | None = None,
+        http_client: SharedHttpClient | None = None,
+        web_fetch_config: WebFetchConfig | None = None,
+        web_search_config: WebSearchConfig | None = None,
+        context_budget: int = 0,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, WebFetchConfig, WebSearchConfig
         self.bus = bus
         self.channels_config = channels_config
         self.provider = provider
@@ -71,10 +145,15 @@ class AgentLoop:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.memory_window = memory_window
+        self.context_budget = context_budget
+        self.parallel_tool_calls = parallel_tool_calls
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
+        self.http_client = http_client
+        self.web_fetch_config = web_fetch_config or WebFetchConfig()
+        self.web_search_config = web_search_config or WebSearchConfig()
 
         self.context = ContextBuilder(workspace)
         self.sessions = session_manager or SessionManager(workspace)
@@ -89,6 +168,10 @@ class AgentLoop:
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            parallel_tool_calls=parallel_tool_calls,
+            http_client=http_client,
+            web_fetch_config=self.web_fetch_config,
+            web_search_config=self.web_search_config,
         )
 
         self._running = False
@@ -100,7 +183,7 @@ class AgentLoop:
         self._consolidation_tasks: set[asyncio.Task] = set()  # Strong refs to in-flight tasks
         self._consolidation_locks: dict[str, asyncio.Lock] = {}
         self._active_tasks: dict[str, list[asyncio.Task]] = {}  # session_key -> tasks
-        self._processing_lock = asyncio.Lock()
+        self._scheduler = SessionScheduler(max_concurrent_sessions, max_background_sessions)
         self._register_default_tools()
 
     def _register_default_tools(self) -> None:
@@ -114,8 +197,11 @@ class AgentLoop:
             restrict_to_workspace=self.restrict_to_workspace,
             path_append=self.exec_config.path_append,
         ))
-        self.tools.register(WebSearchTool(api_key=self.brave_api_key))
-        self.tools.register(WebFetchTool())
+        self.tools.register(WebSearchTool.from_config(
+            self.web_search_config, api_key=self.brave_api_key, http=self.http_client,
+        ))
+        self.tools.register(WebFetchTool.from_config(self.web_fetch_config, http=self.http_client))
+        self.tools.register(SearchHistoryTool(MemoryStore(self.workspace)))
         self.tools.register(MessageTool(send_callback=self.bus.publish_outbound))
         self.tools.register(SpawnTool(manager=self.subagents))
         if self.cron_service:
@@ -174,32 +260,65 @@ class AgentLoop:
             return f'{tc.name}("{val[:40]}…")' if len(val) > 40 else f'{tc.name}("{val}")'
         return ", ".join(_fmt(tc) for tc in tool_calls)
 
+    async def _chat_streaming(self, messages: list[dict], stream: _ReplyStream) -> LLMResponse:
+        """Call the provider in streaming mode, forwarding text deltas to the reply stream."""
+        stream.begin()
+        text = ""
+        response: LLMResponse | None = None
+        async for chunk in self.provider.chat_stream(
+            messages=messages,
+            tools=self.tools.get_definitions(),
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        ):
+            if chunk.delta:
+                text += chunk.delta
+                await stream.update(text)
+            if chunk.response is not None:
+                response = chunk.response
+        if response is None:
+            response = LLMResponse(content=text or None)
+        if stream.started:
+            await stream.flush()
+        return response
+
     async def _run_agent_loop(
         self,
         initial_messages: list[dict],
         on_progress: Callable[..., Awaitable[None]] | None = None,
+        stream: _ReplyStream | None = None,
     ) -> tuple[str | None, list[str], list[dict]]:
         """Run the agent iteration loop. Returns (final_content, tools_used, messages)."""
         messages = initial_messages
         iteration = 0
         final_content = None
         tools_used: list[str] = []
+        budget = ContextBudget(self.context_budget)
+        current = len(initial_messages) - 2  # runtime context + user message start the turn
 
         while iteration < self.max_iterations:
             iteration += 1
 
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            request = budget.fit(messages, current)
+            if stream:
+                response = await self._chat_streaming(request, stream)
+            else:
+                response = await self.provider.chat(
+                    messages=request,
+                    tools=self.tools.get_definitions(),
+                    model=self.model,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                )
+            if response.usage:
+                logger.debug("LLM usage: {}", response.usage)
 
             if response.has_tool_calls:
                 if on_progress:
                     clean = self._strip_think(response.content)
-                    if clean:
+                    # Text already shown through the stream isn't repeated as progress.
+                    if clean and not (stream and stream.started):
                         await on_progress(clean)
                     await on_progress(self._tool_hint(response.tool_calls), tool_hint=True)
 
@@ -223,7 +342,11 @@ class AgentLoop:
                     tools_used.append(tool_call.name)
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info("Tool call: {}({})", tool_call.name, args_str[:200])
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                results = await self.tools.execute_batch(
+                    [(tc.name, tc.arguments) for tc in response.tool_calls],
+                    parallel=self.parallel_tool_calls,
+                )
+                for tool_call, result in zip(response.tool_calls, results):
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
@@ -251,18 +374,36 @@ class AgentLoop:
         logger.info("Agent loop started")
 
         while self._running:
-            try:
-                msg = await asyncio.wait_for(self.bus.consume_inbound(), timeout=1.0)
-            except asyncio.TimeoutError:
+            msg = await self._next_message()
+            if msg is None:
                 continue
 
-            if msg.content.strip().lower() == "/stop":
+            if _is_stop(msg):
                 await self._handle_stop(msg)
+                self.bus.ack(msg)
             else:
+                background = msg.lane == "background"
+                self._scheduler.admit(background)
                 task = asyncio.create_task(self._dispatch(msg))
+                task.add_done_callback(lambda _, b=background: self._scheduler.release(b))
                 self._active_tasks.setdefault(msg.session_key, []).append(task)
                 task.add_done_callback(lambda t, k=msg.session_key: self._active_tasks.get(k, []) and self._active_tasks[k].remove(t) if t in self._active_tasks.get(k, []) else None)
 
+    async def _next_message(self) -> InboundMessage | None:
+        """
+        Take the next message the scheduler has room for, or None after a second
+        without one. /stop is always let through so it can reach a busy session.
+        """
+        lanes = self._scheduler.open_lanes()
+        get = asyncio.ensure_future(self.bus.consume_inbound(lanes, match=_is_stop))
+        waiters = {get}
+        if lanes != LANES:
+            waiters.add(asyncio.ensure_future(self._scheduler.wait_for_release()))
+        done, pending = await asyncio.wait(waiters, timeout=1.0, return_when=asyncio.FIRST_COMPLETED)
+        for waiter in pending:
+            waiter.cancel()
+        return get.result() if get in done else None
+
     async def _handle_stop(self, msg: InboundMessage) -> None:
         """Cancel all active tasks and subagents for the session."""
         tasks = self._active_tasks.pop(msg.session_key, [])
@@ -279,9 +420,15 @@ class AgentLoop:
             channel=msg.channel, chat_id=msg.chat_id, content=content,
         ))
 
+    @staticmethod
+    def _dispatch_key(msg: InboundMessage) -> str:
+        """Session key a message will write to (system messages target their origin chat)."""
+        return msg.dispatch_key
+
     async def _dispatch(self, msg: InboundMessage) -> None:
-        """Process a message under the global lock."""
-        async with self._processing_lock:
+        """Process a message, serialized per session and capped globally."""
+        background = msg.lane == "background"
+        async with self._scheduler.slot(self._dispatch_key(msg), background=background):
             try:
                 response = await self._process_message(msg)
                 if response is not None:
@@ -293,6 +440,9 @@ class AgentLoop:
                     ))
             except asyncio.CancelledError:
                 logger.info("Task cancelled for session {}", msg.session_key)
+                if self._running:
+                    # Cancelled by /stop. On shutdown the message stays unacked and is replayed.
+                    self.bus.ack(msg)
                 raise
             except Exception:
                 logger.exception("Error processing message for session {}", msg.session_key)
@@ -300,6 +450,7 @@ class AgentLoop:
                     channel=msg.channel, chat_id=msg.chat_id,
                     content="Sorry, I encountered an error.",
                 ))
+            self.bus.ack(msg)
 
     async def close_mcp(self) -> None:
         """Close MCP connections."""
@@ -364,13 +515,19 @@ class AgentLoop:
         if cmd == "/new":
             lock = self._get_consolidation_lock(session.key)
             self._consolidating.add(session.key)
+            self.sessions.pin(session.key)
             try:
                 async with lock:
-                    snapshot = session.messages[session.last_consolidated:]
+                    snapshot = session.messages_from(session.last_consolidated)
                     if snapshot:
                         temp = Session(key=session.key)
                         temp.messages = list(snapshot)
-                        if not await self._consolidate_memory(temp, archive_all=True):
+                        archived = await self._consolidate_memory(temp, archive_all=True)
+                        if not archived and temp.last_consolidated:
+                            # Keep the chunks already archived so a retry resumes after them.
+                            session.last_consolidated += temp.last_consolidated
+                            self.sessions.save(session)
+                        if not archived:
                             return OutboundMessage(
                                 channel=msg.channel, chat_id=msg.chat_id,
                                 content="Memory archival failed, session not cleared. Please try again.",
@@ -384,6 +541,7 @@ class AgentLoop:
             finally:
                 self._consolidating.discard(session.key)
                 self._prune_consolidation_lock(session.key, lock)
+                self.sessions.unpin(session.key)
 
             session.clear()
             self.sessions.save(session)
@@ -394,9 +552,11 @@ class AgentLoop:
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                                   content="🐈 nanobot commands:\n/new — Start a new conversation\n/stop — Stop the current task\n/help — Show available commands")
 
-        unconsolidated = len(session.messages) - session.last_consolidated
+        unconsolidated = session.message_count - session.last_consolidated
         if (unconsolidated >= self.memory_window and session.key not in self._consolidating):
             self._consolidating.add(session.key)
+            # The task updates this Session object, so keep it cached until done.
+            self.sessions.pin(session.key)
             lock = self._get_consolidation_lock(session.key)
 
             async def _consolidate_and_unlock():
@@ -406,6 +566,7 @@ class AgentLoop:
                 finally:
                     self._consolidating.discard(session.key)
                     self._prune_consolidation_lock(session.key, lock)
+                    self.sessions.unpin(session.key)
                     _task = asyncio.current_task()
                     if _task is not None:
                         self._consolidation_tasks.discard(_task)
@@ -434,9 +595,15 @@ class AgentLoop:
                 channel=msg.channel, chat_id=msg.chat_id, content=content, metadata=meta,
             ))
 
-        final_content, _, all_msgs = await self._run_agent_loop(
-            initial_messages, on_progress=on_progress or _bus_progress,
-        )
+        stream = None
+        if on_progress is None and self.channels_config and self.channels_config.stream_replies:
+            stream = _ReplyStream(self.bus, msg, self.channels_config.stream_interval)
+
+        # Hedged LLM calls cost extra tokens; only spend them where a user is waiting.
+        with hedging(msg.lane == "interactive"):
+            final_content, _, all_msgs = await self._run_agent_loop(
+                initial_messages, on_progress=on_progress or _bus_progress, stream=stream,
+            )
 
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
@@ -451,9 +618,12 @@ class AgentLoop:
             if isinstance(message_tool, MessageTool) and message_tool._sent_in_turn:
                 return None
 
+        meta = dict(msg.metadata or {})
+        if stream and stream.started:
+            # Lets streaming channels replace the partial message with the final reply.
+            meta["_stream_id"] = stream.stream_id
         return OutboundMessage(
-            channel=msg.channel, chat_id=msg.chat_id, content=final_content,
-            metadata=msg.metadata or {},
+            channel=msg.channel, chat_id=msg.chat_id, content=final_content, metadata=meta,
         )
 
     _TOOL_RESULT_MAX_CHARS = 500
@@ -493,9 +663,18 @@ class AgentLoop:
         channel: str = "cli",
         chat_id: str = "direct",
         on_progress: Callable[[str], Awaitable[None]] | None = None,
+        lane: str = "interactive",
     ) -> str:
-        """Process a message directly (for CLI or cron usage)."""
+        """
+        Process a message directly (for CLI or cron usage).
+
+        The turn is scheduled like one from the bus: serialized with other turns
+        of the session, and for ``lane="background"`` limited to the background slots.
+        """
         await self._connect_mcp()
-        msg = InboundMessage(channel=channel, sender_id="user", chat_id=chat_id, content=content)
-        response = await self._process_message(msg, session_key=session_key, on_progress=on_progress)
+        msg = InboundMessage(
+            channel=channel, sender_id="user", chat_id=chat_id, content=content, metadata={"_lane": lane},
+        )
+        async with self._scheduler.slot(session_key, background=lane == "background"):
+            response = await self._process_message(msg, session_key=session_key, on_progress=on_progress)
         return response.content if response else ""
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Iterator
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir
+from nanobot.agent.history_index import get_history_index
+from nanobot.utils.helpers import atomic_write_text, ensure_dir, file_lock
 
 if TYPE_CHECKING:
     from nanobot.providers.base import LLMProvider
@@ -29,26 +31,88 @@ _SAVE_MEMORY_TOOL = [
                         "description": "A paragraph (2-5 sentences) summarizing key events/decisions/topics. "
                         "Start with [YYYY-MM-DD HH:MM]. Include detail useful for grep search.",
                     },
-                    "memory_update": {
-                        "type": "string",
-                        "description": "Full updated long-term memory as markdown. Include all existing "
-                        "facts plus new ones. Return unchanged if nothing new.",
+                    "memory_edits": {
+                        "type": "array",
+                        "description": "Changes to long-term memory. Only list new or changed facts; "
+                        "leave this empty if nothing new was learned.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "old": {
+                                    "type": "string",
+                                    "description": "Exact existing text to replace. Empty to add new text.",
+                                },
+                                "new": {
+                                    "type": "string",
+                                    "description": "Replacement text. Empty to delete the old text.",
+                                },
+                                "section": {
+                                    "type": "string",
+                                    "description": "Heading to add new text under (created if missing).",
+                                },
+                            },
+                        },
                     },
                 },
-                "required": ["history_entry", "memory_update"],
+                "required": ["history_entry"],
             },
         },
     }
 ]
 
+_CHARS_PER_TOKEN = 4
+
+
+def apply_memory_edits(memory: str, edits: list[dict]) -> str:
+    """Apply save_memory edits to the long-term memory text."""
+    for edit in edits:
+        if not isinstance(edit, dict):
+            continue
+        old, new = edit.get("old") or "", edit.get("new") or ""
+        if old:
+            if old not in memory:
+                logger.warning("Memory edit skipped, text not found: {}", old[:80])
+                continue
+            memory = memory.replace(old, new, 1)
+            continue
+        if not new:
+            continue
+        section = (edit.get("section") or "").strip().lstrip("#").strip()
+        heading = f"## {section}"
+        lines = memory.rstrip("\n").split("\n") if memory.strip() else []
+        if section and heading in lines:
+            # Insert at the end of the section, before the next heading of the same or higher level.
+            at = lines.index(heading) + 1
+            while at < len(lines) and not lines[at].startswith(("# ", "## ")):
+                at += 1
+            while at > 0 and not lines[at - 1].strip():
+                at -= 1
+            lines[at:at] = new.rstrip("\n").split("\n")
+        else:
+            if section:
+                lines += ([""] if lines else []) + [heading]
+            lines += new.rstrip("\n").split("\n")
+        memory = "\n".join(lines) + "\n"
+    return memory
+
 
 class MemoryStore:
-    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log)."""
+    """
+    Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log).
+
+    The files are shared by every session, and with a multi-worker gateway by
+    several processes. Writes therefore take a lock file in the memory
+    directory: HISTORY.md appends and index syncs are serialized, and memory
+    edits are re-applied to the current MEMORY.md under the lock rather than
+    to the copy the LLM saw, so concurrent consolidations don't lose updates.
+    """
 
     def __init__(self, workspace: Path):
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
         self.history_file = self.memory_dir / "HISTORY.md"
+        self.lock_file = self.memory_dir / ".lock"
+        self.index = get_history_index(self.memory_dir / "history.db")
 
     def read_long_term(self) -> str:
         if self.memory_file.exists():
@@ -56,11 +120,37 @@ class MemoryStore:
         return ""
 
     def write_long_term(self, content: str) -> None:
-        self.memory_file.write_text(content, encoding="utf-8")
+        with file_lock(self.lock_file):
+            atomic_write_text(self.memory_file, content)
 
     def append_history(self, entry: str) -> None:
-        with open(self.history_file, "a", encoding="utf-8") as f:
-            f.write(entry.rstrip() + "\n\n")
+        with file_lock(self.lock_file):
+            with open(self.history_file, "a", encoding="utf-8") as f:
+                f.write(entry.rstrip() + "\n\n")
+        self.sync_index()
+
+    def sync_index(self) -> None:
+        """Bring the search index up to date with HISTORY.md."""
+        try:
+            with file_lock(self.lock_file):
+                self.index.sync(self.history_file)
+        except Exception:
+            logger.exception("Failed to index memory history")
+
+    def archive_messages(self, session_key: str, messages: list[dict]) -> None:
+        """Index consolidated session messages for search_history."""
+        try:
+            self.index.add_messages(session_key, messages)
+        except Exception:
+            logger.exception("Failed to index archived messages")
+
+    def _update_long_term(self, change: Callable[[str], str]) -> None:
+        """Apply ``change`` to the current MEMORY.md while holding the memory lock."""
+        with file_lock(self.lock_file):
+            memory = self.read_long_term()
+            update = change(memory)
+            if update != memory:
+                atomic_write_text(self.memory_file, update)
 
     def get_memory_context(self) -> str:
         long_term = self.read_long_term()
@@ -74,38 +164,81 @@ class MemoryStore:
         *,
         archive_all: bool = False,
         memory_window: int = 50,
+        chunk_tokens: int = 8000,
     ) -> bool:
-        """Consolidate old messages into MEMORY.md + HISTORY.md via LLM tool call.
+        """Consolidate old messages into MEMORY.md + HISTORY.md via LLM tool calls.
+
+        Each call covers about ``chunk_tokens`` tokens of prompt: the current
+        MEMORY.md (cut short if it outgrows its share) plus a window of
+        messages. ``session.last_consolidated`` advances after every window,
+        so a failure part-way keeps the windows already done.
 
         Returns True on success (including no-op), False on failure.
         """
+        start = session.last_consolidated
         if archive_all:
-            old_messages = session.messages
-            keep_count = 0
-            logger.info("Memory consolidation (archive_all): {} messages", len(session.messages))
+            end = session.message_count
+            logger.info("Memory consolidation (archive_all): {} messages", end - start)
         else:
             keep_count = memory_window // 2
-            if len(session.messages) <= keep_count:
-                return True
-            if len(session.messages) - session.last_consolidated <= 0:
+            if session.message_count <= keep_count:
                 return True
-            old_messages = session.messages[session.last_consolidated:-keep_count]
-            if not old_messages:
+            end = session.message_count - keep_count
+            if end <= start:
                 return True
-            logger.info("Memory consolidation: {} to consolidate, {} keep", len(old_messages), keep_count)
+            logger.info("Memory consolidation: {} to consolidate, {} keep", end - start, keep_count)
+
+        old_messages = session.messages_from(start)[:end - start]
+        # MEMORY.md counts against the budget: it gets what it needs now plus
+        # room to grow, but never more than half; the messages get the rest.
+        memory_tokens = len(self.read_long_term()) // _CHARS_PER_TOKEN
+        memory_budget = min(chunk_tokens // 2, memory_tokens + chunk_tokens // 8)
+        done = 0
+        for offset, lines in self._chunks(old_messages, chunk_tokens - memory_budget):
+            if lines and not await self._consolidate_chunk(lines, provider, model, memory_budget):
+                return False
+            await asyncio.to_thread(self.archive_messages, session.key, old_messages[done:offset])
+            done = offset
+            session.last_consolidated = start + done
+        logger.info("Memory consolidation done: {} messages, last_consolidated={}", session.message_count, session.last_consolidated)
+        return True
 
-        lines = []
-        for m in old_messages:
+    @staticmethod
+    def _chunks(messages: list[dict], chunk_tokens: int) -> Iterator[tuple[int, list[str]]]:
+        """Yield (messages consumed so far, formatted lines) for token-bounded windows."""
+        budget = max(chunk_tokens, 1) * _CHARS_PER_TOKEN
+        lines: list[str] = []
+        size = 0
+        for i, m in enumerate(messages):
             if not m.get("content"):
                 continue
             tools = f" [tools: {', '.join(m['tools_used'])}]" if m.get("tools_used") else ""
-            lines.append(f"[{m.get('timestamp', '?')[:16]}] {m['role'].upper()}{tools}: {m['content']}")
+            line = f"[{m.get('timestamp', '?')[:16]}] {m['role'].upper()}{tools}: {m['content']}"
+            if len(line) > budget:
+                line = line[:budget] + " ... (truncated)"
+            if lines and size + len(line) > budget:
+                yield i, lines
+                lines, size = [], 0
+            lines.append(line)
+            size += len(line)
+        yield len(messages), lines
 
+    async def _consolidate_chunk(
+        self, lines: list[str], provider: LLMProvider, model: str, memory_tokens: int,
+    ) -> bool:
         current_memory = self.read_long_term()
+        shown = current_memory
+        limit = max(memory_tokens, 1) * _CHARS_PER_TOKEN
+        truncated = len(current_memory) > limit
+        if truncated:
+            shown = (
+                current_memory[:limit]
+                + f"\n... ({len(current_memory) - limit} more characters not shown; only edit the text above)"
+            )
         prompt = f"""Process this conversation and call the save_memory tool with your consolidation.
 
 ## Current Long-term Memory
-{current_memory or "(empty)"}
+{shown or "(empty)"}
 
 ## Conversation to Process
 {chr(10).join(lines)}"""
@@ -132,18 +265,36 @@ class MemoryStore:
                 logger.warning("Memory consolidation: unexpected arguments type {}", type(args).__name__)
                 return False
 
-            if entry := args.get("history_entry"):
-                if not isinstance(entry, str):
-                    entry = json.dumps(entry, ensure_ascii=False)
-                self.append_history(entry)
-            if update := args.get("memory_update"):
+            # Memory first: if its update is refused, the chunk is retried later
+            # and must not leave a history entry behind.
+            if edits := args.get("memory_edits"):
+                if isinstance(edits, list):
+                    await asyncio.to_thread(
+                        self._update_long_term, lambda memory: apply_memory_edits(memory, edits),
+                    )
+            # Older prompts asked for the whole memory; still accept a full rewrite.
+            elif update := args.get("memory_update"):
                 if not isinstance(update, str):
                     update = json.dumps(update, ensure_ascii=False)
-                if update != current_memory:
-                    self.write_long_term(update)
+                if truncated:
+                    logger.warning("Memory consolidation: full rewrite of a partly shown MEMORY.md, refusing it")
+                    return False
+                changed = False
+
+                def _rewrite(memory: str) -> str:
+                    nonlocal changed
+                    changed = memory != current_memory
+                    return memory if changed else update
+
+                await asyncio.to_thread(self._update_long_term, _rewrite)
+                if changed:
+                    logger.warning("Memory consolidation: MEMORY.md changed meanwhile, retrying this chunk later")
+                    return False
 
-            session.last_consolidated = 0 if archive_all else len(session.messages) - keep_count
-            logger.info("Memory consolidation done: {} messages, last_consolidated={}", len(session.messages), session.last_consolidated)
+            if entry := args.get("history_entry"):
+                if not isinstance(entry, str):
+                    entry = json.dumps(entry, ensure_ascii=False)
+                await asyncio.to_thread(self.append_history, entry)
             return True
         except Exception:
             logger.exception("Memory consolidation failed")
@@ -0,0 +1,104 @@
+"""Per-session turn scheduler for the agent loop."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager, nullcontext
+from typing import AsyncIterator
+
+from nanobot.bus.events import LANES
+
+
+class SessionScheduler:
+    """
+    Serialize turns within a session while running different sessions concurrently.
+
+    Each session key gets its own lock so that messages from the same chat are
+    processed in arrival order. A global semaphore caps how many sessions may run
+    a turn at the same time. The session lock is taken first so that queued
+    messages for a busy chat never occupy a global slot while they wait.
+
+    Background turns (cron jobs, heartbeat) must also hold one of
+    ``max_background`` background slots, so they can never take up every
+    global slot and starve interactive chats.
+
+    The agent loop admits a message from the bus only while fewer than
+    ``max_concurrent`` admitted turns are unfinished (``max_background`` for
+    background ones), so the backlog waits on the bus, where its bounds and
+    lane priority apply, and not in a growing pile of tasks.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_background: int = 1):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_background = max(1, min(max_background, self.max_concurrent))
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._background = asyncio.Semaphore(self.max_background)
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._users: dict[str, int] = {}  # session_key -> holders + waiters
+        self._running = 0
+        self._admitted = 0
+        self._admitted_background = 0
+        self._released = asyncio.Event()
+
+    @asynccontextmanager
+    async def slot(self, session_key: str, background: bool = False) -> AsyncIterator[None]:
+        """Hold the session lock and one global slot for the duration of a turn."""
+        lock = self._locks.get(session_key)
+        if lock is None:
+            lock = self._locks[session_key] = asyncio.Lock()
+        self._users[session_key] = self._users.get(session_key, 0) + 1
+        try:
+            async with lock, (self._background if background else nullcontext()), self._slots:
+                self._running += 1
+                try:
+                    yield
+                finally:
+                    self._running -= 1
+        finally:
+            remaining = self._users[session_key] - 1
+            if remaining:
+                self._users[session_key] = remaining
+            else:
+                # Nobody holds or waits on this lock any more — drop it.
+                del self._users[session_key]
+                del self._locks[session_key]
+
+    def open_lanes(self) -> tuple[str, ...]:
+        """Bus lanes a new turn may be admitted from without exceeding the caps."""
+        if self._admitted >= self.max_concurrent:
+            return ()
+        if self._admitted_background >= self.max_background:
+            return tuple(lane for lane in LANES if lane != "background")
+        return LANES
+
+    def admit(self, background: bool = False) -> None:
+        """Count a turn taken off the bus until ``release`` is called for it."""
+        self._admitted += 1
+        if background:
+            self._admitted_background += 1
+
+    def release(self, background: bool = False) -> None:
+        """Mark an admitted turn as finished."""
+        self._admitted -= 1
+        if background:
+            self._admitted_background -= 1
+        self._released.set()
+
+    async def wait_for_release(self) -> None:
+        """Wait until an admitted turn finishes."""
+        self._released.clear()
+        await self._released.wait()
+
+    def is_busy(self, session_key: str) -> bool:
+        """Return True if a turn for the session is running or queued."""
+        return session_key in self._users
+
+    @property
+    def running(self) -> int:
+        """Number of turns currently executing."""
+        return self._running
+
+    @property
+    def pending(self) -> int:
+        """Number of turns waiting for their session lock or a global slot."""
+        return sum(self._users.values()) - self._running
@@ -4,88 +4,154 @@ import json
 import os
 import re
 import shutil
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+_FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
+
+
+@dataclass
+class _Skill:
+    """A skill as recorded in the index: file content and parsed frontmatter."""
+
+    name: str
+    path: Path
+    source: str  # "workspace" or "builtin"
+    content: str
+    frontmatter: dict[str, str] | None
+    meta: dict  # nanobot metadata JSON from the frontmatter
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
 
 class SkillsLoader:
     """
     Loader for agent skills.
-    
+
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+
+    All SKILL.md files are read and parsed once into an index, which is rebuilt
+    when a skills directory or a workspace SKILL.md changes on disk. Binary
+    lookups for requirement checks are cached for ``requirements_ttl`` seconds.
     """
-    
-    def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
+
+    def __init__(
+        self,
+        workspace: Path,
+        builtin_skills_dir: Path | None = None,
+        requirements_ttl: float = 30.0,
+    ):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
-    
+        self.requirements_ttl = requirements_ttl
+        self._index: dict[str, _Skill] = {}
+        self._stamps: dict[Path, tuple[int, int] | None] | None = None  # paths the index depends on
+        self._which: dict[str, tuple[float, bool]] = {}  # bin -> (checked at, found)
+
+    def _skills(self) -> dict[str, _Skill]:
+        """Return the skill index, rebuilding it if anything it was built from changed."""
+        if self._stamps is None or any(_stamp(p) != s for p, s in self._stamps.items()):
+            self._rebuild_index()
+        return self._index
+
+    def _rebuild_index(self) -> None:
+        index: dict[str, _Skill] = {}
+        stamps: dict[Path, tuple[int, int] | None] = {}
+        # Workspace skills take priority over built-in ones with the same name.
+        # Built-in skills ship with the package, so only their directory is watched.
+        for root, source in ((self.workspace_skills, "workspace"), (self.builtin_skills, "builtin")):
+            if not root:
+                continue
+            stamps[root] = _stamp(root)
+            if not root.is_dir():
+                continue
+            for skill_dir in root.iterdir():
+                if not skill_dir.is_dir():
+                    continue
+                skill_file = skill_dir / "SKILL.md"
+                if source == "workspace":
+                    stamps[skill_dir] = _stamp(skill_dir)
+                    stamps[skill_file] = _stamp(skill_file)
+                if skill_dir.name in index or not skill_file.is_file():
+                    continue
+                index[skill_dir.name] = self._parse_skill(skill_dir.name, skill_file, source)
+        self._index = index
+        self._stamps = stamps
+
+    def _parse_skill(self, name: str, path: Path, source: str) -> _Skill:
+        content = path.read_text(encoding="utf-8")
+        frontmatter = None
+        if content.startswith("---"):
+            match = _FRONTMATTER_RE.match(content)
+            if match:
+                # Simple YAML parsing
+                frontmatter = {}
+                for line in match.group(1).split("\n"):
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        frontmatter[key.strip()] = value.strip().strip('"\'')
+        meta = self._parse_nanobot_metadata((frontmatter or {}).get("metadata", ""))
+        return _Skill(name=name, path=path, source=source, content=content, frontmatter=frontmatter, meta=meta)
+
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
         List all available skills.
-        
+
         Args:
             filter_unavailable: If True, filter out skills with unmet requirements.
-        
+
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
-        skills = []
-        
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-        
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-        
-        # Filter by requirements
-        if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
-        return skills
-    
+        return [
+            {"name": s.name, "path": str(s.path), "source": s.source}
+            for s in self._skills().values()
+            if not filter_unavailable or self._check_requirements(s.meta)
+        ]
+
     def load_skill(self, name: str) -> str | None:
         """
         Load a skill by name.
-        
+
         Args:
             name: Skill name (directory name).
-        
+
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-        
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-        
-        return None
-    
+        skill = self._skills().get(name)
+        return skill.content if skill else None
+
+    def signature(self) -> tuple:
+        """
+        Fingerprint of everything the skills prompt depends on: the files the
+        index was built from and whether each skill's requirements are met.
+        """
+        skills = self._skills()
+        return (
+            tuple(self._stamps.items()),
+            tuple(self._check_requirements(s.meta) for s in skills.values()),
+        )
+
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
         Load specific skills for inclusion in agent context.
-        
+
         Args:
             skill_names: List of skill names to load.
-        
+
         Returns:
             Formatted skills content.
         """
@@ -95,69 +161,68 @@ class SkillsLoader:
             if content:
                 content = self._strip_frontmatter(content)
                 parts.append(f"### Skill: {name}\n\n{content}")
-        
+
         return "\n\n---\n\n".join(parts) if parts else ""
-    
+
     def build_skills_summary(self) -> str:
         """
         Build a summary of all skills (name, description, path, availability).
-        
+
         This is used for progressive loading - the agent can read the full
         skill content using read_file when needed.
-        
+
         Returns:
             XML-formatted skills summary.
         """
-        all_skills = self.list_skills(filter_unavailable=False)
+        all_skills = list(self._skills().values())
         if not all_skills:
             return ""
-        
+
         def escape_xml(s: str) -> str:
             return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        
+
         lines = ["<skills>"]
         for s in all_skills:
-            name = escape_xml(s["name"])
-            path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
-            available = self._check_requirements(skill_meta)
-            
+            name = escape_xml(s.name)
+            desc = escape_xml((s.frontmatter or {}).get("description") or s.name)
+            available = self._check_requirements(s.meta)
+
             lines.append(f"  <skill available=\"{str(available).lower()}\">")
             lines.append(f"    <name>{name}</name>")
             lines.append(f"    <description>{desc}</description>")
-            lines.append(f"    <location>{path}</location>")
-            
+            lines.append(f"    <location>{s.path}</location>")
+
             # Show missing requirements for unavailable skills
             if not available:
-                missing = self._get_missing_requirements(skill_meta)
+                missing = self._get_missing_requirements(s.meta)
                 if missing:
                     lines.append(f"    <requires>{escape_xml(missing)}</requires>")
-            
+
             lines.append(f"  </skill>")
         lines.append("</skills>")
-        
+
         return "\n".join(lines)
-    
+
+    def _has_bin(self, name: str) -> bool:
+        """shutil.which() with results cached for requirements_ttl seconds."""
+        now = time.monotonic()
+        cached = self._which.get(name)
+        if cached is None or now - cached[0] > self.requirements_ttl:
+            cached = self._which[name] = (now, shutil.which(name) is not None)
+        return cached[1]
+
     def _get_missing_requirements(self, skill_meta: dict) -> str:
         """Get a description of missing requirements."""
         missing = []
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._has_bin(b):
                 missing.append(f"CLI: {b}")
         for env in requires.get("env", []):
             if not os.environ.get(env):
                 missing.append(f"ENV: {env}")
         return ", ".join(missing)
-    
-    def _get_skill_description(self, name: str) -> str:
-        """Get the description of a skill from its frontmatter."""
-        meta = self.get_skill_metadata(name)
-        if meta and meta.get("description"):
-            return meta["description"]
-        return name  # Fallback to skill name
-    
+
     def _strip_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content."""
         if content.startswith("---"):
@@ -165,7 +230,7 @@ class SkillsLoader:
             if match:
                 return content[match.end():].strip()
         return content
-    
+
     def _parse_nanobot_metadata(self, raw: str) -> dict:
         """Parse skill metadata JSON from frontmatter (supports nanobot and openclaw keys)."""
         try:
@@ -173,56 +238,35 @@ class SkillsLoader:
             return data.get("nanobot", data.get("openclaw", {})) if isinstance(data, dict) else {}
         except (json.JSONDecodeError, TypeError):
             return {}
-    
+
     def _check_requirements(self, skill_meta: dict) -> bool:
         """Check if skill requirements are met (bins, env vars)."""
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._has_bin(b):
                 return False
         for env in requires.get("env", []):
             if not os.environ.get(env):
                 return False
         return True
-    
-    def _get_skill_meta(self, name: str) -> dict:
-        """Get nanobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_nanobot_metadata(meta.get("metadata", ""))
-    
+
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
-        result = []
-        for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_nanobot_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
-                result.append(s["name"])
-        return result
-    
+        return [
+            s.name for s in self._skills().values()
+            if (s.meta.get("always") or (s.frontmatter or {}).get("always"))
+            and self._check_requirements(s.meta)
+        ]
+
     def get_skill_metadata(self, name: str) -> dict | None:
         """
         Get metadata from a skill's frontmatter.
-        
+
         Args:
             name: Skill name.
-        
+
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
-            return None
-        
-        if content.startswith("---"):
-            match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-            if match:
-                # Simple YAML parsing
-                metadata = {}
-                for line in match.group(1).split("\n"):
-                    if ":" in line:
-                        key, value = line.split(":", 1)
-                        metadata[key.strip()] = value.strip().strip('"\'')
-                return metadata
-        
-        return None
+        skill = self._skills().get(name)
+        return dict(skill.frontmatter) if skill and skill.frontmatter is not None else None
@@ -4,17 +4,22 @@ import asyncio
 import json
 import uuid
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
+from nanobot.providers.routing import allow_hedging
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.utils.http import SharedHttpClient
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import ExecToolConfig, WebFetchConfig, WebSearchConfig
 
 
 class SubagentManager:
@@ -31,8 +36,12 @@ class SubagentManager:
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
+        parallel_tool_calls: bool = True,
+        http_client: SharedHttpClient | None = None,
+        web_fetch_config: "WebFetchConfig | None" = None,
+        web_search_config: "WebSearchConfig | None" = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, WebFetchConfig, WebSearchConfig
         self.provider = provider
         self.workspace = workspace
         self.bus = bus
@@ -42,6 +51,10 @@ class SubagentManager:
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
+        self.parallel_tool_calls = parallel_tool_calls
+        self.http_client = http_client
+        self.web_fetch_config = web_fetch_config or WebFetchConfig()
+        self.web_search_config = web_search_config or WebSearchConfig()
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
         self._session_tasks: dict[str, set[str]] = {}  # session_key -> {task_id, ...}
     
@@ -85,6 +98,7 @@ class SubagentManager:
         origin: dict[str, str],
     ) -> None:
         """Execute the subagent task and announce the result."""
+        allow_hedging(False)  # inherited from the spawning turn; background work is never hedged
         logger.info("Subagent [{}] starting task: {}", task_id, label)
         
         try:
@@ -101,8 +115,10 @@ class SubagentManager:
                 restrict_to_workspace=self.restrict_to_workspace,
                 path_append=self.exec_config.path_append,
             ))
-            tools.register(WebSearchTool(api_key=self.brave_api_key))
-            tools.register(WebFetchTool())
+            tools.register(WebSearchTool.from_config(
+                self.web_search_config, api_key=self.brave_api_key, http=self.http_client,
+            ))
+            tools.register(WebFetchTool.from_config(self.web_fetch_config, http=self.http_client))
             
             # Build messages with subagent-specific prompt
             system_prompt = self._build_subagent_prompt(task)
@@ -150,7 +166,11 @@ class SubagentManager:
                     for tool_call in response.tool_calls:
                         args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                         logger.debug("Subagent [{}] executing: {} with arguments: {}", task_id, tool_call.name, args_str)
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                    results = await tools.execute_batch(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls],
+                        parallel=self.parallel_tool_calls,
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
@@ -39,6 +39,11 @@ class Tool(ABC):
         """JSON Schema for tool parameters."""
         pass
     
+    @property
+    def concurrency_safe(self) -> bool:
+        """Whether the tool is side-effect-free and may run alongside other safe calls."""
+        return False
+
     @abstractmethod
     async def execute(self, **kwargs: Any) -> str:
         """
@@ -0,0 +1,73 @@
+"""History search tool: full-text search over consolidated memory."""
+
+import asyncio
+from typing import Any
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.tools.base import Tool
+
+
+class SearchHistoryTool(Tool):
+    """Tool to search HISTORY.md and archived conversations."""
+
+    def __init__(self, store: MemoryStore):
+        self._store = store
+
+    @property
+    def name(self) -> str:
+        return "search_history"
+
+    @property
+    def concurrency_safe(self) -> bool:
+        return True
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search past conversations: the summaries in memory/HISTORY.md and the archived messages "
+            "they were made from. Returns the best matches first, with their dates."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Words to search for"},
+                "since": {"type": "string", "description": "Only entries on or after this date (YYYY-MM-DD)"},
+                "until": {"type": "string", "description": "Only entries on or before this date (YYYY-MM-DD)"},
+                "source": {
+                    "type": "string",
+                    "enum": ["all", "history", "messages"],
+                    "description": "history = summaries only, messages = archived messages only",
+                },
+                "limit": {"type": "integer", "description": "Results (1-50)", "minimum": 1, "maximum": 50},
+            },
+            "required": ["query"],
+        }
+
+    async def execute(
+        self,
+        query: str,
+        since: str | None = None,
+        until: str | None = None,
+        source: str = "all",
+        limit: int = 10,
+        **kwargs: Any,
+    ) -> str:
+        def _search() -> list[dict[str, str]]:
+            self._store.sync_index()
+            return self._store.index.search(
+                query, since=since, until=until, source=source, limit=min(max(limit, 1), 50),
+            )
+
+        try:
+            # Syncing takes a file lock and both steps do SQLite I/O; keep them off the event loop.
+            results = await asyncio.to_thread(_search)
+        except ValueError as e:
+            return f"Error: Invalid date: {e}"
+        except Exception as e:
+            return f"Error searching history: {e}"
+        if not results:
+            return f"No history entries match: {query}"
+        return "\n\n".join(f"[{r['timestamp']}] ({r['source']}) {r['snippet']}" for r in results)
@@ -1,5 +1,6 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
@@ -14,14 +15,17 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        self._definitions: list[dict[str, Any]] | None = None
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
         self._tools[tool.name] = tool
+        self._definitions = None
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
-        self._tools.pop(name, None)
+        if self._tools.pop(name, None) is not None:
+            self._definitions = None
     
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -32,8 +36,16 @@ class ToolRegistry:
         return name in self._tools
     
     def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+        """
+        Get all tool definitions in OpenAI format.
+
+        The list is built once and returned as the same object until a tool is
+        registered or unregistered, so providers can cache work derived from it.
+        Callers must not modify it.
+        """
+        if self._definitions is None:
+            self._definitions = [tool.to_schema() for tool in self._tools.values()]
+        return self._definitions
     
     async def execute(self, name: str, params: dict[str, Any]) -> str:
         """Execute a tool by name with given parameters."""
@@ -54,6 +66,34 @@ class ToolRegistry:
         except Exception as e:
             return f"Error executing {name}: {str(e)}" + _HINT
     
+    async def execute_batch(
+        self, calls: list[tuple[str, dict[str, Any]]], parallel: bool = True,
+    ) -> list[str]:
+        """
+        Execute several tool calls from one LLM turn.
+
+        With ``parallel``, adjacent calls to concurrency-safe tools run together; any
+        other call runs alone, in order, so side effects are never reordered. Results
+        are returned in the same order as ``calls``.
+        """
+        results: list[str] = []
+        i = 0
+        while i < len(calls):
+            j = i
+            while parallel and j < len(calls) and self._is_concurrency_safe(calls[j][0]):
+                j += 1
+            if j - i > 1:
+                results.extend(await asyncio.gather(*(self.execute(n, p) for n, p in calls[i:j])))
+                i = j
+            else:
+                results.append(await self.execute(*calls[i]))
+                i += 1
+        return results
+
+    def _is_concurrency_safe(self, name: str) -> bool:
+        tool = self._tools.get(name)
+        return tool is not None and tool.concurrency_safe
+
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
@@ -1,5 +1,6 @@
 """Spawn tool for creating background subagents."""
 
+from contextvars import ContextVar
 from typing import Any, TYPE_CHECKING
 
 from nanobot.agent.tools.base import Tool
@@ -13,15 +14,13 @@ class SpawnTool(Tool):
     
     def __init__(self, manager: "SubagentManager"):
         self._manager = manager
-        self._origin_channel = "cli"
-        self._origin_chat_id = "direct"
-        self._session_key = "cli:direct"
+        self._origin: ContextVar[tuple[str, str]] = ContextVar(
+            "spawn_tool_origin", default=("cli", "direct")
+        )
     
     def set_context(self, channel: str, chat_id: str) -> None:
-        """Set the origin context for subagent announcements."""
-        self._origin_channel = channel
-        self._origin_chat_id = chat_id
-        self._session_key = f"{channel}:{chat_id}"
+        """Set the origin context for subagent announcements (task-local)."""
+        self._origin.set((channel, chat_id))
     
     @property
     def name(self) -> str:
@@ -54,10 +53,11 @@ class SpawnTool(Tool):
     
     async def execute(self, task: str, label: str | None = None, **kwargs: Any) -> str:
         """Spawn a subagent to execute the given task."""
+        channel, chat_id = self._origin.get()
         return await self._manager.spawn(
             task=task,
             label=label,
-            origin_channel=self._origin_channel,
-            origin_chat_id=self._origin_chat_id,
-            session_key=self._session_key,
+            origin_channel=channel,
+            origin_chat_id=chat_id,
+            session_key=f"{channel}:{chat_id}",
         )
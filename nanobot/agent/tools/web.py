@@ -1,33 +1,42 @@
 """Web tools: web_search and web_fetch."""
 
-import html
+import asyncio
 import json
 import os
-import re
-from typing import Any
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal
 from urllib.parse import urlparse
 
-import httpx
-
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.web_cache import (
+    SearchCache,
+    WebFetchCache,
+    get_fetch_cache,
+    get_search_cache,
+)
+from nanobot.utils.extract import extract_readable
+from nanobot.utils.http import SharedHttpClient, get_http_client
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
 MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
 
 
-def _strip_tags(text: str) -> str:
-    """Remove HTML tags and decode entities."""
-    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
-    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
-    text = re.sub(r'<[^>]+>', '', text)
-    return html.unescape(text).strip()
+_executors: dict[tuple[str, int], Executor] = {}
 
 
-def _normalize(text: str) -> str:
-    """Normalize whitespace."""
-    text = re.sub(r'[ \t]+', ' ', text)
-    return re.sub(r'\n{3,}', '\n\n', text).strip()
+def _get_executor(kind: str, workers: int) -> Executor:
+    """Extractor pool shared by all web_fetch tools with the same settings."""
+    key = (kind, max(1, workers))
+    executor = _executors.get(key)
+    if executor is None:
+        if kind == "process":
+            import multiprocessing
+            executor = ProcessPoolExecutor(key[1], mp_context=multiprocessing.get_context("spawn"))
+        else:
+            executor = ThreadPoolExecutor(key[1], thread_name_prefix="web-extract")
+        _executors[key] = executor
+    return executor
 
 
 def _validate_url(url: str) -> tuple[bool, str]:
@@ -47,6 +56,7 @@ class WebSearchTool(Tool):
     """Search the web using Brave Search API."""
     
     name = "web_search"
+    concurrency_safe = True
     description = "Search the web. Returns titles, URLs, and snippets."
     parameters = {
         "type": "object",
@@ -57,9 +67,29 @@ class WebSearchTool(Tool):
         "required": ["query"]
     }
     
-    def __init__(self, api_key: str | None = None, max_results: int = 5):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        max_results: int = 5,
+        http: SharedHttpClient | None = None,
+        cache: SearchCache | None = None,
+    ):
         self._init_api_key = api_key
         self.max_results = max_results
+        self._http = http
+        self.cache = cache
+
+    @classmethod
+    def from_config(
+        cls, config: Any, api_key: str | None = None, http: SharedHttpClient | None = None,
+    ) -> "WebSearchTool":
+        """Build from a WebSearchConfig section."""
+        return cls(
+            api_key=api_key or config.api_key or None,
+            max_results=config.max_results,
+            http=http,
+            cache=get_search_cache(config.cache_ttl, config.cache_size) if config.cache_ttl > 0 else None,
+        )
 
     @property
     def api_key(self) -> str:
@@ -76,33 +106,38 @@ class WebSearchTool(Tool):
         
         try:
             n = min(max(count or self.max_results, 1), 10)
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": n},
-                    headers={"Accept": "application/json", "X-Subscription-Token": api_key},
-                    timeout=10.0
-                )
-                r.raise_for_status()
-            
-            results = r.json().get("web", {}).get("results", [])
-            if not results:
-                return f"No results for: {query}"
-            
-            lines = [f"Results for: {query}\n"]
-            for i, item in enumerate(results[:n], 1):
-                lines.append(f"{i}. {item.get('title', '')}\n   {item.get('url', '')}")
-                if desc := item.get("description"):
-                    lines.append(f"   {desc}")
-            return "\n".join(lines)
+            if self.cache is None:
+                return await self._search(query, n)
+            return await self.cache.get(self.cache.key(query, n), lambda: self._search(query, n))
         except Exception as e:
             return f"Error: {e}"
 
+    async def _search(self, query: str, n: int) -> str:
+        r = await (self._http or get_http_client()).get(
+            "https://api.search.brave.com/res/v1/web/search",
+            params={"q": query, "count": n},
+            headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
+            timeout=10.0
+        )
+        r.raise_for_status()
+        
+        results = r.json().get("web", {}).get("results", [])
+        if not results:
+            return f"No results for: {query}"
+        
+        lines = [f"Results for: {query}\n"]
+        for i, item in enumerate(results[:n], 1):
+            lines.append(f"{i}. {item.get('title', '')}\n   {item.get('url', '')}")
+            if desc := item.get("description"):
+                lines.append(f"   {desc}")
+        return "\n".join(lines)
+
 
 class WebFetchTool(Tool):
     """Fetch and extract content from a URL using Readability."""
     
     name = "web_fetch"
+    concurrency_safe = True
     description = "Fetch URL and extract readable content (HTML → markdown/text)."
     parameters = {
         "type": "object",
@@ -114,12 +149,44 @@ class WebFetchTool(Tool):
         "required": ["url"]
     }
     
-    def __init__(self, max_chars: int = 50000):
+    def __init__(
+        self,
+        max_chars: int = 50000,
+        http: SharedHttpClient | None = None,
+        extractor: Literal["thread", "process"] = "thread",
+        extract_workers: int = 2,
+        max_html_chars: int = 2_000_000,
+        cache: WebFetchCache | None = None,
+    ):
         self.max_chars = max_chars
+        self._http = http
+        self.extractor = extractor
+        self.extract_workers = extract_workers
+        self.max_html_chars = max_html_chars
+        self.cache = cache
+
+    @classmethod
+    def from_config(cls, config: Any, http: SharedHttpClient | None = None) -> "WebFetchTool":
+        """Build from a WebFetchConfig section."""
+        cache = None
+        if config.cache_enabled:
+            from nanobot.utils.helpers import get_data_path
+
+            cache = get_fetch_cache(
+                get_data_path() / "cache" / "web_fetch.db",
+                max_bytes=config.cache_bytes,
+                ttl=config.cache_ttl,
+                domain_ttls=config.cache_domain_ttls,
+            )
+        return cls(
+            http=http,
+            extractor=config.extractor,
+            extract_workers=config.extract_workers,
+            max_html_chars=config.max_html_chars,
+            cache=cache,
+        )
     
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
-        from readability import Document
-
         max_chars = maxChars or self.max_chars
 
         # Validate URL before fetching
@@ -127,14 +194,27 @@ class WebFetchTool(Tool):
         if not is_valid:
             return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url}, ensure_ascii=False)
 
+        cache_key = cached = None
+        if self.cache:
+            cache_key = self.cache.key(url, extractMode, max_chars)
+            cached = self.cache.get(cache_key)
+            if cached and cached.age < self.cache.ttl_for(urlparse(url).netloc):
+                self.cache.hits += 1
+                return cached.result
+
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                r.raise_for_status()
+            headers = {"User-Agent": USER_AGENT}
+            if cached:
+                headers.update(cached.conditional_headers())
+            # The shared client caps redirects at MAX_REDIRECTS
+            r = await (self._http or get_http_client()).get(
+                url, headers=headers, follow_redirects=True, timeout=30.0
+            )
+            if cached and r.status_code == 304:
+                self.cache.revalidated += 1
+                self.cache.refresh(cache_key)
+                return cached.result
+            r.raise_for_status()
             
             ctype = r.headers.get("content-type", "")
             
@@ -143,9 +223,11 @@ class WebFetchTool(Tool):
                 text, extractor = json.dumps(r.json(), indent=2, ensure_ascii=False), "json"
             # HTML
             elif "text/html" in ctype or r.text[:256].lower().startswith(("<!doctype", "<html")):
-                doc = Document(r.text)
-                content = self._to_markdown(doc.summary()) if extractMode == "markdown" else _strip_tags(doc.summary())
-                text = f"# {doc.title()}\n\n{content}" if doc.title() else content
+                # Parsing is the slow part: cap its input and keep it off the event loop.
+                page = r.text[:self.max_html_chars] if self.max_html_chars else r.text
+                text = await asyncio.get_running_loop().run_in_executor(
+                    _get_executor(self.extractor, self.extract_workers), extract_readable, page, extractMode,
+                )
                 extractor = "readability"
             else:
                 text, extractor = r.text, "raw"
@@ -154,19 +236,12 @@ class WebFetchTool(Tool):
             if truncated:
                 text = text[:max_chars]
             
-            return json.dumps({"url": url, "finalUrl": str(r.url), "status": r.status_code,
-                              "extractor": extractor, "truncated": truncated, "length": len(text), "text": text}, ensure_ascii=False)
+            result = json.dumps({"url": url, "finalUrl": str(r.url), "status": r.status_code,
+                                 "extractor": extractor, "truncated": truncated, "length": len(text), "text": text}, ensure_ascii=False)
+            if self.cache:
+                self.cache.misses += 1
+                self.cache.put(cache_key, result, r.headers.get("etag"), r.headers.get("last-modified"))
+            return result
         except Exception as e:
             return json.dumps({"error": str(e), "url": url}, ensure_ascii=False)
-    
-    def _to_markdown(self, html: str) -> str:
-        """Convert HTML to markdown."""
-        # Convert links, headings, lists before stripping tags
-        text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-                      lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
-        text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-                      lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
-        return _normalize(_strip_tags(text))
+
@@ -0,0 +1,234 @@
+"""Caches for the web tools: web_fetch results on disk, web_search results in memory."""
+
+import asyncio
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from nanobot.utils.helpers import ensure_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+@dataclass
+class CachedFetch:
+    """A cached web_fetch result and the validators needed to revalidate it."""
+
+    result: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class WebFetchCache:
+    """
+    Extracted web_fetch results in SQLite, keyed by URL, extract mode and
+    maxChars, with the ETag/Last-Modified needed for conditional requests.
+
+    Entries younger than their domain's TTL are served without a request.
+    Older ones are revalidated, and a 304 refreshes them. The total size is
+    bounded by evicting the least recently used entries. The database can be
+    shared by several processes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 50 * 1024 * 1024,
+        ttl: float = 3600,
+        domain_ttls: dict[str, float] | None = None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.domain_ttls = domain_ttls or {}
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # Opened on first use, so configuring a cache never touches the disk.
+        if self._conn is None:
+            ensure_dir(self.path.parent)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    @staticmethod
+    def key(url: str, extract_mode: str, max_chars: int) -> str:
+        return f"{extract_mode}:{max_chars}:{url}"
+
+    def ttl_for(self, host: str) -> float:
+        """TTL for a host: the most specific matching domain entry, else the default."""
+        host = host.lower().split(":")[0]
+        best: tuple[int, float] | None = None
+        for domain, ttl in self.domain_ttls.items():
+            domain = domain.lower().lstrip(".")
+            if (host == domain or host.endswith("." + domain)) and (best is None or len(domain) > best[0]):
+                best = (len(domain), ttl)
+        return best[1] if best else self.ttl
+
+    def get(self, key: str) -> CachedFetch | None:
+        row = self._db.execute(
+            "SELECT result, etag, last_modified, fetched_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        with self._db:
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return CachedFetch(*row)
+
+    def put(self, key: str, result: str, etag: str | None, last_modified: str | None) -> None:
+        now = time.time()
+        size = len(result.encode())
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, result, etag, last_modified, size, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, result, etag, last_modified, size, now, now),
+            )
+        self._evict()
+
+    def refresh(self, key: str) -> None:
+        """Mark an entry as fresh again after a 304 Not Modified."""
+        with self._db:
+            self._db.execute("UPDATE entries SET fetched_at = ? WHERE key = ?", (time.time(), key))
+
+    def _evict(self) -> None:
+        if not self.max_bytes:
+            return
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        with self._db:
+            self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_caches: dict[Path, WebFetchCache] = {}
+
+
+def get_fetch_cache(path: Path, **kwargs) -> WebFetchCache:
+    """Cache for ``path``, shared by every web_fetch tool in the process."""
+    cache = _caches.get(path)
+    if cache is None:
+        cache = _caches[path] = WebFetchCache(path, **kwargs)
+    return cache
+
+
+class SearchCache:
+    """
+    In-memory TTL cache of formatted web_search results.
+
+    Concurrent lookups for the same key share one in-flight request, which
+    keeps running even if the caller that started it is cancelled.
+    """
+
+    def __init__(self, ttl: float = 600, max_entries: int = 512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, str]] = OrderedDict()  # key -> (expires, result)
+        self._inflight: dict[tuple, asyncio.Future[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(query: str, count: int) -> tuple[str, int]:
+        return " ".join(query.lower().split()), count
+
+    async def get(self, key: tuple, fetch: Callable[[], Awaitable[str]]) -> str:
+        """Return the cached result for ``key``, calling ``fetch`` only if no request is under way."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = self._inflight[key] = asyncio.ensure_future(fetch())
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: tuple, task: asyncio.Future[str]) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @property
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+_search_caches: dict[tuple[float, int], SearchCache] = {}
+
+
+def get_search_cache(ttl: float, max_entries: int = 512) -> SearchCache:
+    """Search cache shared by every web_search tool in the process with the same settings."""
+    key = (ttl, max_entries)
+    cache = _search_caches.get(key)
+    if cache is None:
+        cache = _search_caches[key] = SearchCache(ttl, max_entries)
+    return cache
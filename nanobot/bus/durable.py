@@ -0,0 +1,182 @@
+"""Message bus that persists queued messages in SQLite."""
+
+import asyncio
+import json
+import sqlite3
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import Lane, MessageBus, Overflow
+from nanobot.utils.helpers import ensure_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    direction TEXT NOT NULL,
+    lane TEXT NOT NULL,
+    data TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+"""
+
+_ID_KEY = "_bus_id"
+
+
+def _is_ephemeral(msg: OutboundMessage) -> bool:
+    """Progress and stream updates are superseded by the final reply and never persisted."""
+    return bool(msg.metadata.get("_progress") or msg.metadata.get("_stream"))
+
+
+class DurableMessageBus(MessageBus):
+    """
+    MessageBus whose queued messages survive a restart.
+
+    Every inbound message and every final outbound reply is written to SQLite
+    before it is queued, and deleted when acked: inbound once the agent has
+    finished the turn, outbound once the channel has sent it. Rows left over
+    from a previous run are queued again on startup. A failed send (nack) is
+    retried with exponential backoff, up to ``max_attempts`` times.
+
+    Delivery is at-least-once: a crash between sending and acking sends that
+    reply again after the restart.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        queue_size: int = 0,
+        background_queue_size: int = 0,
+        overflow: Overflow = "block",
+        max_attempts: int = 5,
+        retry_delay: float = 2.0,
+    ):
+        super().__init__(queue_size, background_queue_size, overflow)
+        self.path = path
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        ensure_dir(path.parent)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._attempts: dict[int, int] = {}
+        self._retries: set[asyncio.Task] = set()
+        self.inbound.on_drop = self.ack
+        self.outbound.on_drop = self.ack
+        self.replayed = self._replay()
+
+    @classmethod
+    def from_config(cls, config: Any, path: Path | None = None) -> "DurableMessageBus":
+        """Build from a BusConfig section."""
+        from nanobot.utils.helpers import get_data_path
+
+        return cls(
+            path or get_data_path() / "bus.db",
+            queue_size=config.queue_size,
+            background_queue_size=config.background_queue_size,
+            overflow=config.overflow,
+            max_attempts=config.max_attempts,
+        )
+
+    def _replay(self) -> int:
+        rows = self._db.execute(
+            "SELECT id, direction, lane, data, attempts FROM messages ORDER BY id"
+        ).fetchall()
+        for row_id, direction, lane, data, attempts in rows:
+            fields = json.loads(data)
+            if direction == "in":
+                fields["timestamp"] = datetime.fromisoformat(fields["timestamp"])
+                msg: InboundMessage | OutboundMessage = InboundMessage(**fields)
+                queue = self.inbound
+            else:
+                msg = OutboundMessage(**fields)
+                queue = self.outbound
+            msg.metadata[_ID_KEY] = row_id
+            self._attempts[row_id] = attempts
+            queue.preload(msg, lane)
+        if rows:
+            logger.info("Replaying {} unacknowledged bus message(s) from {}", len(rows), self.path)
+        return len(rows)
+
+    def _insert(self, direction: str, lane: str, msg: InboundMessage | OutboundMessage) -> None:
+        fields = asdict(msg)
+        if "timestamp" in fields:
+            fields["timestamp"] = fields["timestamp"].isoformat()
+        fields["metadata"] = {k: v for k, v in msg.metadata.items() if k != _ID_KEY}
+        with self._db:
+            cur = self._db.execute(
+                "INSERT INTO messages (direction, lane, data, created_at) VALUES (?, ?, ?, ?)",
+                (direction, lane, json.dumps(fields, ensure_ascii=False, default=str), time.time()),
+            )
+        # Replace rather than mutate: outbound replies often share the inbound metadata dict.
+        msg.metadata = {**fields["metadata"], _ID_KEY: cur.lastrowid}
+
+    async def publish_inbound(self, msg: InboundMessage, lane: Lane | None = None) -> bool:
+        lane = lane or msg.lane
+        self._insert("in", lane, msg)
+        if await super().publish_inbound(msg, lane):
+            return True
+        self.ack(msg)
+        return False
+
+    async def publish_outbound(self, msg: OutboundMessage, lane: Lane | None = None) -> bool:
+        lane = lane or msg.lane
+        if _is_ephemeral(msg):
+            if _ID_KEY in msg.metadata:
+                msg.metadata = {k: v for k, v in msg.metadata.items() if k != _ID_KEY}
+            return await super().publish_outbound(msg, lane)
+        self._insert("out", lane, msg)
+        if await super().publish_outbound(msg, lane):
+            return True
+        self.ack(msg)
+        return False
+
+    def ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        row_id = msg.metadata.get(_ID_KEY)
+        if row_id is None:
+            return
+        self._attempts.pop(row_id, None)
+        with self._db:
+            self._db.execute("DELETE FROM messages WHERE id = ?", (row_id,))
+
+    def nack(self, msg: OutboundMessage) -> None:
+        row_id = msg.metadata.get(_ID_KEY)
+        if row_id is None:
+            return
+        attempts = self._attempts.get(row_id, 0) + 1
+        if attempts >= self.max_attempts:
+            logger.error(
+                "Giving up on message to {}:{} after {} attempts", msg.channel, msg.chat_id, attempts,
+            )
+            self.ack(msg)
+            return
+        self._attempts[row_id] = attempts
+        with self._db:
+            self._db.execute("UPDATE messages SET attempts = ? WHERE id = ?", (attempts, row_id))
+            row = self._db.execute("SELECT lane FROM messages WHERE id = ?", (row_id,)).fetchone()
+        lane = row[0] if row else msg.lane
+        delay = min(self.retry_delay * 2 ** (attempts - 1), 300.0)
+        logger.warning("Retrying message to {}:{} in {:.0f}s", msg.channel, msg.chat_id, delay)
+        task = asyncio.create_task(self._retry(msg, lane, delay))
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    async def _retry(self, msg: OutboundMessage, lane: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.outbound.push(msg, lane)
+
+    def pending(self) -> int:
+        """Number of unacknowledged messages on disk."""
+        return self._db.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+    def close(self) -> None:
+        for task in self._retries:
+            task.cancel()
+        self._db.close()
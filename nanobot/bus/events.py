@@ -2,7 +2,19 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
+
+# Lanes in priority order: a lane is only served when all lanes before it are empty.
+LANES = ("interactive", "system", "background")
+
+Lane = Literal["interactive", "system", "background"]
+
+
+def _lane(channel: str, metadata: dict[str, Any]) -> str:
+    lane = metadata.get("_lane")
+    if lane in LANES:
+        return lane
+    return "system" if channel == "system" else "interactive"
 
 
 @dataclass
@@ -23,6 +35,18 @@ class InboundMessage:
         """Unique key for session identification."""
         return self.session_key_override or f"{self.channel}:{self.chat_id}"
 
+    @property
+    def dispatch_key(self) -> str:
+        """Session the message will write to (system messages target their origin chat)."""
+        if self.channel == "system":
+            return self.chat_id if ":" in self.chat_id else f"cli:{self.chat_id}"
+        return self.session_key
+
+    @property
+    def lane(self) -> str:
+        """Bus lane the message is queued on (see ``LANES``)."""
+        return _lane(self.channel, self.metadata)
+
 
 @dataclass
 class OutboundMessage:
@@ -35,4 +59,7 @@ class OutboundMessage:
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
 
-
+    @property
+    def lane(self) -> str:
+        """Bus lane the message is queued on (see ``LANES``)."""
+        return _lane(self.channel, self.metadata)
@@ -0,0 +1,245 @@
+"""Message bus over a local Unix socket, for running agent workers in separate processes."""
+
+import asyncio
+import json
+import sys
+import zlib
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import Lane, MessageBus
+
+_FRAME_LIMIT = 16 * 1024 * 1024  # max bytes per newline-delimited JSON frame
+_ID_KEY = "_ipc_id"
+
+
+def _encode(kind: str, msg: InboundMessage | OutboundMessage, lane: str = "") -> bytes:
+    data = asdict(msg)
+    if isinstance(msg, InboundMessage):
+        data["timestamp"] = msg.timestamp.isoformat()
+    frame = {"type": kind, "lane": lane, "inbound": isinstance(msg, InboundMessage), "msg": data}
+    return (json.dumps(frame, ensure_ascii=False, default=str) + "\n").encode()
+
+
+def _decode(line: bytes) -> tuple[str, InboundMessage | OutboundMessage, str]:
+    frame = json.loads(line)
+    data = frame["msg"]
+    if frame["inbound"]:
+        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        msg: InboundMessage | OutboundMessage = InboundMessage(**data)
+    else:
+        msg = OutboundMessage(**data)
+    return frame["type"], msg, frame["lane"]
+
+
+def shard_for(msg: InboundMessage, workers: int) -> int:
+    """Worker index that owns the message's session (stable across processes)."""
+    return zlib.crc32(msg.dispatch_key.encode()) % workers
+
+
+class IpcBroker:
+    """
+    Gateway side of the IPC bus.
+
+    Inbound messages published by channels on the local bus are forwarded to
+    agent worker processes, sharded by session key so that one session is
+    always handled by the same worker. Replies and acks from workers are fed
+    back into the local bus, where the channel manager picks them up as usual.
+
+    A message stays unacknowledged on the local bus until its worker reports
+    the turn finished. Messages a worker received but never acked are sent
+    again when it reconnects after a crash. Each worker has at most
+    ``queue_size`` messages waiting and as many unacked; beyond that the broker
+    stops taking messages off the bus, whose own bounds then apply.
+    """
+
+    def __init__(self, bus: MessageBus, path: Path, workers: int, queue_size: int = 64):
+        self.bus = bus
+        self.path = path
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        # Frames waiting for each worker; they wait here while a worker restarts.
+        self._outboxes: list[asyncio.Queue[tuple[int, bytes]]] = [
+            asyncio.Queue(maxsize=self.queue_size) for _ in range(self.workers)
+        ]
+        # Frames sent to each worker and not yet acked, by message id.
+        self._unacked: list[dict[int, bytes]] = [{} for _ in range(self.workers)]
+        self._acked = [asyncio.Event() for _ in range(self.workers)]
+        self._next_id = 0
+        self._server: asyncio.AbstractServer | None = None
+        self._route_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(
+            self._handle_worker, path=str(self.path), limit=_FRAME_LIMIT,
+        )
+        self._route_task = asyncio.create_task(self._route())
+        logger.info("IPC broker listening on {} for {} workers", self.path, self.workers)
+
+    async def _route(self) -> None:
+        while True:
+            msg = await self.bus.consume_inbound()
+            self._next_id += 1
+            # Replace rather than mutate: the metadata dict may be shared with other messages.
+            msg.metadata = {**msg.metadata, _ID_KEY: self._next_id}
+            frame = _encode("inbound", msg, msg.lane)
+            await self._outboxes[shard_for(msg, self.workers)].put((self._next_id, frame))
+
+    async def _handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        hello = json.loads(await reader.readline() or b"{}")
+        index = hello.get("worker")
+        if not isinstance(index, int) or not 0 <= index < self.workers:
+            writer.close()
+            return
+        logger.info("Agent worker {} connected", index)
+        feeder = asyncio.create_task(self._feed(index, writer))
+        try:
+            while line := await reader.readline():
+                await self._on_frame(index, line)
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.warning("Agent worker {} connection error: {}", index, e)
+        finally:
+            feeder.cancel()
+            writer.close()
+            logger.warning("Agent worker {} disconnected", index)
+
+    async def _feed(self, index: int, writer: asyncio.StreamWriter) -> None:
+        outbox, unacked, acked = self._outboxes[index], self._unacked[index], self._acked[index]
+        if unacked:
+            logger.warning("Resending {} unfinished message(s) to agent worker {}", len(unacked), index)
+            for frame in unacked.values():
+                writer.write(frame)
+            await writer.drain()
+        while True:
+            while len(unacked) >= self.queue_size:
+                acked.clear()
+                await acked.wait()
+            msg_id, frame = await outbox.get()
+            unacked[msg_id] = frame
+            writer.write(frame)
+            await writer.drain()
+
+    async def _on_frame(self, index: int, line: bytes) -> None:
+        kind, msg, lane = _decode(line)
+        msg_id = msg.metadata.pop(_ID_KEY, None)
+        if kind == "outbound":
+            await self.bus.publish_outbound(msg, lane or None)
+        elif kind == "inbound":
+            # e.g. subagent announcements, which may belong to another worker's session
+            await self.bus.publish_inbound(msg, lane or None)
+        elif kind == "ack":
+            if self._unacked[index].pop(msg_id, None) is not None:
+                self._acked[index].set()
+            self.bus.ack(msg)
+
+    async def stop(self) -> None:
+        if self._route_task:
+            self._route_task.cancel()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        self.path.unlink(missing_ok=True)
+
+
+class IpcMessageBus(MessageBus):
+    """
+    Worker side of the IPC bus.
+
+    Inbound messages arrive from the broker and are queued locally. Everything
+    the worker publishes (replies, subagent announcements, acks) is written to
+    the broker.
+    """
+
+    def __init__(self, path: Path, index: int):
+        super().__init__()
+        self.path = path
+        self.index = index
+        self.disconnected = asyncio.Event()
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+
+    async def connect(self) -> None:
+        reader, self._writer = await asyncio.open_unix_connection(str(self.path), limit=_FRAME_LIMIT)
+        self._writer.write((json.dumps({"worker": self.index}) + "\n").encode())
+        await self._writer.drain()
+        self._reader_task = asyncio.create_task(self._receive(reader))
+
+    async def _receive(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while line := await reader.readline():
+                _, msg, lane = _decode(line)
+                await self.inbound.push(msg, lane)
+        finally:
+            self.disconnected.set()
+
+    async def _send(self, frame: bytes) -> bool:
+        if self._writer is None or self.disconnected.is_set():
+            logger.error("Not connected to the gateway, dropping message")
+            return False
+        self._writer.write(frame)
+        await self._writer.drain()
+        return True
+
+    async def publish_inbound(self, msg: InboundMessage, lane: Lane | None = None) -> bool:
+        return await self._send(_encode("inbound", msg, lane or msg.lane))
+
+    async def publish_outbound(self, msg: OutboundMessage, lane: Lane | None = None) -> bool:
+        return await self._send(_encode("outbound", msg, lane or msg.lane))
+
+    def ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        if self._writer is not None and not self.disconnected.is_set() and _ID_KEY in msg.metadata:
+            self._writer.write(_encode("ack", msg))
+
+    def close(self) -> None:
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self._writer:
+            self._writer.close()
+
+
+class AgentWorkerPool:
+    """Runs agent worker processes against an IPC broker, restarting any that exit."""
+
+    def __init__(self, path: Path, workers: int, restart_delay: float = 1.0):
+        self.path = path
+        self.workers = max(1, workers)
+        self.restart_delay = restart_delay
+        self._procs: dict[int, asyncio.subprocess.Process] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def _command(self, index: int) -> list[str]:
+        return [sys.executable, "-m", "nanobot", "gateway-worker", "--socket", str(self.path), "--index", str(index)]
+
+    async def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._supervise(i)) for i in range(self.workers)]
+
+    async def _supervise(self, index: int) -> None:
+        while True:
+            proc = await asyncio.create_subprocess_exec(*self._command(index))
+            self._procs[index] = proc
+            code = await proc.wait()
+            logger.warning("Agent worker {} exited with code {}, restarting", index, code)
+            await asyncio.sleep(self.restart_delay)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        procs = [p for p in self._procs.values() if p.returncode is None]
+        for proc in procs:
+            proc.terminate()
+        try:
+            await asyncio.wait_for(asyncio.gather(*(p.wait() for p in procs)), timeout=timeout)
+        except asyncio.TimeoutError:
+            for proc in procs:
+                if proc.returncode is None:
+                    proc.kill()
+
+    def status(self) -> dict[str, Any]:
+        return {i: {"pid": p.pid, "running": p.returncode is None} for i, p in self._procs.items()}
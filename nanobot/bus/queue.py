@@ -1,8 +1,156 @@
 """Async message queue for decoupled channel-agent communication."""
 
 import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Iterable, Literal, TypeVar
 
-from nanobot.bus.events import InboundMessage, OutboundMessage
+from loguru import logger
+
+from nanobot.bus.events import LANES, InboundMessage, Lane, OutboundMessage
+
+T = TypeVar("T")
+
+Overflow = Literal["block", "drop_oldest", "reject"]
+
+BUSY_REPLY = "I'm handling a lot of messages right now. Please try again in a moment."
+
+
+@dataclass
+class LaneStats:
+    """Counters for one lane of a queue."""
+
+    depth: int = 0
+    enqueued: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    wait_total: float = 0.0  # seconds messages spent queued before being consumed
+    wait_max: float = 0.0
+    consumed: int = 0
+
+    @property
+    def wait_avg(self) -> float:
+        return self.wait_total / self.consumed if self.consumed else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "wait_avg": round(self.wait_avg, 4),
+            "wait_max": round(self.wait_max, 4),
+        }
+
+
+class _LanedQueue(Generic[T]):
+    """
+    Bounded multi-lane queue. get() returns the oldest item of the highest
+    priority non-empty lane. When a lane is full, put() applies the overflow
+    policy: wait for room, drop the lane's oldest item, or refuse the new one.
+    """
+
+    def __init__(self, sizes: dict[str, int], overflow: Overflow):
+        self.overflow = overflow
+        self._sizes = sizes
+        self._lanes: dict[str, deque[tuple[float, T]]] = {lane: deque() for lane in LANES}
+        self.stats: dict[str, LaneStats] = {lane: LaneStats() for lane in LANES}
+        self.on_drop: Callable[[T], None] | None = None  # called with items evicted by drop_oldest
+        self._cond = asyncio.Condition()
+
+    def _full(self, lane: str) -> bool:
+        size = self._sizes.get(lane, 0)
+        return bool(size) and len(self._lanes[lane]) >= size
+
+    def _append(self, lane: str, item: T) -> None:
+        self._lanes[lane].append((time.monotonic(), item))
+        stats = self.stats[lane]
+        stats.enqueued += 1
+        stats.depth = len(self._lanes[lane])
+        self._cond.notify_all()
+
+    async def put(self, item: T, lane: str) -> bool:
+        """Add an item. Returns False if it was rejected."""
+        stats = self.stats[lane]
+        async with self._cond:
+            if self._full(lane):
+                if self.overflow == "reject":
+                    stats.rejected += 1
+                    return False
+                if self.overflow == "drop_oldest":
+                    _, dropped = self._lanes[lane].popleft()
+                    stats.dropped += 1
+                    if self.on_drop:
+                        self.on_drop(dropped)
+                else:
+                    await self._cond.wait_for(lambda: not self._full(lane))
+            self._append(lane, item)
+            return True
+
+    async def offer(self, item: T, lane: str) -> bool:
+        """Add an item only if its lane has room, never waiting or dropping others."""
+        async with self._cond:
+            if self._full(lane):
+                self.stats[lane].rejected += 1
+                return False
+            self._append(lane, item)
+            return True
+
+    async def push(self, item: T, lane: str) -> None:
+        """Add an item regardless of the lane's bound (used for retries)."""
+        async with self._cond:
+            self._append(lane, item)
+
+    def preload(self, item: T, lane: str) -> None:
+        """Add an item before any consumer is waiting (used for replay at startup)."""
+        self._lanes[lane].append((time.monotonic(), item))
+        self.stats[lane].depth = len(self._lanes[lane])
+
+    def _find(self, lanes: Iterable[str], match: Callable[[T], bool] | None) -> tuple[str, int] | None:
+        for lane in LANES:
+            queue = self._lanes[lane]
+            if not queue:
+                continue
+            if lane in lanes:
+                return lane, 0
+            if match is not None:
+                for index, (_, item) in enumerate(queue):
+                    if match(item):
+                        return lane, index
+        return None
+
+    async def get(self, lanes: Iterable[str] = LANES, match: Callable[[T], bool] | None = None) -> T:
+        """
+        Remove and return the oldest item of the highest priority non-empty lane
+        among ``lanes``. Items in other lanes are only taken if ``match`` accepts them.
+        """
+        lanes = tuple(lanes)
+        found: tuple[str, int] | None = None
+
+        def ready() -> bool:
+            nonlocal found
+            found = self._find(lanes, match)
+            return found is not None
+
+        async with self._cond:
+            await self._cond.wait_for(ready)
+            assert found is not None
+            lane, index = found
+            queue = self._lanes[lane]
+            queued_at, item = queue[index]
+            del queue[index]
+            stats = self.stats[lane]
+            wait = time.monotonic() - queued_at
+            stats.consumed += 1
+            stats.wait_total += wait
+            stats.wait_max = max(stats.wait_max, wait)
+            stats.depth = len(queue)
+            self._cond.notify_all()
+            return item
+
+    def qsize(self) -> int:
+        return sum(len(q) for q in self._lanes.values())
 
 
 class MessageBus:
@@ -11,23 +159,70 @@ class MessageBus:
 
     Channels push messages to the inbound queue, and the agent processes
     them and pushes responses to the outbound queue.
+
+    Both queues are split into priority lanes: interactive chat traffic is
+    served first, then system messages (subagent announcements), then
+    background work (cron and heartbeat). Each lane can be bounded; the
+    ``overflow`` policy decides what happens when one is full.
     """
 
-    def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
-        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
+    def __init__(
+        self,
+        queue_size: int = 0,
+        background_queue_size: int = 0,
+        overflow: Overflow = "block",
+    ):
+        sizes = {"interactive": queue_size, "system": queue_size, "background": background_queue_size}
+        self.inbound: _LanedQueue[InboundMessage] = _LanedQueue(sizes, overflow)
+        self.outbound: _LanedQueue[OutboundMessage] = _LanedQueue(sizes, overflow)
+
+    @classmethod
+    def from_config(cls, config: Any) -> "MessageBus":
+        """Build from a BusConfig section."""
+        return cls(
+            queue_size=config.queue_size,
+            background_queue_size=config.background_queue_size,
+            overflow=config.overflow,
+        )
+
+    async def publish_inbound(self, msg: InboundMessage, lane: Lane | None = None) -> bool:
+        """
+        Publish a message from a channel to the agent.
+
+        Returns False if the queue was full and the message was rejected; the
+        sender is then told to try again later.
+        """
+        lane = lane or msg.lane
+        if await self.inbound.put(msg, lane):
+            return True
+        logger.warning("Inbound {} lane full, rejected message from {}:{}", lane, msg.channel, msg.chat_id)
+        if lane == "interactive":
+            await self.outbound.offer(
+                OutboundMessage(channel=msg.channel, chat_id=msg.chat_id, content=BUSY_REPLY),
+                "system",
+            )
+        return False
 
-    async def publish_inbound(self, msg: InboundMessage) -> None:
-        """Publish a message from a channel to the agent."""
-        await self.inbound.put(msg)
+    async def consume_inbound(
+        self,
+        lanes: Iterable[str] = LANES,
+        match: Callable[[InboundMessage], bool] | None = None,
+    ) -> InboundMessage:
+        """
+        Consume the next inbound message (blocks until available).
 
-    async def consume_inbound(self) -> InboundMessage:
-        """Consume the next inbound message (blocks until available)."""
-        return await self.inbound.get()
+        Only ``lanes`` are served; a message on another lane is taken early
+        if ``match`` accepts it.
+        """
+        return await self.inbound.get(lanes, match)
 
-    async def publish_outbound(self, msg: OutboundMessage) -> None:
-        """Publish a response from the agent to channels."""
-        await self.outbound.put(msg)
+    async def publish_outbound(self, msg: OutboundMessage, lane: Lane | None = None) -> bool:
+        """Publish a response from the agent to channels. Returns False if it was rejected."""
+        lane = lane or msg.lane
+        if await self.outbound.put(msg, lane):
+            return True
+        logger.warning("Outbound {} lane full, rejected message to {}:{}", lane, msg.channel, msg.chat_id)
+        return False
 
     async def consume_outbound(self) -> OutboundMessage:
         """Consume the next outbound message (blocks until available)."""
@@ -42,3 +237,22 @@ class MessageBus:
     def outbound_size(self) -> int:
         """Number of pending outbound messages."""
         return self.outbound.qsize()
+
+    def ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        """Mark a message as fully handled. Only meaningful for persistent buses."""
+        pass
+
+    def nack(self, msg: OutboundMessage) -> None:
+        """Report that sending a message failed. Only meaningful for persistent buses."""
+        pass
+
+    def close(self) -> None:
+        """Release any resources held by the bus."""
+        pass
+
+    def stats(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Per-lane depth, drop/reject counts and queue wait times for both directions."""
+        return {
+            "inbound": {lane: s.as_dict() for lane, s in self.inbound.stats.items()},
+            "outbound": {lane: s.as_dict() for lane, s in self.outbound.stats.items()},
+        }
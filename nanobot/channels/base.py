@@ -18,6 +18,7 @@ class BaseChannel(ABC):
     """
     
     name: str = "base"
+    supports_streaming: bool = False  # Can render "_stream" updates by editing one message
     
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -30,6 +31,7 @@ class BaseChannel(ABC):
         self.config = config
         self.bus = bus
         self._running = False
+        self._stream_refs: dict[str, Any] = {}  # stream_id -> platform message being edited
     
     @abstractmethod
     async def start(self) -> None:
@@ -58,6 +60,14 @@ class BaseChannel(ABC):
         """
         pass
     
+    _STREAM_REFS_LIMIT = 256
+
+    def _remember_stream(self, stream_id: str, ref: Any) -> None:
+        """Remember which platform message a stream edits, dropping the oldest entries."""
+        self._stream_refs[stream_id] = ref
+        while len(self._stream_refs) > self._STREAM_REFS_LIMIT:
+            self._stream_refs.pop(next(iter(self._stream_refs)))
+
     def is_allowed(self, sender_id: str) -> bool:
         """
         Check if a sender is allowed to use this bot.
@@ -46,6 +46,7 @@ class DiscordChannel(BaseChannel):
     """Discord channel using Gateway websocket."""
 
     name = "discord"
+    supports_streaming = True
 
     def __init__(self, config: DiscordConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -104,11 +105,22 @@ class DiscordChannel(BaseChannel):
         url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
         headers = {"Authorization": f"Bot {self.config.token}"}
 
+        if msg.metadata.get("_stream"):
+            await self._send_stream_update(url, headers, msg)
+            return
+
         try:
             chunks = _split_message(msg.content or "")
             if not chunks:
                 return
 
+            stream_id = msg.metadata.get("_stream_id")
+            edit_id = self._stream_refs.pop(stream_id, None) if stream_id else None
+            if edit_id is not None and await self._send_payload(
+                f"{url}/{edit_id}", headers, {"content": chunks[0]}, method="PATCH"
+            ):
+                chunks = chunks[1:]
+
             for i, chunk in enumerate(chunks):
                 payload: dict[str, Any] = {"content": chunk}
 
@@ -122,13 +134,34 @@ class DiscordChannel(BaseChannel):
         finally:
             await self._stop_typing(msg.chat_id)
 
+    async def _send_stream_update(
+        self, url: str, headers: dict[str, str], msg: OutboundMessage
+    ) -> None:
+        """Post or edit the message that shows a streaming reply (best effort, no retry)."""
+        stream_id = msg.metadata.get("_stream_id")
+        payload: dict[str, Any] = {"content": msg.content[:MAX_MESSAGE_LEN]}
+        message_id = self._stream_refs.get(stream_id)
+        try:
+            if message_id is None:
+                if msg.reply_to:
+                    payload["message_reference"] = {"message_id": msg.reply_to}
+                    payload["allowed_mentions"] = {"replied_user": False}
+                response = await self._http.post(url, headers=headers, json=payload)
+                response.raise_for_status()
+                self._remember_stream(stream_id, response.json()["id"])
+            else:
+                response = await self._http.patch(f"{url}/{message_id}", headers=headers, json=payload)
+                response.raise_for_status()
+        except Exception as e:
+            logger.debug("Discord stream update failed: {}", e)
+
     async def _send_payload(
-        self, url: str, headers: dict[str, str], payload: dict[str, Any]
+        self, url: str, headers: dict[str, str], payload: dict[str, Any], method: str = "POST"
     ) -> bool:
         """Send a single Discord API payload with retry on rate-limit. Returns True on success."""
         for attempt in range(3):
             try:
-                response = await self._http.post(url, headers=headers, json=payload)
+                response = await self._http.request(method, url, headers=headers, json=payload)
                 if response.status_code == 429:
                     data = response.json()
                     retry_after = float(data.get("retry_after", 1.0))
@@ -13,6 +13,97 @@ from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import Config
 
 
+def _is_update(msg: OutboundMessage) -> bool:
+    """Progress and stream updates, which the final reply supersedes."""
+    return bool(msg.metadata.get("_progress") or msg.metadata.get("_stream"))
+
+
+class _ChannelSender:
+    """
+    Outbound queues and send workers for one channel.
+
+    Messages are partitioned across workers by chat_id, so each chat is sent in
+    order while different chats go out in parallel. A busy worker never holds
+    up the others: messages are queued without waiting on any one worker.
+
+    Progress and stream updates are superseded by the final reply, so they are
+    dropped once a worker has ``queue_size / workers`` messages waiting. Final
+    replies are never dropped: when the channel already holds ``queue_size``
+    unsent replies, submit() waits for one to go out, which stalls the
+    dispatcher and leaves the rest of the backlog on the bounded bus.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        channel: BaseChannel,
+        bus: MessageBus,
+        workers: int,
+        queue_size: int,
+    ):
+        self.name = name
+        self.channel = channel
+        self.bus = bus
+        workers = max(1, workers)
+        self._depth = max(1, queue_size // workers)
+        self._capacity = max(1, queue_size)
+        self._queues: list[asyncio.Queue[OutboundMessage]] = [asyncio.Queue() for _ in range(workers)]
+        self._tasks = [asyncio.create_task(self._worker(q)) for q in self._queues]
+        self._replies = 0  # final replies queued or being sent
+        self._room = asyncio.Event()
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    async def submit(self, msg: OutboundMessage) -> bool:
+        """Queue a message for sending. Returns False if it was dropped."""
+        queue = self._queues[hash(msg.chat_id) % len(self._queues)]
+        if _is_update(msg):
+            if queue.qsize() >= self._depth:
+                self.dropped += 1
+                return False
+            queue.put_nowait(msg)
+            return True
+        if self._replies >= self._capacity:
+            logger.warning("Outbound queue for {} is full, waiting to send to {}", self.name, msg.chat_id)
+            while self._replies >= self._capacity:
+                self._room.clear()
+                await self._room.wait()
+        self._replies += 1
+        queue.put_nowait(msg)
+        return True
+
+    async def _worker(self, queue: asyncio.Queue[OutboundMessage]) -> None:
+        while True:
+            msg = await queue.get()
+            try:
+                await self.channel.send(msg)
+                self.bus.ack(msg)
+            except Exception as e:
+                logger.error("Error sending to {}: {}", self.name, e)
+                self.bus.nack(msg)
+            finally:
+                if not _is_update(msg):
+                    self._replies -= 1
+                    self._room.set()
+                queue.task_done()
+
+    async def _drain(self) -> None:
+        await asyncio.gather(*(q.join() for q in self._queues))
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Give queued messages up to ``timeout`` seconds to go out, then stop the workers."""
+        try:
+            await asyncio.wait_for(self._drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping {} unsent message(s) for {}", self.pending, self.name)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
 class ChannelManager:
     """
     Manages chat channels and coordinates message routing.
@@ -20,7 +111,8 @@ class ChannelManager:
     Responsibilities:
     - Initialize enabled channels (Telegram, WhatsApp, etc.)
     - Start/stop channels
-    - Route outbound messages
+    - Route outbound messages through per-channel send queues, so a slow
+      platform does not hold up replies on the others
     """
     
     def __init__(self, config: Config, bus: MessageBus):
@@ -28,6 +120,7 @@ class ChannelManager:
         self.bus = bus
         self.channels: dict[str, BaseChannel] = {}
         self._dispatch_task: asyncio.Task | None = None
+        self._senders: dict[str, _ChannelSender] = {}
         
         self._init_channels()
     
@@ -173,6 +266,11 @@ class ChannelManager:
                 await self._dispatch_task
             except asyncio.CancelledError:
                 pass
+
+        # Flush and stop send workers
+        for sender in self._senders.values():
+            await sender.stop()
+        self._senders.clear()
         
         # Stop all channels
         for name, channel in self.channels.items():
@@ -200,19 +298,33 @@ class ChannelManager:
                         continue
                 
                 channel = self.channels.get(msg.channel)
+                if channel and msg.metadata.get("_stream") and not channel.supports_streaming:
+                    continue
                 if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error("Error sending to {}: {}", msg.channel, e)
+                    await self._sender(msg.channel, channel).submit(msg)
                 else:
                     logger.warning("Unknown channel: {}", msg.channel)
+                    self.bus.ack(msg)
                     
             except asyncio.TimeoutError:
                 continue
             except asyncio.CancelledError:
                 break
     
+    def _sender(self, name: str, channel: BaseChannel) -> _ChannelSender:
+        """Get the send queues for a channel, starting its workers on first use."""
+        sender = self._senders.get(name)
+        if sender is None:
+            cfg = self.config.channels
+            sender = self._senders[name] = _ChannelSender(
+                name,
+                channel,
+                self.bus,
+                workers=cfg.outbound_workers,
+                queue_size=cfg.outbound_queue_size,
+            )
+        return sender
+
     def get_channel(self, name: str) -> BaseChannel | None:
         """Get a channel by name."""
         return self.channels.get(name)
@@ -222,7 +334,8 @@ class ChannelManager:
         return {
             name: {
                 "enabled": True,
-                "running": channel.is_running
+                "running": channel.is_running,
+                "pending": self._senders[name].pending if name in self._senders else 0,
             }
             for name, channel in self.channels.items()
         }
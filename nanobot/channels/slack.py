@@ -22,6 +22,7 @@ class SlackChannel(BaseChannel):
     """Slack channel using Socket Mode."""
 
     name = "slack"
+    supports_streaming = True
 
     def __init__(self, config: SlackConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -86,7 +87,17 @@ class SlackChannel(BaseChannel):
             use_thread = thread_ts and channel_type != "im"
             thread_ts_param = thread_ts if use_thread else None
 
-            if msg.content:
+            if msg.metadata.get("_stream"):
+                await self._send_stream_update(msg, thread_ts_param)
+                return
+
+            stream_id = msg.metadata.get("_stream_id")
+            edit_ts = self._stream_refs.pop(stream_id, None) if stream_id else None
+            if msg.content and edit_ts:
+                await self._web_client.chat_update(
+                    channel=msg.chat_id, ts=edit_ts, text=self._to_mrkdwn(msg.content),
+                )
+            elif msg.content:
                 await self._web_client.chat_postMessage(
                     channel=msg.chat_id,
                     text=self._to_mrkdwn(msg.content),
@@ -105,6 +116,21 @@ class SlackChannel(BaseChannel):
         except Exception as e:
             logger.error("Error sending Slack message: {}", e)
 
+    async def _send_stream_update(self, msg: OutboundMessage, thread_ts: str | None) -> None:
+        """Post or update the message that shows a streaming reply."""
+        stream_id = msg.metadata.get("_stream_id")
+        ts = self._stream_refs.get(stream_id)
+        try:
+            if ts is None:
+                resp = await self._web_client.chat_postMessage(
+                    channel=msg.chat_id, text=msg.content, thread_ts=thread_ts,
+                )
+                self._remember_stream(stream_id, resp.get("ts"))
+            else:
+                await self._web_client.chat_update(channel=msg.chat_id, ts=ts, text=msg.content)
+        except Exception as e:
+            logger.debug("Slack stream update failed: {}", e)
+
     async def _on_socket_request(
         self,
         client: SocketModeClient,
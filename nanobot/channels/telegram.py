@@ -106,6 +106,7 @@ class TelegramChannel(BaseChannel):
     """
     
     name = "telegram"
+    supports_streaming = True
     
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
@@ -259,9 +260,18 @@ class TelegramChannel(BaseChannel):
                     reply_parameters=reply_params
                 )
 
+        if msg.metadata.get("_stream"):
+            await self._send_stream_update(chat_id, msg, reply_params)
+            return
+
         # Send text content
         if msg.content and msg.content != "[empty message]":
-            for chunk in _split_message(msg.content):
+            chunks = _split_message(msg.content)
+            stream_id = msg.metadata.get("_stream_id")
+            edit_id = self._stream_refs.pop(stream_id, None) if stream_id else None
+            if edit_id is not None and await self._edit_text(chat_id, edit_id, chunks[0]):
+                chunks = chunks[1:]
+            for chunk in chunks:
                 try:
                     html = _markdown_to_telegram_html(chunk)
                     await self._app.bot.send_message(
@@ -281,6 +291,45 @@ class TelegramChannel(BaseChannel):
                     except Exception as e2:
                         logger.error("Error sending Telegram message: {}", e2)
     
+    async def _send_stream_update(
+        self, chat_id: int, msg: OutboundMessage, reply_params: ReplyParameters | None,
+    ) -> None:
+        """Send or edit the plain-text message that shows a streaming reply."""
+        stream_id = msg.metadata.get("_stream_id")
+        text = msg.content[:4000]  # stay within one message while streaming
+        message_id = self._stream_refs.get(stream_id)
+        try:
+            if message_id is None:
+                sent = await self._app.bot.send_message(
+                    chat_id=chat_id, text=text, reply_parameters=reply_params
+                )
+                self._remember_stream(stream_id, sent.message_id)
+            else:
+                await self._app.bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=text)
+        except Exception as e:
+            logger.debug("Telegram stream update failed: {}", e)
+
+    async def _edit_text(self, chat_id: int, message_id: int, chunk: str) -> bool:
+        """Replace a streamed message with the final formatted text. Returns True on success."""
+        try:
+            await self._app.bot.edit_message_text(
+                chat_id=chat_id, message_id=message_id,
+                text=_markdown_to_telegram_html(chunk), parse_mode="HTML",
+            )
+            return True
+        except Exception as e:
+            if "not modified" in str(e).lower():
+                return True
+            logger.warning("HTML edit failed, falling back to plain text: {}", e)
+        try:
+            await self._app.bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=chunk)
+            return True
+        except Exception as e:
+            if "not modified" in str(e).lower():
+                return True
+            logger.error("Error editing Telegram message: {}", e)
+            return False
+
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
         if not update.message or not update.effective_user:
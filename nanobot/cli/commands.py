@@ -230,14 +230,49 @@ def _create_workspace_templates(workspace: Path):
 
 
 def _make_provider(config: Config):
-    """Create the appropriate LLM provider from config."""
+    """Create the LLM provider from config, with routing, retries and fallback models."""
+    from nanobot.providers.resilient import ResilientProvider
+
+    retry = config.agents.defaults.retry
+    routing = config.agents.defaults.routing
+    if routing.backends:
+        from nanobot.providers.routing import RoutingProvider
+
+        backends = []
+        for entry in routing.backends:
+            name, _, model = entry.partition(":") if ":" in entry else ("", "", entry)
+            if backend := _make_model_provider(config, model, name or None):
+                backends.append((backend, model))
+            else:
+                console.print(f"[yellow]Warning: no API key for routing backend {entry}, skipping it[/yellow]")
+        provider = RoutingProvider.from_config(backends, routing) if backends else None
+    else:
+        provider = _make_model_provider(config, config.agents.defaults.model)
+    if provider is None:
+        console.print("[red]Error: No API key configured.[/red]")
+        console.print("Set one in ~/.nanobot/config.json under providers section")
+        raise typer.Exit(1)
+
+    fallbacks = []
+    for model in retry.fallback_models:
+        if fallback := _make_model_provider(config, model):
+            fallbacks.append((fallback, model))
+        else:
+            console.print(f"[yellow]Warning: no API key for fallback model {model}, skipping it[/yellow]")
+    return ResilientProvider.from_config(provider, fallbacks, retry)
+
+
+def _make_model_provider(config: Config, model: str, provider: str | None = None):
+    """Create the provider that serves ``model``, or None if it has no credentials.
+
+    ``provider`` names a configured provider to use instead of matching one by model.
+    """
+    from nanobot.providers.custom_provider import CustomProvider
     from nanobot.providers.litellm_provider import LiteLLMProvider
     from nanobot.providers.openai_codex_provider import OpenAICodexProvider
-    from nanobot.providers.custom_provider import CustomProvider
 
-    model = config.agents.defaults.model
-    provider_name = config.get_provider_name(model)
-    p = config.get_provider(model)
+    provider_name = config.get_provider_name(model, provider)
+    p = config.get_provider(model, provider)
 
     # OpenAI Codex (OAuth)
     if provider_name == "openai_codex" or model.startswith("openai-codex/"):
@@ -247,42 +282,102 @@ def _make_provider(config: Config):
     if provider_name == "custom":
         return CustomProvider(
             api_key=p.api_key if p else "no-key",
-            api_base=config.get_api_base(model) or "http://localhost:8000/v1",
+            api_base=config.get_api_base(model, provider) or "http://localhost:8000/v1",
             default_model=model,
         )
 
     from nanobot.providers.registry import find_by_name
     spec = find_by_name(provider_name)
     if not model.startswith("bedrock/") and not (p and p.api_key) and not (spec and spec.is_oauth):
-        console.print("[red]Error: No API key configured.[/red]")
-        console.print("Set one in ~/.nanobot/config.json under providers section")
-        raise typer.Exit(1)
+        return None
 
     return LiteLLMProvider(
         api_key=p.api_key if p else None,
-        api_base=config.get_api_base(model),
+        api_base=config.get_api_base(model, provider),
         default_model=model,
         extra_headers=p.extra_headers if p else None,
         provider_name=provider_name,
     )
 
 
+def _make_session_manager(config: Config):
+    """Create the session manager for the configured storage backend."""
+    from nanobot.session.manager import SessionManager
+    from nanobot.session.store import create_store
+
+    workspace = config.workspace_path
+    return SessionManager(
+        workspace,
+        max_cached=config.sessions.cache_size,
+        max_cached_bytes=config.sessions.cache_bytes,
+        idle_ttl=config.sessions.idle_seconds,
+        store=create_store(workspace, config.sessions.backend),
+    )
+
+
+def _make_bus(config: Config):
+    """Create the gateway message bus for the configured backend."""
+    from nanobot.bus.queue import MessageBus
+
+    if config.bus.backend == "sqlite":
+        from nanobot.bus.durable import DurableMessageBus
+        return DurableMessageBus.from_config(config.bus)
+    return MessageBus.from_config(config.bus)
+
+
+def _make_http_client(config: Config):
+    """Create the shared HTTP client from config and install it process-wide."""
+    from nanobot.utils.http import SharedHttpClient, set_http_client
+
+    client = SharedHttpClient.from_config(config.tools.http)
+    set_http_client(client)
+    return client
+
+
 # ============================================================================
 # Gateway / Server
 # ============================================================================
 
 
+def _make_gateway_agent(config: Config, bus, provider, cron, session_manager, http_client):
+    """Create the agent loop used by the gateway and its worker processes."""
+    from nanobot.agent.loop import AgentLoop
+
+    return AgentLoop(
+        bus=bus,
+        provider=provider,
+        workspace=config.workspace_path,
+        model=config.agents.defaults.model,
+        temperature=config.agents.defaults.temperature,
+        max_tokens=config.agents.defaults.max_tokens,
+        max_iterations=config.agents.defaults.max_tool_iterations,
+        memory_window=config.agents.defaults.memory_window,
+        context_budget=config.agents.defaults.context_budget_for(config.agents.defaults.model),
+        max_concurrent_sessions=config.agents.defaults.max_concurrent_sessions,
+        max_background_sessions=config.agents.defaults.max_background_sessions,
+        parallel_tool_calls=config.agents.defaults.parallel_tool_calls,
+        brave_api_key=config.tools.web.search.api_key or None,
+        exec_config=config.tools.exec,
+        cron_service=cron,
+        restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=session_manager,
+        http_client=http_client,
+        web_fetch_config=config.tools.web.fetch,
+        web_search_config=config.tools.web.search,
+        mcp_servers=config.tools.mcp_servers,
+        channels_config=config.channels,
+    )
+
+
 @app.command()
 def gateway(
     port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
+    workers: int | None = typer.Option(None, "--workers", "-w", help="Agent worker processes (default: gateway.workers)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """Start the nanobot gateway."""
     from nanobot.config.loader import load_config, get_data_dir
-    from nanobot.bus.queue import MessageBus
-    from nanobot.agent.loop import AgentLoop
     from nanobot.channels.manager import ChannelManager
-    from nanobot.session.manager import SessionManager
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
@@ -294,32 +389,19 @@ def gateway(
     console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
     
     config = load_config()
-    bus = MessageBus()
+    bus = _make_bus(config)
     provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    session_manager = _make_session_manager(config)
+    http_client = _make_http_client(config)
+    workers = config.gateway.workers if workers is None else workers
     
-    # Create cron service first (callback set after agent creation)
+    # Create cron service first (callback set after agent creation).
+    # Workers add jobs to the same store, so watch it for changes.
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = CronService(cron_store_path, watch_interval=10.0 if workers > 1 else None)
     
     # Create agent with cron service
-    agent = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model,
-        temperature=config.agents.defaults.temperature,
-        max_tokens=config.agents.defaults.max_tokens,
-        max_iterations=config.agents.defaults.max_tool_iterations,
-        memory_window=config.agents.defaults.memory_window,
-        brave_api_key=config.tools.web.search.api_key or None,
-        exec_config=config.tools.exec,
-        cron_service=cron,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        session_manager=session_manager,
-        mcp_servers=config.tools.mcp_servers,
-        channels_config=config.channels,
-    )
+    agent = _make_gateway_agent(config, bus, provider, cron, session_manager, http_client)
     
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
@@ -329,6 +411,7 @@ def gateway(
             session_key=f"cron:{job.id}",
             channel=job.payload.channel or "cli",
             chat_id=job.payload.to or "direct",
+            lane="background",
         )
         if job.payload.deliver and job.payload.to:
             from nanobot.bus.events import OutboundMessage
@@ -336,7 +419,7 @@ def gateway(
                 channel=job.payload.channel or "cli",
                 chat_id=job.payload.to,
                 content=response or ""
-            ))
+            ), lane="background")
         return response
     cron.on_job = on_cron_job
     
@@ -373,6 +456,7 @@ def gateway(
             channel=channel,
             chat_id=chat_id,
             on_progress=_silent,
+            lane="background",
         )
 
     async def on_heartbeat_notify(response: str) -> None:
@@ -381,7 +465,9 @@ def gateway(
         channel, chat_id = _pick_heartbeat_target()
         if channel == "cli":
             return  # No external channel available to deliver to
-        await bus.publish_outbound(OutboundMessage(channel=channel, chat_id=chat_id, content=response))
+        await bus.publish_outbound(
+            OutboundMessage(channel=channel, chat_id=chat_id, content=response), lane="background",
+        )
 
     hb_cfg = config.gateway.heartbeat
     heartbeat = HeartbeatService(
@@ -404,15 +490,31 @@ def gateway(
         console.print(f"[green]✓[/green] Cron: {cron_status['jobs']} scheduled jobs")
     
     console.print(f"[green]✓[/green] Heartbeat: every {hb_cfg.interval_s}s")
+
+    broker = pool = None
+    if workers > 1:
+        # Chat turns run in worker processes; this process keeps the channels,
+        # cron and heartbeat, and routes messages to workers by session key.
+        from nanobot.bus.ipc import AgentWorkerPool, IpcBroker
+
+        socket_path = get_data_dir() / f"gateway-{os.getpid()}.sock"
+        broker = IpcBroker(bus, socket_path, workers)
+        pool = AgentWorkerPool(socket_path, workers)
+        console.print(f"[green]✓[/green] Agent workers: {workers}")
     
     async def run():
         try:
             await cron.start()
             await heartbeat.start()
-            await asyncio.gather(
-                agent.run(),
-                channels.start_all(),
-            )
+            if broker and pool:
+                await broker.start()
+                await pool.start()
+                await channels.start_all()
+            else:
+                await asyncio.gather(
+                    agent.run(),
+                    channels.start_all(),
+                )
         except KeyboardInterrupt:
             console.print("\nShutting down...")
         finally:
@@ -420,11 +522,61 @@ def gateway(
             heartbeat.stop()
             cron.stop()
             agent.stop()
+            if broker and pool:
+                await pool.stop()
+                await broker.stop()
             await channels.stop_all()
+            await http_client.aclose()
+            session_manager.close()
+            bus.close()
     
     asyncio.run(run())
 
 
+@app.command("gateway-worker", hidden=True)
+def gateway_worker(
+    socket: Path = typer.Option(..., "--socket", help="Gateway IPC socket"),
+    index: int = typer.Option(..., "--index", help="Worker index"),
+):
+    """Run one agent worker process for a multi-process gateway."""
+    from loguru import logger
+
+    from nanobot.bus.ipc import IpcMessageBus
+    from nanobot.config.loader import get_data_dir, load_config
+    from nanobot.cron.service import CronService
+
+    config = load_config()
+    bus = IpcMessageBus(socket, index)
+    provider = _make_provider(config)
+    session_manager = _make_session_manager(config)
+    http_client = _make_http_client(config)
+    # Jobs added here are written to the shared store and run by the gateway process.
+    cron = CronService(get_data_dir() / "cron" / "jobs.json")
+    agent = _make_gateway_agent(config, bus, provider, cron, session_manager, http_client)
+
+    async def run():
+        await bus.connect()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, agent.stop)
+        logger.info("Agent worker {} started (pid {})", index, os.getpid())
+        agent_task = asyncio.create_task(agent.run())
+        lost = asyncio.create_task(bus.disconnected.wait())
+        try:
+            await asyncio.wait({agent_task, lost}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            agent.stop()
+            lost.cancel()
+            await asyncio.gather(agent_task, return_exceptions=True)
+            await agent.close_mcp()
+            await http_client.aclose()
+            session_manager.close()
+            bus.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
 
 
 # ============================================================================
@@ -469,10 +621,18 @@ def agent(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        context_budget=config.agents.defaults.context_budget_for(config.agents.defaults.model),
+        max_concurrent_sessions=config.agents.defaults.max_concurrent_sessions,
+        max_background_sessions=config.agents.defaults.max_background_sessions,
+        parallel_tool_calls=config.agents.defaults.parallel_tool_calls,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=_make_session_manager(config),
+        http_client=_make_http_client(config),
+        web_fetch_config=config.tools.web.fetch,
+        web_search_config=config.tools.web.search,
         mcp_servers=config.tools.mcp_servers,
         channels_config=config.channels,
     )
@@ -500,6 +660,7 @@ def agent(
                 response = await agent_loop.process_direct(message, session_id, on_progress=_cli_progress)
             _print_agent_response(response, render_markdown=markdown)
             await agent_loop.close_mcp()
+            await agent_loop.http_client.aclose()
 
         asyncio.run(run_once())
     else:
@@ -530,6 +691,8 @@ def agent(
                 while True:
                     try:
                         msg = await asyncio.wait_for(bus.consume_outbound(), timeout=1.0)
+                        if msg.metadata.get("_stream"):
+                            continue  # the terminal prints the final reply only
                         if msg.metadata.get("_progress"):
                             is_tool_hint = msg.metadata.get("_tool_hint", False)
                             ch = agent_loop.channels_config
@@ -595,6 +758,7 @@ def agent(
                 outbound_task.cancel()
                 await asyncio.gather(bus_task, outbound_task, return_exceptions=True)
                 await agent_loop.close_mcp()
+                await agent_loop.http_client.aclose()
 
         asyncio.run(run_interactive())
 
@@ -960,9 +1124,17 @@ def cron_run(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        context_budget=config.agents.defaults.context_budget_for(config.agents.defaults.model),
+        max_concurrent_sessions=config.agents.defaults.max_concurrent_sessions,
+        max_background_sessions=config.agents.defaults.max_background_sessions,
+        parallel_tool_calls=config.agents.defaults.parallel_tool_calls,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=_make_session_manager(config),
+        http_client=_make_http_client(config),
+        web_fetch_config=config.tools.web.fetch,
+        web_search_config=config.tools.web.search,
         mcp_servers=config.tools.mcp_servers,
         channels_config=config.channels,
     )
@@ -995,6 +1167,34 @@ def cron_run(
         console.print(f"[red]Failed to run job {job_id}[/red]")
 
 
+# ============================================================================
+# Session Commands
+# ============================================================================
+
+
+sessions_app = typer.Typer(help="Manage conversation sessions")
+app.add_typer(sessions_app, name="sessions")
+
+
+@sessions_app.command("migrate")
+def sessions_migrate():
+    """Copy JSONL sessions into the SQLite session store."""
+    from nanobot.config.loader import load_config
+    from nanobot.session.store import create_store, migrate_sessions
+
+    config = load_config()
+    source = create_store(config.workspace_path, "jsonl")
+    target = create_store(config.workspace_path, "sqlite")
+    try:
+        count = migrate_sessions(source, target)
+    finally:
+        target.close()
+
+    console.print(f"[green]✓[/green] Migrated {count} session(s) to {target.path}")
+    if config.sessions.backend != "sqlite":
+        console.print('Set [cyan]"sessions": {"backend": "sqlite"}[/cyan] in ~/.nanobot/config.json to use it')
+
+
 # ============================================================================
 # Status Commands
 # ============================================================================
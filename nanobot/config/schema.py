@@ -189,6 +189,10 @@ class ChannelsConfig(Base):
 
     send_progress: bool = True    # stream agent's text progress to the channel
     send_tool_hints: bool = False  # stream tool-call hints (e.g. read_file("…"))
+    stream_replies: bool = False  # edit one message as the reply streams (Telegram, Discord, Slack)
+    stream_interval: float = 1.0  # min seconds between streamed edits
+    outbound_workers: int = 4  # parallel senders per channel; each chat always uses the same one
+    outbound_queue_size: int = 256  # unsent replies per channel before dispatch waits; progress updates beyond it are dropped
     whatsapp: WhatsAppConfig = Field(default_factory=WhatsAppConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
     discord: DiscordConfig = Field(default_factory=DiscordConfig)
@@ -201,6 +205,27 @@ class ChannelsConfig(Base):
     matrix: MatrixConfig = Field(default_factory=MatrixConfig)
 
 
+class LLMRetryConfig(Base):
+    """Retries, circuit breaking and fallback models for LLM calls."""
+
+    max_attempts: int = 3  # Attempts per model for rate limits, overloads, timeouts and server errors
+    base_delay: float = 1.0  # Backoff base in seconds (jittered, doubles per attempt)
+    max_delay: float = 30.0  # Longest wait; a longer Retry-After fails over instead
+    breaker_threshold: int = 5  # Consecutive failures before a model is skipped (0 = never)
+    breaker_cooldown: float = 30.0  # Seconds a tripped model is skipped before one trial call
+    fallback_models: list[str] = Field(default_factory=list)  # Tried in order when the main model fails
+
+
+class RoutingConfig(Base):
+    """Latency-aware routing of LLM calls across backends serving the same model."""
+
+    backends: list[str] = Field(default_factory=list)  # "provider:model" or "model"; empty = main model only
+    hedge: bool = False  # Also send slow interactive calls to the runner-up backend
+    hedge_quantile: float = 0.95  # Latency quantile after which a call is hedged
+    min_hedge_delay: float = 1.0  # Never hedge sooner than this many seconds
+    window: int = 100  # Recent calls per backend used for latency and error stats
+
+
 class AgentDefaults(Base):
     """Default agent configuration."""
 
@@ -211,6 +236,17 @@ class AgentDefaults(Base):
     temperature: float = 0.1
     max_tool_iterations: int = 40
     memory_window: int = 100
+    max_concurrent_sessions: int = 4  # Sessions processed in parallel; turns within a session stay serialized
+    max_background_sessions: int = 1  # Of those, how many may be background turns (cron, heartbeat)
+    parallel_tool_calls: bool = True  # Run side-effect-free tool calls from one response concurrently
+    context_budget: int = 120_000  # Estimated input tokens per LLM call; older tool results are cut beyond it (0 = off)
+    context_budgets: dict[str, int] = Field(default_factory=dict)  # Per-model overrides of context_budget
+    retry: LLMRetryConfig = Field(default_factory=LLMRetryConfig)
+    routing: RoutingConfig = Field(default_factory=RoutingConfig)
+
+    def context_budget_for(self, model: str) -> int:
+        """Context budget for a model, honouring per-model overrides."""
+        return self.context_budgets.get(model, self.context_budget)
 
 
 class AgentsConfig(Base):
@@ -261,20 +297,66 @@ class GatewayConfig(Base):
 
     host: str = "0.0.0.0"
     port: int = 18790
+    workers: int = 1  # Agent worker processes; >1 shards sessions across processes over a local socket
     heartbeat: HeartbeatConfig = Field(default_factory=HeartbeatConfig)
 
 
+class BusConfig(Base):
+    """Message bus configuration (gateway)."""
+
+    backend: Literal["memory", "sqlite"] = "memory"  # sqlite keeps queued messages across restarts
+    queue_size: int = 1000  # Pending messages per lane for interactive and system traffic (0 = unbounded)
+    background_queue_size: int = 100  # Pending cron/heartbeat messages (0 = unbounded)
+    overflow: Literal["block", "drop_oldest", "reject"] = "block"  # What to do when a lane is full
+    max_attempts: int = 5  # Send attempts for a reply before giving up (sqlite backend)
+
+
+class SessionsConfig(Base):
+    """Session storage configuration."""
+
+    backend: Literal["jsonl", "sqlite"] = "jsonl"  # Migrate with `nanobot sessions migrate`
+    cache_size: int = 256  # Sessions kept in memory
+    cache_bytes: int = 64 * 1024 * 1024  # On-disk size of cached sessions before evicting (0 = unbounded)
+    idle_seconds: int = 3600  # Evict sessions unused for this long (0 = never)
+
+
 class WebSearchConfig(Base):
     """Web search tool configuration."""
 
     api_key: str = ""  # Brave Search API key
     max_results: int = 5
+    cache_ttl: int = 600  # Seconds to reuse results for the same query and count (0 = off)
+    cache_size: int = 512  # Cached queries kept in memory
+
+
+class WebFetchConfig(Base):
+    """Web fetch tool configuration."""
+
+    extractor: Literal["thread", "process"] = "thread"  # Where HTML extraction runs, off the event loop
+    extract_workers: int = 2  # Size of the extraction pool
+    max_html_chars: int = 2_000_000  # Pages are cut to this many characters before parsing (0 = no limit)
+    cache_enabled: bool = True  # Cache extracted pages in ~/.nanobot/cache/web_fetch.db
+    cache_bytes: int = 50 * 1024 * 1024  # Least recently used pages are evicted beyond this size
+    cache_ttl: int = 3600  # Seconds a cached page is served without revalidating
+    cache_domain_ttls: dict[str, int] = Field(default_factory=dict)  # Per-domain TTLs, e.g. {"github.com": 600}
 
 
 class WebToolsConfig(Base):
     """Web tools configuration."""
 
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
+    fetch: WebFetchConfig = Field(default_factory=WebFetchConfig)
+
+
+class HttpConfig(Base):
+    """Shared HTTP client used by web tools and voice transcription."""
+
+    max_connections: int = 100
+    max_per_host: int = 10  # Concurrent requests to one host
+    max_keepalive: int = 20  # Idle connections kept open for reuse
+    keepalive_expiry: float = 30.0  # Seconds an idle connection stays open
+    http2: bool = False  # Requires the 'h2' package
+    proxy: str | None = None  # HTTP/SOCKS5 proxy URL, e.g. "http://127.0.0.1:7890" or "socks5://127.0.0.1:1080"
 
 
 class ExecToolConfig(Base):
@@ -299,6 +381,7 @@ class ToolsConfig(Base):
     """Tools configuration."""
 
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
@@ -312,43 +395,30 @@ class Config(BaseSettings):
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
+    sessions: SessionsConfig = Field(default_factory=SessionsConfig)
+    bus: BusConfig = Field(default_factory=BusConfig)
 
     @property
     def workspace_path(self) -> Path:
         """Get expanded workspace path."""
         return Path(self.agents.defaults.workspace).expanduser()
 
-    def _match_provider(self, model: str | None = None) -> tuple["ProviderConfig | None", str | None]:
+    def _match_provider(
+        self, model: str | None = None, provider: str | None = None,
+    ) -> tuple["ProviderConfig | None", str | None]:
         """Match provider config and its registry name. Returns (config, spec_name)."""
-        from nanobot.providers.registry import PROVIDERS
+        from nanobot.providers.registry import PROVIDERS, match_model
 
-        forced = self.agents.defaults.provider
+        forced = provider or self.agents.defaults.provider
         if forced != "auto":
             p = getattr(self.providers, forced, None)
             return (p, forced) if p else (None, None)
 
-        model_lower = (model or self.agents.defaults.model).lower()
-        model_normalized = model_lower.replace("-", "_")
-        model_prefix = model_lower.split("/", 1)[0] if "/" in model_lower else ""
-        normalized_prefix = model_prefix.replace("-", "_")
-
-        def _kw_matches(kw: str) -> bool:
-            kw = kw.lower()
-            return kw in model_lower or kw.replace("-", "_") in model_normalized
-
-        # Explicit provider prefix wins — prevents `github-copilot/...codex` matching openai_codex.
-        for spec in PROVIDERS:
-            p = getattr(self.providers, spec.name, None)
-            if p and model_prefix and normalized_prefix == spec.name:
-                if spec.is_oauth or p.api_key:
-                    return p, spec.name
-
-        # Match by keyword (order follows PROVIDERS registry)
-        for spec in PROVIDERS:
+        # Explicit provider prefix first, then keywords (order follows PROVIDERS registry)
+        for spec in match_model(model or self.agents.defaults.model):
             p = getattr(self.providers, spec.name, None)
-            if p and any(_kw_matches(kw) for kw in spec.keywords):
-                if spec.is_oauth or p.api_key:
-                    return p, spec.name
+            if p and (spec.is_oauth or p.api_key):
+                return p, spec.name
 
         # Fallback: gateways first, then others (follows registry order)
         # OAuth providers are NOT valid fallbacks — they require explicit model selection
@@ -360,14 +430,14 @@ class Config(BaseSettings):
                 return p, spec.name
         return None, None
 
-    def get_provider(self, model: str | None = None) -> ProviderConfig | None:
+    def get_provider(self, model: str | None = None, provider: str | None = None) -> ProviderConfig | None:
         """Get matched provider config (api_key, api_base, extra_headers). Falls back to first available."""
-        p, _ = self._match_provider(model)
+        p, _ = self._match_provider(model, provider)
         return p
 
-    def get_provider_name(self, model: str | None = None) -> str | None:
+    def get_provider_name(self, model: str | None = None, provider: str | None = None) -> str | None:
         """Get the registry name of the matched provider (e.g. "deepseek", "openrouter")."""
-        _, name = self._match_provider(model)
+        _, name = self._match_provider(model, provider)
         return name
 
     def get_api_key(self, model: str | None = None) -> str | None:
@@ -375,11 +445,11 @@ class Config(BaseSettings):
         p = self.get_provider(model)
         return p.api_key if p else None
 
-    def get_api_base(self, model: str | None = None) -> str | None:
+    def get_api_base(self, model: str | None = None, provider: str | None = None) -> str | None:
         """Get API base URL for the given model. Applies default URLs for known gateways."""
         from nanobot.providers.registry import find_by_name
 
-        p, name = self._match_provider(model)
+        p, name = self._match_provider(model, provider)
         if p and p.api_base:
             return p.api_base
         # Only gateways get a default api_base here. Standard providers
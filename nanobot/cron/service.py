@@ -4,13 +4,15 @@ import asyncio
 import json
 import time
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Iterator
 
 from loguru import logger
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from nanobot.utils.helpers import atomic_write_text, file_lock
 
 
 def _now_ms() -> int:
@@ -59,25 +61,47 @@ def _validate_schedule_for_add(schedule: CronSchedule) -> None:
             raise ValueError(f"unknown timezone '{schedule.tz}'") from None
 
 
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """
+    Service for managing and executing scheduled jobs.
+
+    The job store is re-read whenever the file changed on disk, so jobs added
+    by another process sharing it (e.g. gateway workers) are picked up. With
+    ``watch_interval`` set, the timer also wakes at least that often to look.
+    Every change is made under a file lock on a fresh read of the store, so
+    concurrent writers never overwrite each other's jobs.
+    """
     
     def __init__(
         self,
         store_path: Path,
-        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None
+        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        watch_interval: float | None = None,
     ):
         self.store_path = store_path
+        self._lock_path = store_path.with_name(store_path.name + ".lock")
         self.on_job = on_job  # Callback to execute job, returns response text
+        self.watch_interval = watch_interval
         self._store: CronStore | None = None
+        self._store_stamp: tuple[int, int] | None = None  # (mtime, size) of the file _store reflects
         self._timer_task: asyncio.Task | None = None
         self._running = False
     
     def _load_store(self) -> CronStore:
-        """Load jobs from disk."""
-        if self._store:
+        """Load jobs from disk, reusing the loaded store while the file is unchanged."""
+        stamp = _file_stamp(self.store_path)
+        if self._store and stamp == self._store_stamp:
             return self._store
         
+        self._store_stamp = stamp
         if self.store_path.exists():
             try:
                 data = json.loads(self.store_path.read_text(encoding="utf-8"))
@@ -120,6 +144,13 @@ class CronService:
         
         return self._store
     
+    @contextmanager
+    def _locked(self) -> Iterator[CronStore]:
+        """Hold the store's file lock and yield the store as it is on disk."""
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self._lock_path):
+            yield self._load_store()
+
     def _save_store(self) -> None:
         """Save jobs to disk."""
         if not self._store:
@@ -162,14 +193,15 @@ class CronService:
             ]
         }
         
-        self.store_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        atomic_write_text(self.store_path, json.dumps(data, indent=2, ensure_ascii=False))
+        self._store_stamp = _file_stamp(self.store_path)
     
     async def start(self) -> None:
         """Start the cron service."""
         self._running = True
-        self._load_store()
-        self._recompute_next_runs()
-        self._save_store()
+        with self._locked():
+            self._recompute_next_runs()
+            self._save_store()
         self._arm_timer()
         logger.info("Cron service started with {} jobs", len(self._store.jobs if self._store else []))
     
@@ -203,11 +235,12 @@ class CronService:
             self._timer_task.cancel()
         
         next_wake = self._get_next_wake_ms()
-        if not next_wake or not self._running:
+        if not self._running or not (next_wake or self.watch_interval):
             return
         
-        delay_ms = max(0, next_wake - _now_ms())
-        delay_s = delay_ms / 1000
+        delay_s = max(0, next_wake - _now_ms()) / 1000 if next_wake else self.watch_interval
+        if self.watch_interval:
+            delay_s = min(delay_s, self.watch_interval)
         
         async def tick():
             await asyncio.sleep(delay_s)
@@ -218,8 +251,7 @@ class CronService:
     
     async def _on_timer(self) -> None:
         """Handle timer tick - run due jobs."""
-        if not self._store:
-            return
+        self._load_store()
         
         now = _now_ms()
         due_jobs = [
@@ -230,41 +262,45 @@ class CronService:
         for job in due_jobs:
             await self._execute_job(job)
         
-        self._save_store()
         self._arm_timer()
     
     async def _execute_job(self, job: CronJob) -> None:
-        """Execute a single job."""
+        """Execute a single job and record the outcome in the store."""
         start_ms = _now_ms()
+        job_id = job.id
         logger.info("Cron: executing job '{}' ({})", job.name, job.id)
         
         try:
-            response = None
             if self.on_job:
-                response = await self.on_job(job)
-            
-            job.state.last_status = "ok"
-            job.state.last_error = None
+                await self.on_job(job)
+            status, error = "ok", None
             logger.info("Cron: job '{}' completed", job.name)
             
         except Exception as e:
-            job.state.last_status = "error"
-            job.state.last_error = str(e)
+            status, error = "error", str(e)
             logger.error("Cron: job '{}' failed: {}", job.name, e)
         
-        job.state.last_run_at_ms = start_ms
-        job.updated_at_ms = _now_ms()
-        
-        # Handle one-shot jobs
-        if job.schedule.kind == "at":
-            if job.delete_after_run:
-                self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
+        # The job ran without the lock held; apply the outcome to the store as it is now.
+        with self._locked() as store:
+            job = next((j for j in store.jobs if j.id == job_id), None)
+            if job is None:
+                return  # removed while it ran
+            job.state.last_status = status
+            job.state.last_error = error
+            job.state.last_run_at_ms = start_ms
+            job.updated_at_ms = _now_ms()
+
+            # Handle one-shot jobs
+            if job.schedule.kind == "at":
+                if job.delete_after_run:
+                    store.jobs = [j for j in store.jobs if j.id != job.id]
+                else:
+                    job.enabled = False
+                    job.state.next_run_at_ms = None
             else:
-                job.enabled = False
-                job.state.next_run_at_ms = None
-        else:
-            # Compute next run
-            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+                # Compute next run
+                job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            self._save_store()
     
     # ========== Public API ==========
     
@@ -285,7 +321,6 @@ class CronService:
         delete_after_run: bool = False,
     ) -> CronJob:
         """Add a new job."""
-        store = self._load_store()
         _validate_schedule_for_add(schedule)
         now = _now_ms()
         
@@ -307,8 +342,9 @@ class CronService:
             delete_after_run=delete_after_run,
         )
         
-        store.jobs.append(job)
-        self._save_store()
+        with self._locked() as store:
+            store.jobs.append(job)
+            self._save_store()
         self._arm_timer()
         
         logger.info("Cron: added job '{}' ({})", name, job.id)
@@ -316,13 +352,14 @@ class CronService:
     
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
-        store = self._load_store()
-        before = len(store.jobs)
-        store.jobs = [j for j in store.jobs if j.id != job_id]
-        removed = len(store.jobs) < before
+        with self._locked() as store:
+            before = len(store.jobs)
+            store.jobs = [j for j in store.jobs if j.id != job_id]
+            removed = len(store.jobs) < before
+            if removed:
+                self._save_store()
         
         if removed:
-            self._save_store()
             self._arm_timer()
             logger.info("Cron: removed job {}", job_id)
         
@@ -330,19 +367,19 @@ class CronService:
     
     def enable_job(self, job_id: str, enabled: bool = True) -> CronJob | None:
         """Enable or disable a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                job.enabled = enabled
-                job.updated_at_ms = _now_ms()
-                if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
-                else:
-                    job.state.next_run_at_ms = None
-                self._save_store()
-                self._arm_timer()
-                return job
-        return None
+        with self._locked() as store:
+            job = next((j for j in store.jobs if j.id == job_id), None)
+            if job is None:
+                return None
+            job.enabled = enabled
+            job.updated_at_ms = _now_ms()
+            if enabled:
+                job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            else:
+                job.state.next_run_at_ms = None
+            self._save_store()
+        self._arm_timer()
+        return job
     
     async def run_job(self, job_id: str, force: bool = False) -> bool:
         """Manually run a job."""
@@ -352,7 +389,6 @@ class CronService:
                 if not force and not job.enabled:
                     return False
                 await self._execute_job(job)
-                self._save_store()
                 self._arm_timer()
                 return True
         return False
@@ -2,7 +2,9 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, AsyncIterator, Callable
+
+import json_repair
 
 
 @dataclass
@@ -21,6 +23,7 @@ class LLMResponse:
     finish_reason: str = "stop"
     usage: dict[str, int] = field(default_factory=dict)
     reasoning_content: str | None = None  # Kimi, DeepSeek-R1 etc.
+    error: Exception | None = field(default=None, repr=False)  # Set with finish_reason="error"
     
     @property
     def has_tool_calls(self) -> bool:
@@ -28,6 +31,129 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+@dataclass
+class StreamChunk:
+    """One increment of a streamed completion.
+
+    Text arrives in ``delta``; the final chunk carries the assembled ``response``.
+    """
+    delta: str = ""
+    response: LLMResponse | None = None
+
+
+def usage_to_dict(u: Any) -> dict[str, int]:
+    """Token counts from an OpenAI-style usage object, including prompt-cache reads/writes."""
+    usage = {
+        "prompt_tokens": u.prompt_tokens,
+        "completion_tokens": u.completion_tokens,
+        "total_tokens": u.total_tokens,
+    }
+    # Anthropic reports cache_read/cache_creation_input_tokens; OpenAI-style APIs
+    # (incl. OpenRouter) report prompt_tokens_details.cached_tokens.
+    details = getattr(u, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        cached = details.get("cached_tokens")
+    else:
+        cached = getattr(details, "cached_tokens", None)
+    read = getattr(u, "cache_read_input_tokens", None) or cached
+    write = getattr(u, "cache_creation_input_tokens", None)
+    if isinstance(read, int) and read:
+        usage["cache_read_tokens"] = read
+    if isinstance(write, int) and write:
+        usage["cache_write_tokens"] = write
+    return usage
+
+
+class StreamAccumulator:
+    """Assemble OpenAI-style streaming chunks into an LLMResponse.
+
+    Tool-call fragments are keyed by their ``index`` and concatenated as they
+    arrive, so arguments split across many chunks come out whole.
+    """
+
+    def __init__(self) -> None:
+        self._content: list[str] = []
+        self._reasoning: list[str] = []
+        self._tool_calls: dict[int, dict[str, str]] = {}
+        self.finish_reason = "stop"
+        self.usage: dict[str, int] = {}
+
+    def add(self, chunk: Any) -> str:
+        """Fold one chunk into the response. Returns its text delta."""
+        if u := getattr(chunk, "usage", None):
+            self.usage = usage_to_dict(u)
+        if not getattr(chunk, "choices", None):
+            return ""
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+        delta = choice.delta
+        if delta is None:
+            return ""
+        if reasoning := getattr(delta, "reasoning_content", None):
+            self._reasoning.append(reasoning)
+        for tc in getattr(delta, "tool_calls", None) or []:
+            index = tc.index if tc.index is not None else len(self._tool_calls)
+            buf = self._tool_calls.setdefault(index, {"id": "", "name": "", "arguments": ""})
+            if tc.id:
+                buf["id"] = tc.id
+            if fn := tc.function:
+                if fn.name and not buf["name"]:
+                    buf["name"] = fn.name
+                if fn.arguments:
+                    buf["arguments"] += fn.arguments
+        text = delta.content or ""
+        if text:
+            self._content.append(text)
+        return text
+
+    def response(self) -> LLMResponse:
+        """Build the final response from everything seen so far."""
+        tool_calls = [
+            ToolCallRequest(
+                id=buf["id"] or f"call_{index}",
+                name=buf["name"],
+                arguments=json_repair.loads(buf["arguments"]) if buf["arguments"] else {},
+            )
+            for index, buf in sorted(self._tool_calls.items())
+        ]
+        return LLMResponse(
+            content="".join(self._content) or None,
+            tool_calls=tool_calls,
+            finish_reason=self.finish_reason,
+            usage=self.usage,
+            reasoning_content="".join(self._reasoning) or None,
+        )
+
+
+class MessageBuffer:
+    """Provider-ready copies of a message list that grows between calls.
+
+    The agent loop appends to its message list and never changes messages it
+    has already sent, so each ``update()`` only prepares the messages added
+    since the previous call. The unchanged prefix is found by identity; a
+    list that diverges from it (e.g. trimmed to a budget) is re-prepared from
+    the first differing message.
+    """
+
+    def __init__(self, prepare: Callable[[dict[str, Any]], dict[str, Any]]):
+        self._prepare = prepare
+        self._source: list[dict[str, Any]] = []
+        self._prepared: list[dict[str, Any]] = []
+
+    def update(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return prepared copies of ``messages``."""
+        same = 0
+        limit = min(len(messages), len(self._source))
+        while same < limit and messages[same] is self._source[same]:
+            same += 1
+        del self._source[same:], self._prepared[same:]
+        for msg in messages[same:]:
+            self._source.append(msg)
+            self._prepared.append(self._prepare(msg))
+        return list(self._prepared)
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -47,38 +173,38 @@ class LLMProvider(ABC):
         Empty content can appear when MCP tools return nothing. Most providers
         reject empty-string content or empty text blocks in list content.
         """
-        result: list[dict[str, Any]] = []
-        for msg in messages:
-            content = msg.get("content")
+        return [LLMProvider._sanitize_empty_message(msg) for msg in messages]
+
+    @staticmethod
+    def _sanitize_empty_message(msg: dict[str, Any]) -> dict[str, Any]:
+        """Return ``msg``, or a cleaned copy if its content is empty."""
+        content = msg.get("content")
 
-            if isinstance(content, str) and not content:
+        if isinstance(content, str) and not content:
+            clean = dict(msg)
+            clean["content"] = None if (msg.get("role") == "assistant" and msg.get("tool_calls")) else "(empty)"
+            return clean
+
+        if isinstance(content, list):
+            filtered = [
+                item for item in content
+                if not (
+                    isinstance(item, dict)
+                    and item.get("type") in ("text", "input_text", "output_text")
+                    and not item.get("text")
+                )
+            ]
+            if len(filtered) != len(content):
                 clean = dict(msg)
-                clean["content"] = None if (msg.get("role") == "assistant" and msg.get("tool_calls")) else "(empty)"
-                result.append(clean)
-                continue
-
-            if isinstance(content, list):
-                filtered = [
-                    item for item in content
-                    if not (
-                        isinstance(item, dict)
-                        and item.get("type") in ("text", "input_text", "output_text")
-                        and not item.get("text")
-                    )
-                ]
-                if len(filtered) != len(content):
-                    clean = dict(msg)
-                    if filtered:
-                        clean["content"] = filtered
-                    elif msg.get("role") == "assistant" and msg.get("tool_calls"):
-                        clean["content"] = None
-                    else:
-                        clean["content"] = "(empty)"
-                    result.append(clean)
-                    continue
-
-            result.append(msg)
-        return result
+                if filtered:
+                    clean["content"] = filtered
+                elif msg.get("role") == "assistant" and msg.get("tool_calls"):
+                    clean["content"] = None
+                else:
+                    clean["content"] = "(empty)"
+                return clean
+
+        return msg
     
     @abstractmethod
     async def chat(
@@ -104,6 +230,27 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a chat completion.
+
+        Yields text deltas as they arrive and always ends with a chunk that carries
+        the complete LLMResponse. Providers without native streaming fall back to
+        a single final chunk from ``chat()``.
+        """
+        response = await self.chat(
+            messages=messages, tools=tools, model=model,
+            max_tokens=max_tokens, temperature=temperature,
+        )
+        yield StreamChunk(response=response)
+
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, AsyncIterator
 
 import json_repair
 from openai import AsyncOpenAI
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    StreamAccumulator,
+    StreamChunk,
+    ToolCallRequest,
+    usage_to_dict,
+)
 
 
 class CustomProvider(LLMProvider):
@@ -17,8 +24,8 @@ class CustomProvider(LLMProvider):
         self.default_model = default_model
         self._client = AsyncOpenAI(api_key=api_key, base_url=api_base)
 
-    async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
-                   model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7) -> LLMResponse:
+    def _build_kwargs(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None,
+                      model: str | None, max_tokens: int, temperature: float) -> dict[str, Any]:
         kwargs: dict[str, Any] = {
             "model": model or self.default_model,
             "messages": self._sanitize_empty_content(messages),
@@ -27,10 +34,32 @@ class CustomProvider(LLMProvider):
         }
         if tools:
             kwargs.update(tools=tools, tool_choice="auto")
+        return kwargs
+
+    async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
+                   model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7) -> LLMResponse:
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
         try:
             return self._parse(await self._client.chat.completions.create(**kwargs))
         except Exception as e:
-            return LLMResponse(content=f"Error: {e}", finish_reason="error")
+            return LLMResponse(content=f"Error: {e}", finish_reason="error", error=e)
+
+    async def chat_stream(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
+                          model: str | None = None, max_tokens: int = 4096,
+                          temperature: float = 0.7) -> AsyncIterator[StreamChunk]:
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        acc = StreamAccumulator()
+        try:
+            stream = await self._client.chat.completions.create(
+                **kwargs, stream=True, stream_options={"include_usage": True},
+            )
+            async for chunk in stream:
+                if delta := acc.add(chunk):
+                    yield StreamChunk(delta=delta)
+        except Exception as e:
+            yield StreamChunk(response=LLMResponse(content=f"Error: {e}", finish_reason="error", error=e))
+            return
+        yield StreamChunk(response=acc.response())
 
     def _parse(self, response: Any) -> LLMResponse:
         choice = response.choices[0]
@@ -43,7 +72,7 @@ class CustomProvider(LLMProvider):
         u = response.usage
         return LLMResponse(
             content=msg.content, tool_calls=tool_calls, finish_reason=choice.finish_reason or "stop",
-            usage={"prompt_tokens": u.prompt_tokens, "completion_tokens": u.completion_tokens, "total_tokens": u.total_tokens} if u else {},
+            usage=usage_to_dict(u) if u else {},
             reasoning_content=getattr(msg, "reasoning_content", None) or None,
         )
 
@@ -3,12 +3,22 @@
 import json
 import json_repair
 import os
-from typing import Any
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
 
 import litellm
 from litellm import acompletion
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    MessageBuffer,
+    StreamAccumulator,
+    StreamChunk,
+    ToolCallRequest,
+    usage_to_dict,
+)
 from nanobot.providers.registry import find_by_model, find_gateway
 
 
@@ -16,6 +26,69 @@ from nanobot.providers.registry import find_by_model, find_gateway
 # thinking-enabled models (Kimi k2.5, DeepSeek-R1, etc.).
 _ALLOWED_MSG_KEYS = frozenset({"role", "content", "tool_calls", "tool_call_id", "name", "reasoning_content"})
 
+# Prepared-message buffers kept per provider, one per recently active conversation.
+_MAX_BUFFERS = 16
+
+
+@dataclass(frozen=True)
+class _RequestPlan:
+    """Everything about a request that depends only on the model name."""
+
+    model: str                                  # resolved LiteLLM model name
+    cache_breakpoints: int                      # cache_control blocks allowed (0 = no prompt caching)
+    overrides: dict[str, Any] = field(default_factory=dict)  # registry per-model params
+    static: dict[str, Any] = field(default_factory=dict)     # api_key, api_base, extra_headers
+
+    @property
+    def cache_control(self) -> bool:
+        return self.cache_breakpoints > 0
+
+
+def plan_cache_breakpoints(messages: list[dict[str, Any]], limit: int) -> list[int]:
+    """
+    Pick up to ``limit`` message indices to mark with cache_control, best first.
+
+    The latest message comes first: the next iteration of the tool loop sends
+    the same prefix plus new tool results, so it reads everything up to here
+    from cache. The end of the history (the message before the current turn's
+    user messages) comes next; it stays put for the whole turn. The system
+    prompt is marked separately. Messages without text to attach the marker
+    to (e.g. assistant tool calls) move the breakpoint back to the nearest
+    message that has some.
+    """
+    if limit <= 0 or len(messages) < 2:
+        return []
+
+    def _markable(i: int) -> int | None:
+        while i > 0:
+            if messages[i].get("content"):
+                return i
+            i -= 1
+        return None
+
+    candidates = [_markable(len(messages) - 1)]
+    last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=0)
+    while last_user > 1 and messages[last_user - 1].get("role") == "user":
+        last_user -= 1
+    candidates.append(_markable(last_user - 1))
+
+    picked: list[int] = []
+    for i in candidates:
+        if i is not None and i not in picked:
+            picked.append(i)
+    return picked[:limit]
+
+
+def _with_cache_control(msg: dict[str, Any]) -> dict[str, Any]:
+    """Copy of a message with cache_control on its last content block."""
+    content = msg["content"]
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
+    else:
+        blocks = list(content)
+        blocks[-1] = {**blocks[-1], "cache_control": {"type": "ephemeral"}}
+    return {**msg, "content": blocks}
+
 
 class LiteLLMProvider(LLMProvider):
     """
@@ -42,6 +115,9 @@ class LiteLLMProvider(LLMProvider):
         # provider_name (from config key) is the primary signal;
         # api_key / api_base are fallback for auto-detection.
         self._gateway = find_gateway(provider_name, api_key, api_base)
+        self._plans: dict[str, _RequestPlan] = {}
+        self._buffers: OrderedDict[tuple[int, bool], MessageBuffer] = OrderedDict()
+        self._tools_cache: tuple[list[dict[str, Any]], list[dict[str, Any]]] | None = None
         
         # Configure environment variables
         if api_key:
@@ -109,38 +185,43 @@ class LiteLLMProvider(LLMProvider):
             return model
         return f"{canonical_prefix}/{remainder}"
     
-    def _supports_cache_control(self, model: str) -> bool:
-        """Return True when the provider supports cache_control on content blocks."""
-        if self._gateway is not None:
-            return self._gateway.supports_prompt_caching
-        spec = find_by_model(model)
-        return spec is not None and spec.supports_prompt_caching
+    def _cache_breakpoints(self, model: str) -> int:
+        """Number of cache_control blocks the provider accepts per request (0 = none)."""
+        spec = self._gateway or find_by_model(model)
+        if spec is None or not spec.supports_prompt_caching:
+            return 0
+        return spec.cache_breakpoints
 
-    def _apply_cache_control(
-        self,
-        messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None,
-    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
-        """Return copies of messages and tools with cache_control injected."""
-        new_messages = []
-        for msg in messages:
-            if msg.get("role") == "system":
-                content = msg["content"]
-                if isinstance(content, str):
-                    new_content = [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
-                else:
-                    new_content = list(content)
-                    new_content[-1] = {**new_content[-1], "cache_control": {"type": "ephemeral"}}
-                new_messages.append({**msg, "content": new_content})
-            else:
-                new_messages.append(msg)
-
-        new_tools = tools
-        if tools:
-            new_tools = list(tools)
-            new_tools[-1] = {**new_tools[-1], "cache_control": {"type": "ephemeral"}}
+    @staticmethod
+    def _cache_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        new_tools = list(tools)
+        new_tools[-1] = {**new_tools[-1], "cache_control": {"type": "ephemeral"}}
+        return new_tools
 
-        return new_messages, new_tools
+    def _plan(self, model: str) -> _RequestPlan:
+        """Request plan for a model name, built on first use."""
+        plan = self._plans.get(model)
+        if plan is None:
+            resolved = self._resolve_model(model)
+            overrides: dict[str, Any] = {}
+            self._apply_model_overrides(resolved, overrides)
+            static: dict[str, Any] = {}
+            # Pass api_key directly — more reliable than env vars alone
+            if self.api_key:
+                static["api_key"] = self.api_key
+            # Pass api_base for custom endpoints
+            if self.api_base:
+                static["api_base"] = self.api_base
+            # Pass extra headers (e.g. APP-Code for AiHubMix)
+            if self.extra_headers:
+                static["extra_headers"] = self.extra_headers
+            plan = self._plans[model] = _RequestPlan(
+                model=resolved,
+                cache_breakpoints=self._cache_breakpoints(model),
+                overrides=overrides,
+                static=static,
+            )
+        return plan
 
     def _apply_model_overrides(self, model: str, kwargs: dict[str, Any]) -> None:
         """Apply model-specific parameter overrides from the registry."""
@@ -153,16 +234,81 @@ class LiteLLMProvider(LLMProvider):
                     return
     
     @staticmethod
-    def _sanitize_messages(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def _sanitize_message(msg: dict[str, Any]) -> dict[str, Any]:
         """Strip non-standard keys and ensure assistant messages have a content key."""
-        sanitized = []
-        for msg in messages:
-            clean = {k: v for k, v in msg.items() if k in _ALLOWED_MSG_KEYS}
-            # Strict providers require "content" even when assistant only has tool_calls
-            if clean.get("role") == "assistant" and "content" not in clean:
-                clean["content"] = None
-            sanitized.append(clean)
-        return sanitized
+        clean = {k: v for k, v in msg.items() if k in _ALLOWED_MSG_KEYS}
+        # Strict providers require "content" even when assistant only has tool_calls
+        if clean.get("role") == "assistant" and "content" not in clean:
+            clean["content"] = None
+        return clean
+
+    def _prepare_message(self, msg: dict[str, Any], cache_control: bool) -> dict[str, Any]:
+        """Everything _build_kwargs does to a single message."""
+        if cache_control and msg.get("role") == "system" and msg.get("content"):
+            msg = _with_cache_control(msg)
+        return self._sanitize_message(self._sanitize_empty_message(msg))
+
+    def _prepare_messages(self, messages: list[dict[str, Any]], cache_control: bool) -> list[dict[str, Any]]:
+        """Prepared messages, reusing the work done for earlier calls in the same turn."""
+        if not messages:
+            return []
+        # One buffer per conversation: each turn starts from its own system message.
+        key = (id(messages[0]), cache_control)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = MessageBuffer(lambda m: self._prepare_message(m, cache_control))
+            while len(self._buffers) > _MAX_BUFFERS:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(key)
+        return buffer.update(messages)
+
+    def _prepare_tools(
+        self, tools: list[dict[str, Any]] | None, cache_control: bool,
+    ) -> list[dict[str, Any]] | None:
+        if not tools or not cache_control:
+            return tools
+        # ToolRegistry returns the same list until its tools change.
+        if self._tools_cache is None or self._tools_cache[0] is not tools:
+            self._tools_cache = (tools, self._cache_tools(tools))
+        return self._tools_cache[1]
+
+    def _build_kwargs(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build the acompletion() arguments shared by chat() and chat_stream()."""
+        plan = self._plan(model or self.default_model)
+        tools = self._prepare_tools(tools, plan.cache_control)
+        messages = self._prepare_messages(messages, plan.cache_control)
+        if plan.cache_control:
+            # The system prompt and the tool list hold a breakpoint each.
+            spare = plan.cache_breakpoints - bool(tools) - (bool(messages) and messages[0].get("role") == "system")
+            for i in plan_cache_breakpoints(messages, spare):
+                messages[i] = _with_cache_control(messages[i])
+
+        # Clamp max_tokens to at least 1 — negative or zero values cause
+        # LiteLLM to reject the request with "max_tokens must be at least 1".
+        max_tokens = max(1, max_tokens)
+        
+        kwargs: dict[str, Any] = {
+            "model": plan.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            # Model-specific overrides (e.g. kimi-k2.5 temperature)
+            **plan.overrides,
+            **plan.static,
+        }
+        
+        if tools:
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = "auto"
+        return kwargs
 
     async def chat(
         self,
@@ -185,42 +331,7 @@ class LiteLLMProvider(LLMProvider):
         Returns:
             LLMResponse with content and/or tool calls.
         """
-        original_model = model or self.default_model
-        model = self._resolve_model(original_model)
-
-        if self._supports_cache_control(original_model):
-            messages, tools = self._apply_cache_control(messages, tools)
-
-        # Clamp max_tokens to at least 1 — negative or zero values cause
-        # LiteLLM to reject the request with "max_tokens must be at least 1".
-        max_tokens = max(1, max_tokens)
-        
-        kwargs: dict[str, Any] = {
-            "model": model,
-            "messages": self._sanitize_messages(self._sanitize_empty_content(messages)),
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-        }
-        
-        # Apply model-specific overrides (e.g. kimi-k2.5 temperature)
-        self._apply_model_overrides(model, kwargs)
-        
-        # Pass api_key directly — more reliable than env vars alone
-        if self.api_key:
-            kwargs["api_key"] = self.api_key
-        
-        # Pass api_base for custom endpoints
-        if self.api_base:
-            kwargs["api_base"] = self.api_base
-        
-        # Pass extra headers (e.g. APP-Code for AiHubMix)
-        if self.extra_headers:
-            kwargs["extra_headers"] = self.extra_headers
-        
-        if tools:
-            kwargs["tools"] = tools
-            kwargs["tool_choice"] = "auto"
-        
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
         try:
             response = await acompletion(**kwargs)
             return self._parse_response(response)
@@ -229,7 +340,35 @@ class LiteLLMProvider(LLMProvider):
             return LLMResponse(
                 content=f"Error calling LLM: {str(e)}",
                 finish_reason="error",
+                error=e,
             )
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a chat completion via LiteLLM (acompletion with stream=True)."""
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+        acc = StreamAccumulator()
+        try:
+            stream = await acompletion(**kwargs)
+            async for chunk in stream:
+                if delta := acc.add(chunk):
+                    yield StreamChunk(delta=delta)
+        except Exception as e:
+            yield StreamChunk(response=LLMResponse(
+                content=f"Error calling LLM: {str(e)}",
+                finish_reason="error",
+                error=e,
+            ))
+            return
+        yield StreamChunk(response=acc.response())
     
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -252,11 +391,7 @@ class LiteLLMProvider(LLMProvider):
         
         usage = {}
         if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+            usage = usage_to_dict(response.usage)
         
         reasoning_content = getattr(message, "reasoning_content", None) or None
         
@@ -5,13 +5,13 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator
 
 import httpx
 from loguru import logger
 
 from oauth_cli_kit import get_token as get_codex_token
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk, ToolCallRequest
 
 DEFAULT_CODEX_URL = "https://chatgpt.com/backend-api/codex/responses"
 DEFAULT_ORIGINATOR = "nanobot"
@@ -24,14 +24,13 @@ class OpenAICodexProvider(LLMProvider):
         super().__init__(api_key=None, api_base=None)
         self.default_model = default_model
 
-    async def chat(
+    async def _prepare(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        model: str | None = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-    ) -> LLMResponse:
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+    ) -> tuple[dict[str, str], dict[str, Any]]:
+        """Build request headers and body for the Responses API."""
         model = model or self.default_model
         system_prompt, input_items = _convert_messages(messages)
 
@@ -53,7 +52,17 @@ class OpenAICodexProvider(LLMProvider):
 
         if tools:
             body["tools"] = _convert_tools(tools)
+        return headers, body
 
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        headers, body = await self._prepare(messages, tools, model)
         url = DEFAULT_CODEX_URL
 
         try:
@@ -73,8 +82,40 @@ class OpenAICodexProvider(LLMProvider):
             return LLMResponse(
                 content=f"Error calling Codex: {str(e)}",
                 finish_reason="error",
+                error=e,
             )
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        headers, body = await self._prepare(messages, tools, model)
+        url = DEFAULT_CODEX_URL
+        streamed = False
+
+        try:
+            try:
+                async for chunk in _stream_codex(url, headers, body, verify=True):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                # Only safe to retry if nothing has been emitted yet.
+                if streamed or "CERTIFICATE_VERIFY_FAILED" not in str(e):
+                    raise
+                logger.warning("SSL certificate verification failed for Codex API; retrying with verify=False")
+                async for chunk in _stream_codex(url, headers, body, verify=False):
+                    yield chunk
+        except Exception as e:
+            yield StreamChunk(response=LLMResponse(
+                content=f"Error calling Codex: {str(e)}",
+                finish_reason="error",
+                error=e,
+            ))
+
     def get_default_model(self) -> str:
         return self.default_model
 
@@ -111,6 +152,21 @@ async def _request_codex(
             return await _consume_sse(response)
 
 
+async def _stream_codex(
+    url: str,
+    headers: dict[str, str],
+    body: dict[str, Any],
+    verify: bool,
+) -> AsyncGenerator[StreamChunk, None]:
+    async with httpx.AsyncClient(timeout=60.0, verify=verify) as client:
+        async with client.stream("POST", url, headers=headers, json=body) as response:
+            if response.status_code != 200:
+                text = await response.aread()
+                raise RuntimeError(_friendly_error(response.status_code, text.decode("utf-8", "ignore")))
+            async for chunk in _stream_sse(response):
+                yield chunk
+
+
 def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Convert OpenAI function-calling schema to Codex flat format."""
     converted: list[dict[str, Any]] = []
@@ -243,6 +299,14 @@ async def _iter_sse(response: httpx.Response) -> AsyncGenerator[dict[str, Any],
 
 
 async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequest], str]:
+    async for chunk in _stream_sse(response):
+        if chunk.response is not None:
+            return chunk.response.content or "", chunk.response.tool_calls, chunk.response.finish_reason
+    return "", [], "stop"
+
+
+async def _stream_sse(response: httpx.Response) -> AsyncGenerator[StreamChunk, None]:
+    """Yield text deltas from a Codex SSE stream, then one chunk with the full response."""
     content = ""
     tool_calls: list[ToolCallRequest] = []
     tool_call_buffers: dict[str, dict[str, Any]] = {}
@@ -262,7 +326,10 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                     "arguments": item.get("arguments") or "",
                 }
         elif event_type == "response.output_text.delta":
-            content += event.get("delta") or ""
+            delta = event.get("delta") or ""
+            content += delta
+            if delta:
+                yield StreamChunk(delta=delta)
         elif event_type == "response.function_call_arguments.delta":
             call_id = event.get("call_id")
             if call_id and call_id in tool_call_buffers:
@@ -296,7 +363,9 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
         elif event_type in {"error", "response.failed"}:
             raise RuntimeError("Codex response failed")
 
-    return content, tool_calls, finish_reason
+    yield StreamChunk(response=LLMResponse(
+        content=content, tool_calls=tool_calls, finish_reason=finish_reason,
+    ))
 
 
 _FINISH_REASON_MAP = {"completed": "stop", "incomplete": "length", "failed": "error", "cancelled": "error"}
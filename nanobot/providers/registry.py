@@ -13,6 +13,7 @@ Every entry writes out all fields so you can copy-paste as a template.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 
@@ -59,6 +60,7 @@ class ProviderSpec:
 
     # Provider supports cache_control on content blocks (e.g. Anthropic prompt caching)
     supports_prompt_caching: bool = False
+    cache_breakpoints: int = 4               # most cache_control blocks allowed in one request
 
     @property
     def label(self) -> str:
@@ -101,6 +103,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         strip_model_prefix=False,
         model_overrides=(),
         supports_prompt_caching=True,
+        cache_breakpoints=4,
     ),
 
     # AiHubMix: global gateway, OpenAI-compatible interface.
@@ -178,6 +181,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         strip_model_prefix=False,
         model_overrides=(),
         supports_prompt_caching=True,
+        cache_breakpoints=4,
     ),
 
     # OpenAI: LiteLLM recognizes "gpt-*" natively, no prefix needed.
@@ -403,24 +407,43 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
 # Lookup helpers
 # ---------------------------------------------------------------------------
 
-def find_by_model(model: str) -> ProviderSpec | None:
-    """Match a standard provider by model-name keyword (case-insensitive).
-    Skips gateways/local — those are matched by api_key/api_base instead."""
+_BY_NAME: dict[str, ProviderSpec] = {spec.name: spec for spec in PROVIDERS}
+
+# (keyword, keyword with "-" as "_", spec) in registry order
+_KEYWORDS: tuple[tuple[str, str, ProviderSpec], ...] = tuple(
+    (kw.lower(), kw.lower().replace("-", "_"), spec) for spec in PROVIDERS for kw in spec.keywords
+)
+
+
+def _is_standard(spec: ProviderSpec) -> bool:
+    return not spec.is_gateway and not spec.is_local
+
+
+@lru_cache(maxsize=1024)
+def match_model(model: str) -> tuple[ProviderSpec, ...]:
+    """All specs a model name points to, best first: the one named by an explicit
+    provider prefix, then keyword matches in registry order. Cached per model."""
     model_lower = model.lower()
     model_normalized = model_lower.replace("-", "_")
-    model_prefix = model_lower.split("/", 1)[0] if "/" in model_lower else ""
-    normalized_prefix = model_prefix.replace("-", "_")
-    std_specs = [s for s in PROVIDERS if not s.is_gateway and not s.is_local]
+    matches: list[ProviderSpec] = []
 
-    # Prefer explicit provider prefix — prevents `github-copilot/...codex` matching openai_codex.
-    for spec in std_specs:
-        if model_prefix and normalized_prefix == spec.name:
-            return spec
+    # An explicit provider prefix wins — prevents `github-copilot/...codex` matching openai_codex.
+    if "/" in model_lower:
+        prefixed = _BY_NAME.get(model_lower.split("/", 1)[0].replace("-", "_"))
+        if prefixed:
+            matches.append(prefixed)
 
-    for spec in std_specs:
-        if any(kw in model_lower or kw.replace("-", "_") in model_normalized for kw in spec.keywords):
-            return spec
-    return None
+    for kw, kw_normalized, spec in _KEYWORDS:
+        if spec not in matches and (kw in model_lower or kw_normalized in model_normalized):
+            matches.append(spec)
+    return tuple(matches)
+
+
+@lru_cache(maxsize=1024)
+def find_by_model(model: str) -> ProviderSpec | None:
+    """Match a standard provider by model-name keyword (case-insensitive).
+    Skips gateways/local — those are matched by api_key/api_base instead."""
+    return next((spec for spec in match_model(model) if _is_standard(spec)), None)
 
 
 def find_gateway(
@@ -456,7 +479,4 @@ def find_gateway(
 
 def find_by_name(name: str) -> ProviderSpec | None:
     """Find a provider spec by config field name, e.g. "dashscope"."""
-    for spec in PROVIDERS:
-        if spec.name == name:
-            return spec
-    return None
+    return _BY_NAME.get(name)
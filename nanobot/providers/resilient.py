@@ -0,0 +1,288 @@
+"""Resilient provider: retries, circuit breaking and model fallback around other providers."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import LLMRetryConfig
+
+# Error kinds worth retrying on the same model after a pause.
+RETRYABLE = frozenset({"rate_limit", "overloaded", "timeout", "connection", "server"})
+
+_STATUS_KINDS = {401: "auth", 403: "auth", 408: "timeout", 429: "rate_limit", 503: "overloaded", 529: "overloaded"}
+_MESSAGE_KINDS = (
+    (re.compile(r"rate.?limit|too many requests|quota|\b429\b", re.I), "rate_limit"),
+    (re.compile(r"overloaded|\b529\b|\b503\b|unavailable", re.I), "overloaded"),
+    (re.compile(r"timed? ?out|timeout", re.I), "timeout"),
+    (re.compile(r"connection|connect error|network", re.I), "connection"),
+    (re.compile(r"auth|api key|\b401\b|\b403\b|permission", re.I), "auth"),
+    (re.compile(r"\b5\d\d\b|internal server error", re.I), "server"),
+)
+
+
+def classify_error(error: BaseException | None, message: str | None = None) -> str:
+    """
+    Sort a failed call into rate_limit, overloaded, timeout, connection,
+    server, auth, bad_request or unknown, from the exception's HTTP status
+    or type when available, else from the error text.
+    """
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int):
+        if status in _STATUS_KINDS:
+            return _STATUS_KINDS[status]
+        if status >= 500:
+            return "server"
+        if status >= 400:
+            return "bad_request"
+    name = type(error).__name__ if error is not None else ""
+    if "Timeout" in name:
+        return "timeout"
+    if "Connection" in name:
+        return "connection"
+    text = f"{name} {error or ''} {message or ''}"
+    for pattern, kind in _MESSAGE_KINDS:
+        if pattern.search(text):
+            return kind
+    return "unknown"
+
+
+def retry_after(error: BaseException | None) -> float | None:
+    """Seconds to wait according to the error's Retry-After header, if it has one."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        if value := headers.get("retry-after-ms"):
+            return max(float(value) / 1000, 0.0)
+        if value := headers.get("retry-after"):
+            try:
+                return max(float(value), 0.0)
+            except ValueError:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class CircuitBreaker:
+    """
+    Stops calling a provider after ``threshold`` consecutive failures.
+
+    Once ``cooldown`` seconds have passed, a single trial call is let through;
+    success closes the breaker, failure opens it for another cooldown.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if self._trial else "open"
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._trial or time.monotonic() - self._opened_at < self.cooldown:
+            return False
+        self._trial = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def release(self) -> None:
+        """Give back a trial call that never finished (e.g. it was cancelled)."""
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial or (self.threshold and self.failures >= self.threshold):
+            self._opened_at = time.monotonic()
+            self._trial = False
+
+
+@dataclass
+class _Target:
+    provider: LLMProvider
+    model: str | None  # None: use the model the caller asked for
+    breaker: CircuitBreaker
+
+    @property
+    def label(self) -> str:
+        return self.model or self.provider.get_default_model()
+
+
+class ResilientProvider(LLMProvider):
+    """
+    Wraps a provider with retries and a fallback model chain.
+
+    Transient failures (rate limits, overloads, timeouts, connection and
+    server errors) are retried with jittered exponential backoff, honouring
+    Retry-After. When a model keeps failing, or fails for a reason retrying
+    will not fix, the next model in the chain is tried. Each model has its
+    own circuit breaker so a provider that is down is skipped without waiting
+    for it to time out.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        fallbacks: list[tuple[LLMProvider, str]] | None = None,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        breaker_threshold: int = 5,
+        breaker_cooldown: float = 30.0,
+    ):
+        super().__init__(provider.api_key, provider.api_base)
+        self.provider = provider
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._targets = [
+            _Target(p, m, CircuitBreaker(breaker_threshold, breaker_cooldown))
+            for p, m in [(provider, None), *(fallbacks or [])]
+        ]
+
+    @classmethod
+    def from_config(
+        cls, provider: LLMProvider, fallbacks: list[tuple[LLMProvider, str]], config: LLMRetryConfig,
+    ) -> ResilientProvider:
+        return cls(
+            provider,
+            fallbacks,
+            max_attempts=config.max_attempts,
+            base_delay=config.base_delay,
+            max_delay=config.max_delay,
+            breaker_threshold=config.breaker_threshold,
+            breaker_cooldown=config.breaker_cooldown,
+        )
+
+    def _backoff(self, attempt: int, error: BaseException | None) -> float | None:
+        """Seconds to wait before the next attempt, or None to fail over instead."""
+        if attempt + 1 >= self.max_attempts:
+            return None
+        wait = retry_after(error)
+        if wait is not None:
+            return wait if wait <= self.max_delay else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _settle(self, target: _Target, response: LLMResponse, attempt: int) -> float | None:
+        """Record a failed call. Returns the delay before retrying, or None to move on."""
+        kind = classify_error(response.error, response.content)
+        if kind == "bad_request":
+            target.breaker.record_success()  # the provider answered; the request was at fault
+        else:
+            target.breaker.record_failure()
+        delay = self._backoff(attempt, response.error) if kind in RETRYABLE else None
+        logger.warning(
+            "LLM call to {} failed ({}, attempt {}/{}): {}{}",
+            target.label, kind, attempt + 1, self.max_attempts, (response.content or "")[:200],
+            f"; retrying in {delay:.1f}s" if delay is not None else "",
+        )
+        return delay
+
+    def _unavailable(self) -> LLMResponse:
+        return LLMResponse(
+            content="Error calling LLM: all configured models are temporarily unavailable. Please try again shortly.",
+            finish_reason="error",
+        )
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        last: LLMResponse | None = None
+        for target in self._targets:
+            if not target.breaker.allow():
+                continue
+            for attempt in range(self.max_attempts):
+                try:
+                    response = await target.provider.chat(
+                        messages=messages, tools=tools, model=target.model or model,
+                        max_tokens=max_tokens, temperature=temperature,
+                    )
+                except BaseException:
+                    target.breaker.release()
+                    raise
+                if response.finish_reason != "error":
+                    target.breaker.record_success()
+                    return response
+                last = response
+                delay = self._settle(target, response, attempt)
+                if delay is None or not target.breaker.allow():
+                    break
+                await asyncio.sleep(delay)
+        return last or self._unavailable()
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        last: LLMResponse | None = None
+        for target in self._targets:
+            if not target.breaker.allow():
+                continue
+            for attempt in range(self.max_attempts):
+                streamed = False
+                response: LLMResponse | None = None
+                try:
+                    async for chunk in target.provider.chat_stream(
+                        messages=messages, tools=tools, model=target.model or model,
+                        max_tokens=max_tokens, temperature=temperature,
+                    ):
+                        if chunk.response is not None:
+                            response = chunk.response
+                        else:
+                            streamed = True
+                            yield chunk
+                except BaseException:
+                    # Cancelled or abandoned by the consumer: don't leave a trial hanging.
+                    target.breaker.release()
+                    raise
+                if response is None:
+                    response = LLMResponse(content=None)
+                # Once text has reached the user the call can't be replayed.
+                if response.finish_reason != "error" or streamed:
+                    if response.finish_reason != "error":
+                        target.breaker.record_success()
+                    else:
+                        target.breaker.record_failure()
+                    yield StreamChunk(response=response)
+                    return
+                last = response
+                delay = self._settle(target, response, attempt)
+                if delay is None or not target.breaker.allow():
+                    break
+                await asyncio.sleep(delay)
+        yield StreamChunk(response=last or self._unavailable())
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
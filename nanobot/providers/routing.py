@@ -0,0 +1,256 @@
+"""Routing provider: latency-aware selection and hedged requests across backends."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import RoutingConfig
+
+# Whether the current task may send hedged requests. The agent loop enables it
+# only around the main LLM loop of interactive messages; tasks started from
+# there (subagents) turn it off again, so background work never doubles load.
+_hedging: ContextVar[bool] = ContextVar("llm_hedging", default=False)
+
+# Samples a backend needs before its latency quantiles are trusted for hedging.
+_MIN_SAMPLES = 10
+
+
+def allow_hedging(enabled: bool) -> None:
+    """Allow or forbid hedged requests for LLM calls made from the current task."""
+    _hedging.set(enabled)
+
+
+@contextmanager
+def hedging(enabled: bool) -> Iterator[None]:
+    """Allow or forbid hedged requests inside the block, restoring the previous setting after."""
+    token = _hedging.set(enabled)
+    try:
+        yield
+    finally:
+        _hedging.reset(token)
+
+
+class BackendProfile:
+    """
+    Rolling latency and error record of one backend.
+
+    Calls cancelled because another backend answered a hedged request first
+    are counted separately: their elapsed time is only a lower bound, so it
+    would make a slow backend look fast if it went into ``latencies``.
+    """
+
+    def __init__(self, window: int = 100):
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.errors: deque[bool] = deque(maxlen=window)
+        self.lost: deque[bool] = deque(maxlen=window)
+
+    def record(self, latency: float, ok: bool) -> None:
+        if ok:
+            self.latencies.append(latency)
+        self.errors.append(not ok)
+        self.lost.append(False)
+
+    def record_lost(self) -> None:
+        """Record a call that was abandoned because a hedge answered first."""
+        self.lost.append(True)
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors) / len(self.errors) if self.errors else 0.0
+
+    @property
+    def lost_rate(self) -> float:
+        return sum(self.lost) / len(self.lost) if self.lost else 0.0
+
+    def quantile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def score(self) -> float:
+        """Expected cost of a call: median latency inflated by errors and lost hedges. Lower is better."""
+        if not self.errors:
+            return 0.0  # never tried: try it first to learn about it
+        median = self.quantile(0.5)
+        if median is None:
+            return float("inf")
+        return median * (1 + 4 * (self.error_rate + self.lost_rate))
+
+
+@dataclass
+class _Backend:
+    provider: LLMProvider
+    model: str
+    profile: BackendProfile = field(default_factory=BackendProfile)
+
+
+class RoutingProvider(LLMProvider):
+    """
+    Sends each call to the backend with the best recent latency and error
+    record, failing over to the others in rank order on error.
+
+    With hedging on, a call that is still running after the chosen backend's
+    p95 latency (and at least ``min_hedge_delay``) is also sent to the
+    runner-up; the first successful answer wins and the other is cancelled.
+    Hedging only happens where ``allow_hedging(True)`` was set. Streams are
+    routed and fail over the same way, as long as no text was sent yet, but
+    are never hedged. A small share of calls goes to a
+    random backend so stale profiles keep getting refreshed.
+    """
+
+    def __init__(
+        self,
+        backends: list[tuple[LLMProvider, str]],
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        min_hedge_delay: float = 1.0,
+        window: int = 100,
+        explore: float = 0.05,
+    ):
+        if not backends:
+            raise ValueError("RoutingProvider needs at least one backend")
+        super().__init__(backends[0][0].api_key, backends[0][0].api_base)
+        self.backends = [_Backend(p, m, BackendProfile(window)) for p, m in backends]
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_delay = min_hedge_delay
+        self.explore = explore
+
+    @classmethod
+    def from_config(cls, backends: list[tuple[LLMProvider, str]], config: RoutingConfig) -> RoutingProvider:
+        return cls(
+            backends,
+            hedge=config.hedge,
+            hedge_quantile=config.hedge_quantile,
+            min_hedge_delay=config.min_hedge_delay,
+            window=config.window,
+        )
+
+    def _ranked(self) -> list[_Backend]:
+        ranked = sorted(self.backends, key=lambda b: b.profile.score())
+        if len(ranked) > 1 and random.random() < self.explore:
+            ranked.insert(0, ranked.pop(random.randrange(1, len(ranked))))
+        return ranked
+
+    def _hedge_delay(self, backend: _Backend) -> float | None:
+        if not (self.hedge and _hedging.get()) or len(self.backends) < 2:
+            return None
+        if len(backend.profile.latencies) < _MIN_SAMPLES:
+            return None
+        return max(backend.profile.quantile(self.hedge_quantile) or 0.0, self.min_hedge_delay)
+
+    async def _call(self, backend: _Backend, kwargs: dict[str, Any]) -> LLMResponse:
+        start = time.monotonic()
+        response = await backend.provider.chat(model=backend.model, **kwargs)
+        backend.profile.record(time.monotonic() - start, ok=response.finish_reason != "error")
+        return response
+
+    async def _hedged(
+        self, first: _Backend, second: _Backend, delay: float, kwargs: dict[str, Any],
+    ) -> tuple[LLMResponse, list[_Backend]]:
+        """Call ``first``, adding ``second`` if it is slow. Returns the response and the backends used."""
+        tasks = {asyncio.create_task(self._call(first, kwargs)): first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                logger.debug("Hedging LLM call to {} after {:.2f}s", second.model, delay)
+                tasks[asyncio.create_task(self._call(second, kwargs))] = second
+            tried = list(tasks.values())
+            pending = set(tasks)
+            response: LLMResponse | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    response = task.result()
+                    if response.finish_reason != "error":
+                        for loser in pending:
+                            tasks[loser].profile.record_lost()
+                        return response, tried
+            return response, tried  # type: ignore[return-value]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        kwargs = {"messages": messages, "tools": tools, "max_tokens": max_tokens, "temperature": temperature}
+        ranked = self._ranked()
+        delay = self._hedge_delay(ranked[0])
+        if delay is not None:
+            response, tried = await self._hedged(ranked[0], ranked[1], delay, kwargs)
+        else:
+            response, tried = await self._call(ranked[0], kwargs), ranked[:1]
+        for backend in [b for b in ranked if b not in tried]:
+            if response.finish_reason != "error":
+                break
+            logger.warning("LLM backend failed, trying {}: {}", backend.model, (response.content or "")[:200])
+            response = await self._call(backend, kwargs)
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        for i, backend in enumerate(ranked := self._ranked()):
+            start = time.monotonic()
+            streamed = False
+            response: LLMResponse | None = None
+            async for chunk in backend.provider.chat_stream(
+                messages=messages, tools=tools, model=backend.model,
+                max_tokens=max_tokens, temperature=temperature,
+            ):
+                if chunk.response is not None:
+                    response = chunk.response
+                else:
+                    streamed = True
+                    yield chunk
+            response = response or LLMResponse(content=None)
+            failed = response.finish_reason == "error"
+            backend.profile.record(time.monotonic() - start, ok=not failed)
+            # Once text has reached the user the call can't be replayed elsewhere.
+            if not failed or streamed or i == len(ranked) - 1:
+                yield StreamChunk(response=response)
+                return
+            logger.warning(
+                "LLM backend failed, trying {}: {}", ranked[i + 1].model, (response.content or "")[:200],
+            )
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Per-backend latency and error figures, for status output and debugging."""
+        return [
+            {
+                "model": b.model,
+                "calls": len(b.profile.errors),
+                "error_rate": b.profile.error_rate,
+                "hedges_lost": sum(b.profile.lost),
+                "p50": b.profile.quantile(0.5),
+                "p95": b.profile.quantile(0.95),
+            }
+            for b in self.backends
+        ]
+
+    def get_default_model(self) -> str:
+        return self.backends[0].model
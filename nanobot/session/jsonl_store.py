@@ -0,0 +1,297 @@
+"""JSONL file session store."""
+
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.session.manager import Session
+from nanobot.session.store import SessionStore
+from nanobot.utils.helpers import ensure_dir, safe_filename
+
+
+class JsonlSessionStore(SessionStore):
+    """
+    One JSONL file per session in the workspace's sessions directory.
+
+    Saves append only the messages added since the last flush, followed by a
+    metadata record; on load the last metadata record wins. The file is
+    rewritten (atomically) only when the history shrank, the file changed
+    underneath us, or enough metadata records have piled up.
+
+    Each metadata record carries the message count, so large files are loaded
+    from the end: only the unconsolidated tail is decoded, and the older
+    messages are read on demand (see ``Session.messages_from``).
+    """
+
+    _COMPACT_AFTER = 64  # Metadata records appended before the file is rewritten
+    _LAZY_MIN_BYTES = 256 * 1024  # Smaller files are simply parsed in full
+    _TAIL_BLOCK = 64 * 1024  # Read size when scanning backwards
+
+    def __init__(self, workspace: Path):
+        self.sessions_dir = ensure_dir(workspace / "sessions")
+        self.legacy_sessions_dir = Path.home() / ".nanobot" / "sessions"
+
+    def _get_session_path(self, key: str) -> Path:
+        """Get the file path for a session."""
+        safe_key = safe_filename(key.replace(":", "_"))
+        return self.sessions_dir / f"{safe_key}.jsonl"
+
+    def _get_legacy_session_path(self, key: str) -> Path:
+        """Legacy global session path (~/.nanobot/sessions/)."""
+        safe_key = safe_filename(key.replace(":", "_"))
+        return self.legacy_sessions_dir / f"{safe_key}.jsonl"
+
+    def load(self, key: str) -> Session | None:
+        """Load a session from disk."""
+        path = self._get_session_path(key)
+        if not path.exists():
+            legacy_path = self._get_legacy_session_path(key)
+            if legacy_path.exists():
+                try:
+                    shutil.move(str(legacy_path), str(path))
+                    logger.info("Migrated session {} from legacy path", key)
+                except Exception:
+                    logger.exception("Failed to migrate session {}", key)
+
+        if not path.exists():
+            return None
+
+        try:
+            size = path.stat().st_size
+            if size >= self._LAZY_MIN_BYTES:
+                session = self._load_tail(key, path, size)
+                if session is not None:
+                    return session
+            return self._load_full(key, path)
+        except Exception as e:
+            logger.warning("Failed to load session {}: {}", key, e)
+            return None
+
+    def _load_full(self, key: str, path: Path) -> Session:
+        """Parse the whole file."""
+        messages = []
+        meta: dict[str, Any] = {}
+        trailers = 0
+        torn = False
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn write from a crash; the file is rewritten on next save.
+                    torn = True
+                    continue
+
+                if data.get("_type") == "metadata":
+                    meta = data
+                    trailers += 1
+                else:
+                    messages.append(data)
+        size = path.stat().st_size
+
+        if torn:
+            logger.warning("Session {} has a damaged record, it will be rewritten", key)
+
+        session = self._from_metadata(key, meta, messages)
+        session._persisted = len(messages)
+        session._file_size = -1 if torn else size
+        session._trailers = trailers
+        return session
+
+    def _load_tail(self, key: str, path: Path, size: int) -> Session | None:
+        """
+        Read backwards from the end of the file, decoding only the trailing
+        metadata record and the unconsolidated messages before it.
+
+        Returns None when the file cannot be read this way (legacy layout,
+        missing message count, damaged record); the caller then parses it fully.
+        """
+        meta: dict[str, Any] | None = None
+        tail: list[dict[str, Any]] = []
+        needed = 0
+        trailers = 0
+        done = False
+        with open(path, "rb") as f:
+            pos = size
+            partial = b""
+            while pos > 0 and not done:
+                step = min(self._TAIL_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                lines = (f.read(step) + partial).split(b"\n")
+                partial = lines.pop(0) if pos > 0 else b""  # may be cut mid-record
+                for raw in reversed(lines):
+                    if not raw.strip():
+                        continue
+                    try:
+                        data = json.loads(raw)
+                    except json.JSONDecodeError:
+                        return None
+                    if data.get("_type") == "metadata":
+                        trailers += 1
+                        if meta is None:
+                            if "message_count" not in data:
+                                return None
+                            meta = data
+                            needed = data["message_count"] - data.get("last_consolidated", 0)
+                    elif meta is None:
+                        return None  # Messages after the last metadata record: not our layout
+                    else:
+                        tail.append(data)
+                    if meta is not None and len(tail) >= needed:
+                        done = True
+                        break
+
+        if meta is None or len(tail) != needed or needed < 0:
+            return None
+        tail.reverse()
+        offset = meta["message_count"] - needed
+
+        session = self._from_metadata(key, meta, tail)
+        session._offset = offset
+        session._load_head = lambda: self._read_head(path, offset)
+        session._persisted = meta["message_count"]
+        session._file_size = size
+        session._trailers = trailers
+        return session
+
+    @staticmethod
+    def _read_head(path: Path, count: int) -> list[dict[str, Any]]:
+        """Read the first ``count`` messages of a session file."""
+        messages: list[dict[str, Any]] = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if len(messages) >= count:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if data.get("_type") != "metadata":
+                    messages.append(data)
+        return messages
+
+    @staticmethod
+    def _from_metadata(key: str, meta: dict[str, Any], messages: list[dict[str, Any]]) -> Session:
+        return Session(
+            key=key,
+            messages=messages,
+            created_at=datetime.fromisoformat(meta["created_at"]) if meta.get("created_at") else datetime.now(),
+            updated_at=datetime.fromisoformat(meta["updated_at"]) if meta.get("updated_at") else datetime.now(),
+            metadata=meta.get("metadata", {}),
+            last_consolidated=meta.get("last_consolidated", 0),
+        )
+
+    @staticmethod
+    def _metadata_record(session: Session) -> dict[str, Any]:
+        return {
+            "_type": "metadata",
+            "key": session.key,
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+            "last_consolidated": session.last_consolidated,
+            "message_count": session.message_count,
+        }
+
+    def _needs_rewrite(self, session: Session, path: Path) -> bool:
+        """True if appending would not reproduce the session faithfully."""
+        if session._persisted > session.message_count or session._trailers >= self._COMPACT_AFTER:
+            return True
+        try:
+            return path.stat().st_size != session._file_size
+        except FileNotFoundError:
+            return True
+
+    def save(self, session: Session) -> None:
+        """Persist a session, appending only what changed since the last save."""
+        path = self._get_session_path(session.key)
+        meta_line = json.dumps(self._metadata_record(session), ensure_ascii=False) + "\n"
+
+        if self._needs_rewrite(session, path):
+            # Write a compact copy next to the file and swap it in atomically.
+            messages = session.messages_from(0)
+            tmp = path.with_suffix(".jsonl.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for msg in messages:
+                    f.write(json.dumps(msg, ensure_ascii=False) + "\n")
+                f.write(meta_line)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            session._trailers = 1
+        else:
+            new_lines = [json.dumps(m, ensure_ascii=False) + "\n" for m in session.messages_from(session._persisted)]
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("".join(new_lines) + meta_line)
+            session._trailers += 1
+
+        session._persisted = session.message_count
+        session._file_size = path.stat().st_size
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """
+        List all sessions.
+
+        Returns:
+            List of session info dicts.
+        """
+        sessions = []
+
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                data = self._read_metadata(path)
+                if data:
+                    key = data.get("key") or path.stem.replace("_", ":", 1)
+                    sessions.append({
+                        "key": key,
+                        "created_at": data.get("created_at"),
+                        "updated_at": data.get("updated_at"),
+                        "path": str(path)
+                    })
+            except Exception:
+                continue
+
+        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+
+    @staticmethod
+    def _read_metadata(path: Path, tail_bytes: int = 8192) -> dict[str, Any] | None:
+        """Read the newest metadata record: the trailing line, or the first line for legacy files."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            start = max(0, size - tail_bytes)
+            f.seek(start)
+            lines = f.read().splitlines()
+            if start:
+                lines = lines[1:]  # the first line may be cut mid-record
+            for line in reversed(lines):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn trailing write
+                if data.get("_type") == "metadata":
+                    return data
+                break
+            f.seek(0)
+            first = f.readline().strip()
+        if first:
+            data = json.loads(first)
+            if data.get("_type") == "metadata":
+                return data
+        return None
@@ -1,15 +1,15 @@
 """Session management for conversation history."""
 
-import json
-import shutil
+import time
+from collections import OrderedDict
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.session.store import SessionStore, create_store
 
 
 @dataclass
@@ -22,6 +22,12 @@ class Session:
     Important: Messages are append-only for LLM cache efficiency.
     The consolidation process writes summaries to MEMORY.md/HISTORY.md
     but does NOT modify the messages list or get_history() output.
+
+    Stores may load only the unconsolidated tail of a long session. In that case
+    ``messages`` holds the messages from index ``_offset`` onward, while
+    ``last_consolidated`` and ``_persisted`` stay absolute indices. Use
+    ``message_count`` and ``messages_from()`` for index-based access; the older
+    messages are read from the store only when something asks for them.
     """
 
     key: str  # channel:chat_id
@@ -30,6 +36,35 @@ class Session:
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
     last_consolidated: int = 0  # Number of messages already consolidated to files
+    # Persistence bookkeeping, maintained by SessionManager
+    _persisted: int = field(default=0, init=False, repr=False, compare=False)  # messages on disk
+    _file_size: int = field(default=-1, init=False, repr=False, compare=False)  # bytes after last write
+    _trailers: int = field(default=0, init=False, repr=False, compare=False)  # metadata records on disk
+    _offset: int = field(default=0, init=False, repr=False, compare=False)  # leading messages not loaded
+    _load_head: Callable[[], list[dict[str, Any]]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def message_count(self) -> int:
+        """Total number of messages, including any not loaded yet."""
+        return self._offset + len(self.messages)
+
+    def messages_from(self, start: int) -> list[dict[str, Any]]:
+        """Return messages from absolute index ``start``, loading older ones if needed."""
+        if start < self._offset:
+            self._materialize()
+        return self.messages[start - self._offset:]
+
+    def _materialize(self) -> None:
+        """Read the messages that were skipped at load time."""
+        if self._offset and self._load_head is not None:
+            head = self._load_head()
+            if len(head) != self._offset:
+                raise RuntimeError(f"Session {self.key} changed on disk before its history was loaded")
+            self.messages[:0] = head
+        self._offset = 0
+        self._load_head = None
     
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -44,7 +79,7 @@ class Session:
     
     def get_history(self, max_messages: int = 500) -> list[dict[str, Any]]:
         """Return unconsolidated messages for LLM input, aligned to a user turn."""
-        unconsolidated = self.messages[self.last_consolidated:]
+        unconsolidated = self.messages_from(self.last_consolidated)
         sliced = unconsolidated[-max_messages:]
 
         # Drop leading non-user messages to avoid orphaned tool_result blocks
@@ -67,30 +102,44 @@ class Session:
         self.messages = []
         self.last_consolidated = 0
         self.updated_at = datetime.now()
+        self._offset = 0
+        self._load_head = None
+        self._file_size = -1  # History replaced: next save rewrites the file
 
 
 class SessionManager:
     """
     Manages conversation sessions.
 
-    Sessions are stored as JSONL files in the sessions directory.
+    Persistence is delegated to a SessionStore (JSONL files by default, or
+    SQLite), which writes incrementally.
+
+    Loaded sessions are kept in an LRU cache bounded by entry count, by the
+    on-disk size of the cached sessions, and by idle time. Evicted sessions are
+    flushed to disk and reloaded lazily by get_or_create(). Pinned sessions
+    (e.g. with a consolidation in flight holding a reference) are never evicted,
+    so the caller's object stays the one that gets reloaded.
     """
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        max_cached: int = 256,
+        max_cached_bytes: int = 64 * 1024 * 1024,
+        idle_ttl: float = 3600,
+        store: SessionStore | None = None,
+    ):
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(self.workspace / "sessions")
-        self.legacy_sessions_dir = Path.home() / ".nanobot" / "sessions"
-        self._cache: dict[str, Session] = {}
-    
-    def _get_session_path(self, key: str) -> Path:
-        """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
-
-    def _get_legacy_session_path(self, key: str) -> Path:
-        """Legacy global session path (~/.nanobot/sessions/)."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.legacy_sessions_dir / f"{safe_key}.jsonl"
+        self.store = store or create_store(workspace)
+        self.max_cached = max(1, max_cached)
+        self.max_cached_bytes = max_cached_bytes  # 0 disables the byte bound
+        self.idle_ttl = idle_ttl  # Seconds; 0 disables idle eviction
+        self._cache: OrderedDict[str, Session] = OrderedDict()  # least recently used first
+        self._last_used: dict[str, float] = {}
+        self._pins: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
     
     def get_or_create(self, key: str) -> Session:
         """
@@ -102,111 +151,98 @@ class SessionManager:
         Returns:
             The session.
         """
-        if key in self._cache:
-            return self._cache[key]
-        
-        session = self._load(key)
-        if session is None:
-            session = Session(key=key)
-        
-        self._cache[key] = session
+        session = self._cache.get(key)
+        if session is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            session = self.store.load(key)
+            if session is None:
+                session = Session(key=key)
+
+        self._touch(session)
         return session
-    
-    def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
-        path = self._get_session_path(key)
-        if not path.exists():
-            legacy_path = self._get_legacy_session_path(key)
-            if legacy_path.exists():
+
+    def pin(self, key: str) -> None:
+        """Keep a session in the cache until the matching unpin()."""
+        self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, key: str) -> None:
+        """Release a pin taken with pin()."""
+        remaining = self._pins.get(key, 0) - 1
+        if remaining > 0:
+            self._pins[key] = remaining
+        else:
+            self._pins.pop(key, None)
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        """Cache counters and current occupancy."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "cached": len(self._cache),
+            "bytes": sum(max(s._file_size, 0) for s in self._cache.values()),
+        }
+
+    def _touch(self, session: Session) -> None:
+        """Mark a session as most recently used, then enforce the cache bounds."""
+        self._cache[session.key] = session
+        self._cache.move_to_end(session.key)
+        self._last_used[session.key] = time.monotonic()
+        self._evict(keep=session.key)
+
+    def _evict(self, keep: str | None = None) -> None:
+        """Flush and drop idle or least recently used sessions until within bounds."""
+        now = time.monotonic()
+        size = sum(max(s._file_size, 0) for s in self._cache.values())
+        for key in list(self._cache):
+            over = len(self._cache) > self.max_cached or (
+                self.max_cached_bytes > 0 and size > self.max_cached_bytes
+            )
+            idle = self.idle_ttl > 0 and now - self._last_used.get(key, now) > self.idle_ttl
+            if not (over or idle):
+                break  # Everything after this entry was used more recently
+            if key == keep or key in self._pins:
+                continue
+            session = self._cache[key]
+            if session.messages or session._file_size >= 0:
                 try:
-                    shutil.move(str(legacy_path), str(path))
-                    logger.info("Migrated session {} from legacy path", key)
+                    self.store.save(session)
                 except Exception:
-                    logger.exception("Failed to migrate session {}", key)
-
-        if not path.exists():
-            return None
-
-        try:
-            messages = []
-            metadata = {}
-            created_at = None
-            last_consolidated = 0
-
-            with open(path, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    data = json.loads(line)
-
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                        last_consolidated = data.get("last_consolidated", 0)
-                    else:
-                        messages.append(data)
-
-            return Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata,
-                last_consolidated=last_consolidated
-            )
-        except Exception as e:
-            logger.warning("Failed to load session {}: {}", key, e)
-            return None
+                    logger.exception("Failed to flush session {}, keeping it cached", key)
+                    continue
+            del self._cache[key]
+            self._last_used.pop(key, None)
+            size -= max(session._file_size, 0)
+            self.evictions += 1
     
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
-        path = self._get_session_path(session.key)
-
-        with open(path, "w", encoding="utf-8") as f:
-            metadata_line = {
-                "_type": "metadata",
-                "key": session.key,
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata,
-                "last_consolidated": session.last_consolidated
-            }
-            f.write(json.dumps(metadata_line, ensure_ascii=False) + "\n")
-            for msg in session.messages:
-                f.write(json.dumps(msg, ensure_ascii=False) + "\n")
+        """Persist a session and mark it as recently used."""
+        self.store.save(session)
+        self._touch(session)
 
-        self._cache[session.key] = session
-    
     def invalidate(self, key: str) -> None:
         """Remove a session from the in-memory cache."""
         self._cache.pop(key, None)
+        self._last_used.pop(key, None)
     
     def list_sessions(self) -> list[dict[str, Any]]:
         """
         List all sessions.
-        
+
         Returns:
-            List of session info dicts.
+            List of session info dicts, most recently updated first.
         """
-        sessions = []
-        
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path, encoding="utf-8") as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            key = data.get("key") or path.stem.replace("_", ":", 1)
-                            sessions.append({
-                                "key": key,
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
-                continue
-        
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+        return self.store.list_sessions()
+
+    def close(self) -> None:
+        """Flush cached sessions and close the underlying store."""
+        for session in self._cache.values():
+            if session.messages or session._file_size >= 0:
+                try:
+                    self.store.save(session)
+                except Exception:
+                    logger.exception("Failed to flush session {}", session.key)
+        self.store.close()
@@ -0,0 +1,156 @@
+"""SQLite session store."""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from nanobot.session.manager import Session
+from nanobot.session.store import SessionStore
+from nanobot.utils.helpers import ensure_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    last_consolidated INTEGER NOT NULL DEFAULT 0,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    byte_size INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS messages (
+    session_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_key, seq)
+) WITHOUT ROWID;
+"""
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    All sessions in one SQLite database (WAL mode).
+
+    Sessions are keyed by primary key and indexed on ``updated_at``, so listing
+    walks an index instead of scanning files. Messages are keyed by
+    (session_key, seq), which makes appends and tail reads index range scans;
+    load() decodes only the unconsolidated messages. Message count and size
+    are kept on the session row, so loading never scans the whole history.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        ensure_dir(path.parent)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Add the count/size columns to databases created before they existed."""
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(sessions)")}
+        if "message_count" in columns:
+            return
+        with self._db:
+            self._db.execute("ALTER TABLE sessions ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0")
+            self._db.execute("ALTER TABLE sessions ADD COLUMN byte_size INTEGER NOT NULL DEFAULT 0")
+            self._db.execute(
+                "UPDATE sessions SET "
+                "message_count = (SELECT COUNT(*) FROM messages WHERE session_key = key), "
+                "byte_size = (SELECT COALESCE(SUM(LENGTH(data) + 1), 0) FROM messages WHERE session_key = key)"
+            )
+
+    def load(self, key: str) -> Session | None:
+        row = self._db.execute(
+            "SELECT created_at, updated_at, metadata, last_consolidated, message_count, byte_size "
+            "FROM sessions WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        count, size = row[4], row[5]
+        # Only the unconsolidated tail is decoded; older messages load on demand.
+        offset = min(row[3], count)
+        messages = [
+            json.loads(data)
+            for (data,) in self._db.execute(
+                "SELECT data FROM messages WHERE session_key = ? AND seq >= ? ORDER BY seq", (key, offset)
+            )
+        ]
+        session = Session(
+            key=key,
+            messages=messages,
+            created_at=datetime.fromisoformat(row[0]),
+            updated_at=datetime.fromisoformat(row[1]),
+            metadata=json.loads(row[2]),
+            last_consolidated=row[3],
+        )
+        session._offset = offset
+        session._load_head = lambda: [
+            json.loads(data)
+            for (data,) in self._db.execute(
+                "SELECT data FROM messages WHERE session_key = ? AND seq < ? ORDER BY seq", (key, offset)
+            )
+        ]
+        session._persisted = count
+        session._file_size = size
+        return session
+
+    def save(self, session: Session) -> None:
+        rewrite = session._file_size < 0 or session._persisted > session.message_count
+        start = 0 if rewrite else session._persisted
+        rows = [
+            (session.key, seq, json.dumps(msg, ensure_ascii=False))
+            for seq, msg in enumerate(session.messages_from(start), start)
+        ]
+        added = sum(len(r[2]) + 1 for r in rows)
+        size = added if rewrite else session._file_size + added
+        with self._db:
+            if rewrite:
+                self._db.execute("DELETE FROM messages WHERE session_key = ?", (session.key,))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO messages (session_key, seq, data) VALUES (?, ?, ?)", rows
+            )
+            self._db.execute(
+                "INSERT INTO sessions "
+                "(key, created_at, updated_at, metadata, last_consolidated, message_count, byte_size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "updated_at = excluded.updated_at, metadata = excluded.metadata, "
+                "last_consolidated = excluded.last_consolidated, "
+                "message_count = excluded.message_count, byte_size = excluded.byte_size",
+                (
+                    session.key,
+                    session.created_at.isoformat(),
+                    session.updated_at.isoformat(),
+                    json.dumps(session.metadata, ensure_ascii=False),
+                    session.last_consolidated,
+                    session.message_count,
+                    size,
+                ),
+            )
+        session._file_size = size
+        session._persisted = session.message_count
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        rows = self._db.execute(
+            "SELECT key, created_at, updated_at FROM sessions ORDER BY updated_at DESC"
+        )
+        return [
+            {"key": key, "created_at": created_at, "updated_at": updated_at, "path": str(self.path)}
+            for key, created_at, updated_at in rows
+        ]
+
+    def tail(self, key: str, n: int) -> list[dict[str, Any]]:
+        if n <= 0:
+            return []
+        rows = self._db.execute(
+            "SELECT data FROM messages WHERE session_key = ? ORDER BY seq DESC LIMIT ?", (key, n)
+        ).fetchall()
+        return [json.loads(data) for (data,) in reversed(rows)]
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,74 @@
+"""Session storage backends."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from nanobot.session.manager import Session
+
+
+class SessionStore(ABC):
+    """
+    Abstract persistence backend for sessions.
+
+    Stores save incrementally: ``session._persisted`` counts the messages already
+    stored and ``session._file_size`` is the stored size in bytes, or -1 when the
+    stored copy must be replaced wholesale (e.g. after ``Session.clear()``).
+    Implementations keep both up to date on load and save. A store may load only
+    the unconsolidated tail of a session by setting ``session._offset`` and
+    ``session._load_head``.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Session | None:
+        """Load a session, or return None if it does not exist."""
+        pass
+
+    @abstractmethod
+    def save(self, session: Session) -> None:
+        """Persist a session, writing only what changed where possible."""
+        pass
+
+    @abstractmethod
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """Return session info dicts (key, created_at, updated_at, path), newest first."""
+        pass
+
+    def tail(self, key: str, n: int) -> list[dict[str, Any]]:
+        """Return the last ``n`` stored messages of a session."""
+        session = self.load(key)
+        if session is None or n <= 0:
+            return []
+        return session.messages_from(max(0, session.message_count - n))
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+        pass
+
+
+def create_store(workspace: Path, backend: str = "jsonl") -> SessionStore:
+    """Create the session store for a backend name ("jsonl" or "sqlite")."""
+    if backend == "sqlite":
+        from nanobot.session.sqlite_store import SqliteSessionStore
+        return SqliteSessionStore(workspace / "sessions" / "sessions.db")
+    if backend == "jsonl":
+        from nanobot.session.jsonl_store import JsonlSessionStore
+        return JsonlSessionStore(workspace)
+    raise ValueError(f"Unknown session backend: {backend}")
+
+
+def migrate_sessions(source: SessionStore, target: SessionStore) -> int:
+    """Copy every session from one store into another. Returns the number copied."""
+    count = 0
+    for info in source.list_sessions():
+        session = source.load(info["key"])
+        if session is None:
+            continue
+        session._persisted = 0
+        session._file_size = -1  # Replace whatever the target already holds
+        target.save(session)
+        count += 1
+    return count
@@ -1,7 +1,15 @@
 """Utility functions for nanobot."""
 
+import os
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: no multi-process gateway there, so no locking needed
+    fcntl = None
 
 def ensure_dir(path: Path) -> Path:
     """Ensure a directory exists, creating it if necessary."""
@@ -9,6 +17,30 @@ def ensure_dir(path: Path) -> Path:
     return path
 
 
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on ``path`` (created if missing) across processes.
+
+    Not reentrant: taking the same lock again in the same process blocks.
+    """
+    with open(path, "a") as f:
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Write a text file so that readers see either the old or the new content, never a mix."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+
+
 def get_data_path() -> Path:
     """Get the nanobot data directory (~/.nanobot)."""
     return ensure_dir(Path.home() / ".nanobot")
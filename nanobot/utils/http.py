@@ -0,0 +1,131 @@
+"""Shared, pooled HTTP client for tools and providers."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+
+class SharedHttpClient:
+    """
+    One pooled httpx.AsyncClient reused across calls.
+
+    Connections are kept alive between requests, so repeated calls to the same
+    host skip the TCP/TLS handshake. A per-host semaphore caps how many requests
+    run against one host at a time. The underlying client is created lazily on
+    first use and can be closed and recreated.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_per_host: int = 10,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        proxy: str | None = None,
+        max_redirects: int = 5,  # Matches web_fetch's MAX_REDIRECTS
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.max_per_host = max(1, max_per_host)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2
+        self._proxy = proxy or None
+        self._max_redirects = max_redirects
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._users: dict[str, int] = {}  # host -> requests holding or waiting on its slot
+
+    @classmethod
+    def from_config(cls, config: Any) -> SharedHttpClient:
+        """Build from an HttpConfig section."""
+        return cls(
+            max_connections=config.max_connections,
+            max_per_host=config.max_per_host,
+            max_keepalive=config.max_keepalive,
+            keepalive_expiry=config.keepalive_expiry,
+            http2=config.http2,
+            proxy=config.proxy,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pooled connections belong to the loop that opened them.
+            self._client = None
+            self._loop = loop
+        if self._client is None or self._client.is_closed:
+            http2 = self._http2
+            if http2:
+                try:
+                    import h2  # noqa: F401
+                except ImportError:
+                    logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+                    http2 = False
+            self._client = httpx.AsyncClient(
+                limits=self._limits,
+                http2=http2,
+                proxy=self._proxy,
+                max_redirects=self._max_redirects,
+                timeout=30.0,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request through the pool, waiting for a free slot for the host."""
+        host = urlparse(url).netloc
+        slot = self._hosts.get(host)
+        if slot is None:
+            slot = self._hosts[host] = asyncio.Semaphore(self.max_per_host)
+        self._users[host] = self._users.get(host, 0) + 1
+        try:
+            async with slot:
+                return await self.client.request(method, url, **kwargs)
+        finally:
+            remaining = self._users[host] - 1
+            if remaining:
+                self._users[host] = remaining
+            else:
+                del self._users[host]
+                del self._hosts[host]
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close pooled connections. The next request opens a new client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_shared: SharedHttpClient | None = None
+
+
+def get_http_client() -> SharedHttpClient:
+    """Return the process-wide shared client, creating it with defaults if needed."""
+    global _shared
+    if _shared is None:
+        _shared = SharedHttpClient()
+    return _shared
+
+
+def set_http_client(client: SharedHttpClient) -> None:
+    """Install ``client`` as the process-wide shared client."""
+    global _shared
+    _shared = client
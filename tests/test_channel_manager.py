@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.manager import ChannelManager
+from nanobot.config.schema import Config
+
+
+class _Recorder:
+    supports_streaming = True
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent: list[OutboundMessage] = []
+
+    async def send(self, msg: OutboundMessage) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(msg)
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_slow_channel_does_not_delay_other_channels() -> None:
+    bus = MessageBus()
+    manager = ChannelManager(Config(), bus)
+    slow, fast = _Recorder(delay=5.0), _Recorder()
+    manager.channels["slow"] = slow
+    manager.channels["fast"] = fast
+
+    await bus.publish_outbound(OutboundMessage(channel="slow", chat_id="a", content="stuck"))
+    await bus.publish_outbound(OutboundMessage(channel="fast", chat_id="b", content="hi"))
+
+    task = asyncio.create_task(manager._dispatch_outbound())
+    await _wait_for(lambda: fast.sent)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert [m.content for m in fast.sent] == ["hi"]
+    assert slow.sent == []
+    await manager._senders["slow"].stop(timeout=0)
+
+
+@pytest.mark.asyncio
+async def test_messages_to_one_chat_keep_their_order() -> None:
+    bus = MessageBus()
+    manager = ChannelManager(Config(), bus)
+    channel = _Recorder(delay=0.001)
+    manager.channels["chan"] = channel
+
+    for i in range(20):
+        await bus.publish_outbound(OutboundMessage(channel="chan", chat_id=f"chat{i % 3}", content=str(i)))
+
+    task = asyncio.create_task(manager._dispatch_outbound())
+    await _wait_for(lambda: len(channel.sent) == 20)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await manager.stop_all()
+
+    for chat in ("chat0", "chat1", "chat2"):
+        order = [int(m.content) for m in channel.sent if m.chat_id == chat]
+        assert order == sorted(order)
+    assert len(channel.sent) == 20
+
+
+class _Blocked(_Recorder):
+    def __init__(self):
+        super().__init__()
+        self.blocker = asyncio.Event()
+
+    async def send(self, msg):
+        await self.blocker.wait()
+        self.sent.append(msg)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_stream_updates_but_waits_with_replies() -> None:
+    config = Config()
+    config.channels.outbound_workers = 1
+    config.channels.outbound_queue_size = 2
+    manager = ChannelManager(config, MessageBus())
+    channel = _Blocked()
+    sender = manager._sender("chan", channel)
+
+    assert await sender.submit(OutboundMessage(channel="chan", chat_id="c", content="1"))
+    await asyncio.sleep(0)  # worker picks up "1" and blocks in send()
+    assert await sender.submit(OutboundMessage(channel="chan", chat_id="c", content="2"))
+    stream = OutboundMessage(channel="chan", chat_id="c", content="x", metadata={"_stream": True})
+    assert await sender.submit(stream)
+    assert not await sender.submit(stream)
+    assert sender.dropped == 1
+
+    third = asyncio.create_task(sender.submit(OutboundMessage(channel="chan", chat_id="c", content="3")))
+    await asyncio.sleep(0.05)
+    assert not third.done()  # two replies are unsent: the dispatcher has to wait
+
+    channel.blocker.set()
+    assert await asyncio.wait_for(third, timeout=1.0)
+    await sender.stop()
+    assert [m.content for m in channel.sent] == ["1", "2", "x", "3"]
+
+
+@pytest.mark.asyncio
+async def test_busy_chat_does_not_hold_up_other_chats_on_the_channel() -> None:
+    config = Config()
+    config.channels.outbound_workers = 2
+    manager = ChannelManager(config, MessageBus())
+    busy = next(f"a{i}" for i in range(100) if hash(f"a{i}") % 2 == 0)
+    other = next(f"b{i}" for i in range(100) if hash(f"b{i}") % 2 == 1)
+
+    class _OneChatBlocked(_Blocked):
+        async def send(self, msg):
+            if msg.chat_id == busy:
+                await self.blocker.wait()
+            self.sent.append(msg)
+
+    channel = _OneChatBlocked()
+    sender = manager._sender("chan", channel)
+    for i in range(5):
+        assert await sender.submit(OutboundMessage(channel="chan", chat_id=busy, content=str(i)))
+    await asyncio.wait_for(
+        sender.submit(OutboundMessage(channel="chan", chat_id=other, content="hi")), timeout=0.5,
+    )
+    await _wait_for(lambda: channel.sent)
+    assert [m.content for m in channel.sent] == ["hi"]
+
+    channel.blocker.set()
+    await sender.stop()
+    assert [m.content for m in channel.sent] == ["hi", "0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_full_channel_does_not_block_dispatch_to_others() -> None:
+    config = Config()
+    config.channels.outbound_workers = 1
+    config.channels.outbound_queue_size = 8
+    bus = MessageBus()
+    manager = ChannelManager(config, bus)
+    stuck, fast = _Blocked(), _Recorder()
+    manager.channels["stuck"] = stuck
+    manager.channels["fast"] = fast
+    for i in range(6):
+        await bus.publish_outbound(OutboundMessage(channel="stuck", chat_id="a", content=str(i)))
+    await bus.publish_outbound(OutboundMessage(channel="fast", chat_id="b", content="hi"))
+
+    task = asyncio.create_task(manager._dispatch_outbound())
+    await _wait_for(lambda: fast.sent, timeout=1.0)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert [m.content for m in fast.sent] == ["hi"]
+    assert manager._senders["stuck"].dropped == 0
+    stuck.blocker.set()
+    await manager.stop_all()
+    assert [m.content for m in stuck.sent] == [str(i) for i in range(6)]
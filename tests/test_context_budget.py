@@ -0,0 +1,68 @@
+"""Tests for the per-call context budget."""
+
+from nanobot.agent.budget import ContextBudget, estimate_tokens
+
+
+def _turn(i: int, tool_chars: int = 0) -> list[dict]:
+    msgs: list[dict] = [{"role": "user", "content": f"question {i}"}]
+    if tool_chars:
+        call = {"id": f"c{i}", "type": "function", "function": {"name": "read_file", "arguments": "{}"}}
+        msgs += [
+            {"role": "assistant", "content": None, "tool_calls": [call]},
+            {"role": "tool", "tool_call_id": f"c{i}", "name": "read_file", "content": "x" * tool_chars},
+        ]
+    msgs.append({"role": "assistant", "content": f"answer {i}"})
+    return msgs
+
+
+def _messages(history: list[dict]) -> tuple[list[dict], int]:
+    msgs = [{"role": "system", "content": "system"}, *history]
+    current = len(msgs)
+    msgs += [{"role": "user", "content": "runtime"}, {"role": "user", "content": "now"}]
+    return msgs, current
+
+
+def test_under_budget_returns_same_list() -> None:
+    msgs, current = _messages(_turn(1))
+    assert ContextBudget(10_000).fit(msgs, current) is msgs
+    assert ContextBudget(0).fit(msgs, current) is msgs
+
+
+def test_old_tool_results_are_elided_first() -> None:
+    msgs, current = _messages(_turn(1, tool_chars=8000) + _turn(2))
+    original = [dict(m) for m in msgs]
+    budget = ContextBudget(500)
+
+    fitted = budget.fit(msgs, current)
+
+    assert msgs == original
+    assert len(fitted) == len(msgs)
+    tool = next(m for m in fitted if m["role"] == "tool")
+    assert tool["content"].startswith("x" * 300) and "7700 more characters omitted" in tool["content"]
+    assert budget.total(fitted) <= 500
+
+
+def test_latest_tool_results_are_kept() -> None:
+    msgs, current = _messages(_turn(1))
+    msgs += _turn(2, tool_chars=400)[1:3]
+    fitted = ContextBudget(100).fit(msgs, current)
+    assert fitted[-1]["content"] == "x" * 400
+
+
+def test_whole_turns_are_dropped_oldest_first() -> None:
+    msgs, current = _messages(_turn(1) + _turn(2) + _turn(3))
+    per_turn = sum(estimate_tokens(m) for m in _turn(1))
+    budget = ContextBudget(ContextBudget(0).total(msgs) - per_turn)
+
+    fitted = budget.fit(msgs, current)
+
+    assert [m["content"] for m in fitted if m["role"] == "user"] == [
+        "question 2", "question 3", "runtime", "now",
+    ]
+    assert fitted[0]["role"] == "system"
+
+
+def test_history_can_be_dropped_entirely() -> None:
+    msgs, current = _messages(_turn(1, tool_chars=4000))
+    fitted = ContextBudget(20).fit(msgs, current)
+    assert [m["content"] for m in fitted] == ["system", "runtime", "now"]
@@ -64,3 +64,35 @@ def test_runtime_context_is_separate_untrusted_user_message(tmp_path) -> None:
 
     assert messages[-1]["role"] == "user"
     assert messages[-1]["content"] == "Return exactly: OK"
+
+
+def test_system_prompt_is_reused_until_an_input_file_changes(tmp_path) -> None:
+    workspace = _make_workspace(tmp_path)
+    builder = ContextBuilder(workspace)
+
+    prompt1 = builder.build_system_prompt()
+    assert builder.build_system_prompt() is prompt1
+
+    (workspace / "SOUL.md").write_text("Be kind.", encoding="utf-8")
+    prompt2 = builder.build_system_prompt()
+    assert "Be kind." in prompt2
+    assert builder.build_system_prompt() is prompt2
+
+    builder.memory.write_long_term("User likes tea.")
+    prompt3 = builder.build_system_prompt()
+    assert "User likes tea." in prompt3
+    assert prompt3 is not prompt2
+
+
+def test_system_prompt_picks_up_new_workspace_skill(tmp_path) -> None:
+    workspace = _make_workspace(tmp_path)
+    builder = ContextBuilder(workspace)
+    prompt1 = builder.build_system_prompt()
+
+    skill_dir = workspace / "skills" / "brewing"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text("---\ndescription: Brew tea\n---\nSteep.\n", encoding="utf-8")
+
+    prompt2 = builder.build_system_prompt()
+    assert prompt2 is not prompt1
+    assert "Brew tea" in prompt2
@@ -28,3 +28,22 @@ def test_add_job_accepts_valid_timezone(tmp_path) -> None:
 
     assert job.schedule.tz == "America/Vancouver"
     assert job.state.next_run_at_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_job_run_keeps_jobs_added_by_another_process(tmp_path) -> None:
+    store = tmp_path / "cron" / "jobs.json"
+    other = CronService(store)
+
+    async def on_job(job):
+        other.add_job(name="added meanwhile", schedule=CronSchedule(kind="every", every_ms=60_000), message="x")
+
+    gateway = CronService(store, on_job=on_job)
+    job = gateway.add_job(name="tick", schedule=CronSchedule(kind="every", every_ms=60_000), message="hi")
+
+    assert await gateway.run_job(job.id)
+
+    names = {j.name for j in CronService(store).list_jobs()}
+    assert names == {"tick", "added meanwhile"}
+    ran = next(j for j in CronService(store).list_jobs() if j.name == "tick")
+    assert ran.state.last_status == "ok"
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from nanobot.bus.durable import DurableMessageBus
+from nanobot.bus.events import InboundMessage, OutboundMessage
+
+
+def _inbound(content: str) -> InboundMessage:
+    return InboundMessage(channel="telegram", sender_id="u", chat_id="c", content=content, metadata={"id": 7})
+
+
+@pytest.mark.asyncio
+async def test_unacked_messages_are_replayed_after_restart(tmp_path) -> None:
+    path = tmp_path / "bus.db"
+    bus = DurableMessageBus(path)
+    await bus.publish_inbound(_inbound("done"))
+    await bus.publish_inbound(_inbound("in flight"))
+    await bus.publish_outbound(OutboundMessage(channel="telegram", chat_id="c", content="reply"))
+    await bus.publish_outbound(OutboundMessage(
+        channel="telegram", chat_id="c", content="partial", metadata={"_stream": True},
+    ))
+
+    bus.ack(await bus.consume_inbound())
+    await bus.consume_inbound()  # consumed but never acked
+    bus.close()
+
+    restarted = DurableMessageBus(path)
+    assert restarted.replayed == 2
+    msg = await restarted.consume_inbound()
+    assert msg.content == "in flight"
+    assert msg.metadata["id"] == 7
+    assert msg.timestamp is not None
+    assert (await restarted.consume_outbound()).content == "reply"
+    restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_reply_sharing_inbound_metadata_gets_its_own_row(tmp_path) -> None:
+    bus = DurableMessageBus(tmp_path / "bus.db")
+    await bus.publish_inbound(_inbound("hi"))
+    inbound = await bus.consume_inbound()
+
+    await bus.publish_outbound(OutboundMessage(
+        channel="telegram", chat_id="c", content="hello", metadata=inbound.metadata,
+    ))
+    bus.ack(inbound)
+
+    assert bus.pending() == 1
+    bus.ack(await bus.consume_outbound())
+    assert bus.pending() == 0
+    bus.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_send_is_retried_then_given_up(tmp_path) -> None:
+    bus = DurableMessageBus(tmp_path / "bus.db", max_attempts=2, retry_delay=0.01)
+    await bus.publish_outbound(OutboundMessage(channel="telegram", chat_id="c", content="reply"))
+
+    msg = await bus.consume_outbound()
+    bus.nack(msg)
+    retried = await asyncio.wait_for(bus.consume_outbound(), 1)
+    assert retried.content == "reply"
+    assert bus.pending() == 1
+
+    bus.nack(retried)
+    assert bus.pending() == 0
+    bus.close()
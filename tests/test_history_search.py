@@ -0,0 +1,66 @@
+"""Tests for the indexed history search."""
+
+import pytest
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.tools.history import SearchHistoryTool
+
+
+def test_appended_entries_are_ranked_and_filtered_by_date(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-03 09:00] Planned the Lisbon trip; flights booked for March.")
+    store.append_history("[2026-02-10 18:30] Talked about the garden. Lisbon came up briefly.")
+    store.append_history("[2026-02-11 08:00] Fixed the CI pipeline for the API repo.")
+
+    results = store.index.search("lisbon flights")
+    assert [r["timestamp"] for r in results] == ["2026-01-03 09:00", "2026-02-10 18:30"]
+    assert "**Lisbon**" in results[0]["snippet"]
+
+    assert [r["timestamp"] for r in store.index.search("lisbon", since="2026-02-01")] == ["2026-02-10 18:30"]
+    assert store.index.search("lisbon", until="2026-01-02") == []
+    assert store.index.search("lisbon", until="2026-01-03")[0]["timestamp"] == "2026-01-03 09:00"
+
+
+def test_external_appends_and_rewrites_are_picked_up(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-01 10:00] First entry about tea.")
+    with open(store.history_file, "a", encoding="utf-8") as f:
+        f.write("[2026-01-02 10:00] Added by hand, about coffee.\n\n")
+    store.sync_index()
+    assert len(store.index.search("coffee")) == 1
+
+    store.history_file.write_text("[2026-01-05 10:00] Rewritten, about water.\n\n", encoding="utf-8")
+    store.sync_index()
+    assert store.index.search("tea coffee") == []
+    assert len(store.index.search("water")) == 1
+
+    # Same size, different text: caught by the checksum, not the size.
+    store.history_file.write_text("[2026-01-05 10:00] Rewritten, about juice.\n\n", encoding="utf-8")
+    store.sync_index()
+    assert store.index.search("water") == []
+    assert len(store.index.search("juice")) == 1
+
+    # Rewritten to something longer: re-indexed from the start, not from the old offset.
+    store.history_file.write_text(
+        "[2026-01-06 10:00] About soup.\n\n[2026-01-07 10:00] About bread and butter.\n\n", encoding="utf-8",
+    )
+    store.sync_index()
+    assert store.index.search("juice") == []
+    assert [r["timestamp"] for r in store.index.search("soup bread")] == ["2026-01-06 10:00", "2026-01-07 10:00"]
+
+
+@pytest.mark.asyncio
+async def test_tool_searches_archived_messages(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-03-01 12:00] Discussed a recipe.")
+    store.archive_messages("telegram:1", [
+        {"role": "user", "content": "Use 200g of flour and a pinch of saffron", "timestamp": "2026-03-01T11:58:00"},
+        {"role": "assistant", "content": None, "timestamp": "2026-03-01T11:59:00"},
+    ])
+    tool = SearchHistoryTool(store)
+
+    result = await tool.execute("saffron")
+    assert result.startswith("[2026-03-01 11:58] (session:telegram:1) user: Use 200g")
+
+    assert (await tool.execute("saffron", source="history")).startswith("No history entries")
+    assert (await tool.execute("recipe", since="March")).startswith("Error: Invalid date")
@@ -0,0 +1,62 @@
+"""Tests for the shared pooled HTTP client."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from nanobot.utils.http import SharedHttpClient
+
+
+def _tracking_transport(delay: float = 0.02):
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(delay)
+        active[host] -= 1
+        return httpx.Response(200, json={"host": host, "q": request.url.params.get("q")})
+
+    return httpx.MockTransport(handler), peak
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit_and_client_reuse() -> None:
+    transport, peak = _tracking_transport()
+    http = SharedHttpClient(max_per_host=2, transport=transport)
+
+    urls = ["https://a.example/x"] * 5 + ["https://b.example/y"] * 3
+    first = http.client
+    responses = await asyncio.gather(*(http.get(u) for u in urls))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert peak == {"a.example": 2, "b.example": 2}
+    assert http.client is first
+    assert http._hosts == {} and http._users == {}
+
+    await http.aclose()
+    assert http.client is not first
+
+
+@pytest.mark.asyncio
+async def test_web_search_uses_injected_client_and_api_key() -> None:
+    from nanobot.agent.tools.web import WebSearchTool
+
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("X-Subscription-Token"))
+        return httpx.Response(200, json={"web": {"results": [
+            {"title": "Nanobot", "url": "https://example.com", "description": "A bot"},
+        ]}})
+
+    http = SharedHttpClient(transport=httpx.MockTransport(handler))
+    tool = WebSearchTool(api_key="k123", http=http)
+    result = await tool.execute(query="nanobot")
+
+    assert seen == ["k123"]
+    assert "1. Nanobot" in result
+    await http.aclose()
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.ipc import IpcBroker, IpcMessageBus, shard_for
+from nanobot.bus.queue import MessageBus
+
+
+def _inbound(chat_id: str, channel: str = "telegram", content: str = "hi") -> InboundMessage:
+    return InboundMessage(channel=channel, sender_id="u", chat_id=chat_id, content=content)
+
+
+def test_system_messages_shard_with_their_origin_session() -> None:
+    announce = _inbound("telegram:42", channel="system")
+    assert shard_for(announce, 4) == shard_for(_inbound("42"), 4)
+
+
+@pytest.mark.asyncio
+async def test_broker_routes_by_session_and_relays_replies(tmp_path) -> None:
+    bus = MessageBus()
+    broker = IpcBroker(bus, tmp_path / "gw.sock", workers=2)
+    await broker.start()
+    workers = [IpcMessageBus(tmp_path / "gw.sock", i) for i in range(2)]
+    for worker in workers:
+        await worker.connect()
+
+    chats = [str(i) for i in range(6)]
+    for chat in chats:
+        await bus.publish_inbound(_inbound(chat))
+
+    for _ in range(200):
+        if sum(w.inbound_size for w in workers) == len(chats):
+            break
+        await asyncio.sleep(0.01)
+
+    for index, worker in enumerate(workers):
+        for _ in range(worker.inbound_size):
+            msg = await worker.consume_inbound()
+            assert shard_for(msg, 2) == index
+            chats.remove(msg.chat_id)
+    assert chats == []
+
+    await workers[1].publish_outbound(OutboundMessage(channel="telegram", chat_id="3", content="reply"))
+    reply = await asyncio.wait_for(bus.consume_outbound(), 2)
+    assert reply.content == "reply"
+
+    for worker in workers:
+        worker.close()
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_unacked_messages_are_resent_after_a_worker_reconnects(tmp_path) -> None:
+    bus = MessageBus()
+    broker = IpcBroker(bus, tmp_path / "gw.sock", workers=1)
+    await broker.start()
+    crashed = IpcMessageBus(tmp_path / "gw.sock", 0)
+    await crashed.connect()
+
+    await bus.publish_inbound(_inbound("1"))
+    first = await asyncio.wait_for(crashed.consume_inbound(), 2)
+    crashed.close()  # dies before finishing the turn
+    await asyncio.sleep(0.05)
+
+    worker = IpcMessageBus(tmp_path / "gw.sock", 0)
+    await worker.connect()
+    again = await asyncio.wait_for(worker.consume_inbound(), 2)
+    assert again.chat_id == first.chat_id == "1"
+
+    worker.ack(again)
+    for _ in range(200):
+        if not broker._unacked[0]:
+            break
+        await asyncio.sleep(0.01)
+    assert broker._unacked[0] == {}
+
+    worker.close()
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_backlog_stays_on_the_bus_while_a_worker_is_away(tmp_path) -> None:
+    bus = MessageBus()
+    broker = IpcBroker(bus, tmp_path / "gw.sock", workers=1, queue_size=1)
+    await broker.start()
+
+    for chat in ("1", "2", "3"):
+        await bus.publish_inbound(_inbound(chat))
+    await asyncio.sleep(0.05)
+    assert bus.inbound_size == 1  # one frame queued for the worker, one waiting to be queued
+
+    await broker.stop()
@@ -7,23 +7,21 @@ tool call response, it should serialize them to JSON instead of raising TypeErro
 
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 
 import pytest
 
 from nanobot.agent.memory import MemoryStore
 from nanobot.providers.base import LLMResponse, ToolCallRequest
+from nanobot.session.manager import Session
 
 
 def _make_session(message_count: int = 30, memory_window: int = 50):
-    """Create a mock session with messages."""
-    session = MagicMock()
-    session.messages = [
+    """Create a session with messages."""
+    return Session(key="test:consolidate", messages=[
         {"role": "user", "content": f"msg{i}", "timestamp": "2026-01-01 00:00"}
         for i in range(message_count)
-    ]
-    session.last_consolidated = 0
-    return session
+    ])
 
 
 def _make_tool_response(history_entry, memory_update):
@@ -145,3 +143,97 @@ class TestMemoryConsolidationTypeHandling:
 
         assert result is True
         provider.chat.assert_not_called()
+
+
+def _edits_response(entry: str, edits: list[dict]) -> LLMResponse:
+    return LLMResponse(
+        content=None,
+        tool_calls=[ToolCallRequest(
+            id="call_1", name="save_memory", arguments={"history_entry": entry, "memory_edits": edits},
+        )],
+    )
+
+
+class TestChunkedConsolidation:
+    """Long backlogs are consolidated in token-bounded windows."""
+
+    @pytest.mark.asyncio
+    async def test_backlog_is_split_and_progress_advances_per_chunk(self, tmp_path: Path) -> None:
+        store = MemoryStore(tmp_path)
+        provider = AsyncMock()
+        provider.chat = AsyncMock(side_effect=[
+            _edits_response("[2026-01-01 00:00] first", [{"new": "- likes tea", "section": "Preferences"}]),
+            _edits_response("[2026-01-01 00:00] second", [{"old": "likes tea", "new": "likes green tea"}]),
+            LLMResponse(content="no tool call", tool_calls=[]),
+        ])
+        session = Session(key="test:chunks", messages=[
+            {"role": "user", "content": "x" * 400, "timestamp": "2026-01-01 00:00"} for _ in range(6)
+        ])
+
+        result = await store.consolidate(session, provider, "test-model", archive_all=True, chunk_tokens=250)
+
+        assert result is False
+        assert provider.chat.await_count == 3
+        assert session.last_consolidated == 4  # two windows of two messages survived the failure
+        assert store.read_long_term() == "## Preferences\n- likes green tea\n"
+        history = store.history_file.read_text()
+        assert "first" in history and "second" in history
+
+    @pytest.mark.asyncio
+    async def test_memory_edits_leave_other_facts_untouched(self, tmp_path: Path) -> None:
+        store = MemoryStore(tmp_path)
+        store.write_long_term("# Memory\n\n## User\n- name: Sam\n\n## Projects\n- nanobot\n")
+        provider = AsyncMock()
+        provider.chat = AsyncMock(return_value=_edits_response(
+            "[2026-01-01 00:00] chat", [{"new": "- timezone: UTC", "section": "User"}, {"old": "- nanobot\n", "new": ""}],
+        ))
+
+        assert await store.consolidate(_make_session(message_count=60), provider, "test-model", memory_window=50)
+        assert store.read_long_term() == "# Memory\n\n## User\n- name: Sam\n- timezone: UTC\n\n## Projects\n"
+
+    @pytest.mark.asyncio
+    async def test_edits_apply_to_memory_written_during_the_llm_call(self, tmp_path: Path) -> None:
+        store = MemoryStore(tmp_path)
+        store.write_long_term("## User\n- name: Sam\n")
+
+        async def chat(**kwargs):
+            # Another worker's consolidation lands while this one waits on the LLM.
+            MemoryStore(tmp_path).write_long_term("## User\n- name: Sam\n- city: Oslo\n")
+            return _edits_response("[2026-01-01 00:00] chat", [{"new": "- timezone: UTC", "section": "User"}])
+
+        provider = AsyncMock()
+        provider.chat = AsyncMock(side_effect=chat)
+
+        assert await store.consolidate(_make_session(message_count=60), provider, "test-model", memory_window=50)
+        assert store.read_long_term() == "## User\n- name: Sam\n- city: Oslo\n- timezone: UTC\n"
+
+    @pytest.mark.asyncio
+    async def test_large_memory_is_cut_to_its_share_of_the_chunk(self, tmp_path: Path) -> None:
+        store = MemoryStore(tmp_path)
+        store.write_long_term("## Facts\n" + "- fact\n" * 2000)
+        provider = AsyncMock()
+        provider.chat = AsyncMock(return_value=_edits_response("[2026-01-01 00:00] chat", []))
+
+        assert await store.consolidate(_make_session(message_count=60), provider, "test-model", chunk_tokens=1000)
+        for call in provider.chat.await_args_list:
+            prompt = call.kwargs["messages"][1]["content"]
+            assert len(prompt) < 1000 * 4 + 500  # budget plus the fixed instructions
+            assert "more characters not shown" in prompt
+
+    @pytest.mark.asyncio
+    async def test_refused_rewrite_does_not_advance(self, tmp_path: Path) -> None:
+        store = MemoryStore(tmp_path)
+        store.write_long_term("old")
+
+        async def chat(**kwargs):
+            MemoryStore(tmp_path).write_long_term("changed by another worker")
+            return _make_tool_response("[2026-01-01 00:00] chat", "rewritten")
+
+        provider = AsyncMock()
+        provider.chat = AsyncMock(side_effect=chat)
+        session = _make_session(message_count=60)
+
+        assert not await store.consolidate(session, provider, "test-model", memory_window=50)
+        assert session.last_consolidated == 0
+        assert store.read_long_term() == "changed by another worker"
+        assert not store.history_file.exists() or "chat" not in store.history_file.read_text()
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import BUSY_REPLY, MessageBus
+
+
+def _inbound(content: str, channel: str = "telegram", **metadata) -> InboundMessage:
+    return InboundMessage(channel=channel, sender_id="u", chat_id="c", content=content, metadata=metadata)
+
+
+@pytest.mark.asyncio
+async def test_interactive_messages_are_served_before_background_and_system() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_inbound("cron", _lane="background"))
+    await bus.publish_inbound(_inbound("announce", channel="system"))
+    await bus.publish_inbound(_inbound("hello"))
+
+    order = [(await bus.consume_inbound()).content for _ in range(3)]
+
+    assert order == ["hello", "announce", "cron"]
+    stats = bus.stats()["inbound"]
+    assert stats["interactive"]["enqueued"] == 1
+    assert stats["background"]["depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_consume_from_selected_lanes_or_matching_messages() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_inbound("hello"))
+    await bus.publish_inbound(_inbound("/stop"))
+    await bus.publish_inbound(_inbound("cron", _lane="background"))
+
+    assert (await bus.consume_inbound(("background",))).content == "cron"
+    assert (await bus.consume_inbound((), match=lambda m: m.content == "/stop")).content == "/stop"
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(bus.consume_inbound(("system",)), timeout=0.05)
+    assert (await bus.consume_inbound()).content == "hello"
+    assert _inbound("x", _lane="background").lane == "background"
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_the_newest_messages() -> None:
+    bus = MessageBus(queue_size=2, overflow="drop_oldest")
+    for i in range(4):
+        assert await bus.publish_inbound(_inbound(str(i)))
+
+    assert [(await bus.consume_inbound()).content for _ in range(2)] == ["2", "3"]
+    assert bus.stats()["inbound"]["interactive"]["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reject_tells_the_sender_to_retry() -> None:
+    bus = MessageBus(queue_size=1, overflow="reject")
+    assert await bus.publish_inbound(_inbound("first"))
+    assert not await bus.publish_inbound(_inbound("second"))
+
+    reply = await bus.consume_outbound()
+    assert reply.content == BUSY_REPLY
+    assert (reply.channel, reply.chat_id) == ("telegram", "c")
+    assert bus.stats()["inbound"]["interactive"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_block_waits_for_room_in_the_full_lane_only() -> None:
+    bus = MessageBus(queue_size=1, background_queue_size=1)
+    await bus.publish_outbound(OutboundMessage(channel="x", chat_id="c", content="bg1"), lane="background")
+    blocked = asyncio.create_task(
+        bus.publish_outbound(OutboundMessage(channel="x", chat_id="c", content="bg2"), lane="background")
+    )
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    # Other lanes are unaffected by the full background lane.
+    await asyncio.wait_for(bus.publish_outbound(OutboundMessage(channel="x", chat_id="c", content="hi")), 1)
+
+    assert (await bus.consume_outbound()).content == "hi"
+    assert (await bus.consume_outbound()).content == "bg1"
+    await asyncio.wait_for(blocked, 1)
+    assert (await bus.consume_outbound()).content == "bg2"
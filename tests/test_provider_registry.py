@@ -0,0 +1,123 @@
+"""Tests for provider registry lookups and the LiteLLM request plan."""
+
+from unittest.mock import patch
+
+from nanobot.config.schema import Config
+from nanobot.providers.litellm_provider import LiteLLMProvider, plan_cache_breakpoints
+from nanobot.providers.registry import find_by_model, find_by_name, match_model
+
+
+def test_match_model_orders_prefix_before_keywords() -> None:
+    names = [spec.name for spec in match_model("github-copilot/gpt-5.3-codex")]
+    assert names[0] == "github_copilot"
+    assert "openai_codex" in names[1:]
+    assert match_model("no-such-model") == ()
+    assert find_by_model("Kimi-K2.5").name == "moonshot"
+    assert find_by_name("moonshot") is find_by_model("kimi-k2.5")
+
+
+def test_config_skips_matches_without_credentials() -> None:
+    config = Config()
+    config.agents.defaults.model = "kimi-k2.5"
+    config.providers.openrouter.api_key = "sk-or-x"
+    assert config.get_provider_name() == "openrouter"  # fallback: moonshot has no key
+
+    config.providers.moonshot.api_key = "sk-m"
+    assert config.get_provider_name() == "moonshot"
+
+
+def test_request_plan_is_built_once_per_model() -> None:
+    provider = LiteLLMProvider(default_model="kimi-k2.5", extra_headers={"X-App": "1"})
+    messages = [{"role": "user", "content": "hi"}]
+
+    with patch("nanobot.providers.litellm_provider.find_by_model", wraps=find_by_model) as lookups:
+        provider._build_kwargs(messages, None, None, 100, 0.1)
+        first = lookups.call_count
+        for _ in range(3):
+            kwargs = provider._build_kwargs(messages, None, None, 100, 0.1)
+
+    assert first > 0 and lookups.call_count == first
+    assert kwargs["model"] == "moonshot/kimi-k2.5"
+    assert kwargs["temperature"] == 1.0
+    assert kwargs["extra_headers"] == {"X-App": "1"}
+
+
+def test_prepared_messages_only_process_new_messages() -> None:
+    provider = LiteLLMProvider(default_model="anthropic/claude-opus-4-5")
+    tools = [{"type": "function", "function": {"name": "t", "parameters": {}}}]
+    messages = [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "hi", "timestamp": "x"},
+    ]
+    prepared = provider._build_kwargs(messages, tools, None, 100, 0.1)
+    assert prepared["messages"][0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert "timestamp" not in prepared["messages"][1]
+
+    messages.append({"role": "assistant", "content": ""})
+    with patch.object(provider, "_prepare_message", wraps=provider._prepare_message) as prepare:
+        again = provider._build_kwargs(messages, tools, None, 100, 0.1)
+
+    assert prepare.call_count == 1
+    assert again["messages"][0] is prepared["messages"][0]
+    assert again["messages"][1] == {"role": "user", "content": "hi"}
+    assert again["messages"][2]["content"][0]["text"] == "(empty)"
+    assert again["tools"] is prepared["tools"] and again["tools"][-1]["cache_control"]
+
+    # A list that diverges (e.g. trimmed history) is re-prepared from the first change.
+    trimmed = [messages[0], {"role": "user", "content": "short"}]
+    assert provider._build_kwargs(trimmed, tools, None, 100, 0.1)["messages"][1]["content"][0]["text"] == "short"
+
+
+def _turn_messages() -> list[dict]:
+    call = {"id": "c1", "type": "function", "function": {"name": "read_file", "arguments": "{}"}}
+    return [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "earlier question"},
+        {"role": "assistant", "content": "earlier answer"},
+        {"role": "user", "content": "runtime context"},
+        {"role": "user", "content": "question"},
+        {"role": "assistant", "content": None, "tool_calls": [call]},
+        {"role": "tool", "tool_call_id": "c1", "content": "file body"},
+    ]
+
+
+def test_breakpoints_mark_latest_message_and_history_end() -> None:
+    messages = _turn_messages()
+    assert plan_cache_breakpoints(messages, 2) == [6, 2]
+    assert plan_cache_breakpoints(messages, 1) == [6]
+    assert plan_cache_breakpoints(messages[:6], 2) == [4, 2]  # tool-call message has no text
+    assert plan_cache_breakpoints(messages[:1] + messages[3:5], 2) == [2]
+
+
+def test_request_uses_at_most_the_allowed_breakpoints() -> None:
+    provider = LiteLLMProvider(default_model="anthropic/claude-opus-4-5")
+    tools = [{"type": "function", "function": {"name": "t", "parameters": {}}}]
+    kwargs = provider._build_kwargs(_turn_messages(), tools, None, 100, 0.1)
+
+    def _marked(msg: dict) -> bool:
+        return isinstance(msg["content"], list) and "cache_control" in msg["content"][-1]
+
+    assert [i for i, m in enumerate(kwargs["messages"]) if _marked(m)] == [0, 2, 6]
+    assert "cache_control" in kwargs["tools"][-1]
+    # Providers without prompt caching are left alone.
+    plain = LiteLLMProvider(default_model="deepseek/deepseek-chat")._build_kwargs(_turn_messages(), tools, None, 100, 0.1)
+    assert not any(_marked(m) for m in plain["messages"])
+
+
+def test_usage_reports_cache_tokens() -> None:
+    from types import SimpleNamespace
+
+    from nanobot.providers.base import usage_to_dict
+
+    anthropic = SimpleNamespace(
+        prompt_tokens=100, completion_tokens=5, total_tokens=105,
+        cache_read_input_tokens=80, cache_creation_input_tokens=15, prompt_tokens_details=None,
+    )
+    openai = SimpleNamespace(
+        prompt_tokens=100, completion_tokens=5, total_tokens=105, prompt_tokens_details={"cached_tokens": 64},
+    )
+    assert usage_to_dict(anthropic) == {
+        "prompt_tokens": 100, "completion_tokens": 5, "total_tokens": 105,
+        "cache_read_tokens": 80, "cache_write_tokens": 15,
+    }
+    assert usage_to_dict(openai)["cache_read_tokens"] == 64
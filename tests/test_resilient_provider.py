@@ -0,0 +1,154 @@
+"""Tests for retries, circuit breaking and fallback in ResilientProvider."""
+
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk
+from nanobot.providers.resilient import (
+    CircuitBreaker,
+    ResilientProvider,
+    classify_error,
+    retry_after,
+)
+
+
+class _StatusError(Exception):
+    def __init__(self, status: int, headers: dict[str, str] | None = None):
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+        self.response = httpx.Response(status, headers=headers or {})
+
+
+class _ScriptedProvider(LLMProvider):
+    """Returns the queued outcomes in order; an exception becomes an error response."""
+
+    def __init__(self, name: str, outcomes: list[Any]):
+        super().__init__()
+        self.name = name
+        self.outcomes = list(outcomes)
+        self.models: list[str | None] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        self.models.append(model)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            return LLMResponse(content=f"Error calling LLM: {outcome}", finish_reason="error", error=outcome)
+        return LLMResponse(content=outcome)
+
+    def get_default_model(self) -> str:
+        return self.name
+
+
+def test_errors_are_classified_by_status_type_and_text() -> None:
+    assert classify_error(_StatusError(429)) == "rate_limit"
+    assert classify_error(_StatusError(529)) == "overloaded"
+    assert classify_error(_StatusError(502)) == "server"
+    assert classify_error(_StatusError(401)) == "auth"
+    assert classify_error(_StatusError(400)) == "bad_request"
+    assert classify_error(httpx.ReadTimeout("slow")) == "timeout"
+    assert classify_error(None, "Error: Overloaded") == "overloaded"
+    assert retry_after(_StatusError(429, {"retry-after": "2"})) == 2.0
+    assert retry_after(_StatusError(429, {"retry-after-ms": "1500"})) == 1.5
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_honouring_retry_after(monkeypatch) -> None:
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr("nanobot.providers.resilient.asyncio.sleep", fake_sleep)
+    primary = _ScriptedProvider("main", [_StatusError(529), _StatusError(429, {"retry-after": "7"}), "ok"])
+    provider = ResilientProvider(primary, max_attempts=3, base_delay=1.0)
+
+    response = await provider.chat([{"role": "user", "content": "hi"}], model="main-model")
+
+    assert response.content == "ok"
+    assert primary.models == ["main-model"] * 3
+    assert 0 <= sleeps[0] <= 1.0 and sleeps[1] == 7.0
+
+
+@pytest.mark.asyncio
+async def test_fails_over_to_fallback_and_trips_breaker(monkeypatch) -> None:
+    async def no_sleep(delay: float) -> None:
+        pass
+
+    monkeypatch.setattr("nanobot.providers.resilient.asyncio.sleep", no_sleep)
+    primary = _ScriptedProvider("main", [_StatusError(401), _StatusError(401)])
+    backup = _ScriptedProvider("backup", ["from backup", "again from backup"])
+    provider = ResilientProvider(primary, [(backup, "backup-model")], breaker_threshold=2)
+
+    assert (await provider.chat([], model="main-model")).content == "from backup"
+    assert backup.models == ["backup-model"]
+    assert len(primary.models) == 1  # auth errors are not retried
+
+    await provider.chat([], model="main-model")
+    assert len(primary.models) == 2
+    # Two consecutive failures: the primary is now skipped outright.
+    backup.outcomes.append("third")
+    assert (await provider.chat([], model="main-model")).content == "third"
+    assert len(primary.models) == 2
+
+
+def test_breaker_allows_one_trial_after_cooldown(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("nanobot.providers.resilient.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(threshold=1, cooldown=10)
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    now[0] += 10
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_stream_is_not_retried_after_text_was_sent() -> None:
+    class _Streaming(_ScriptedProvider):
+        async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            self.models.append(model)
+            yield StreamChunk(delta="partial")
+            yield StreamChunk(response=LLMResponse(content="Error: 529", finish_reason="error"))
+
+    primary = _Streaming("main", [])
+    backup = _ScriptedProvider("backup", ["unused"])
+    provider = ResilientProvider(primary, [(backup, "backup-model")])
+
+    chunks = [c async for c in provider.chat_stream([], model="m")]
+
+    assert [c.delta for c in chunks if c.delta] == ["partial"]
+    assert chunks[-1].response.finish_reason == "error"
+    assert backup.models == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_call_does_not_wedge_the_breaker(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("nanobot.providers.resilient.time.monotonic", lambda: now[0])
+    started = asyncio.Event()
+
+    class _Hanging(_ScriptedProvider):
+        async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            if self.outcomes and self.outcomes[0] == "hang":
+                self.outcomes.pop(0)
+                started.set()
+                await asyncio.Event().wait()
+            return await super().chat(messages, tools, model, max_tokens, temperature)
+
+    primary = _Hanging("main", [_StatusError(401), "hang", "recovered"])
+    provider = ResilientProvider(primary, breaker_threshold=1, breaker_cooldown=10)
+    await provider.chat([], model="m")  # trips the breaker
+
+    now[0] += 10
+    trial = asyncio.create_task(provider.chat([], model="m"))
+    await started.wait()
+    trial.cancel()
+    await asyncio.gather(trial, return_exceptions=True)
+
+    assert (await provider.chat([], model="m")).content == "recovered"
@@ -0,0 +1,151 @@
+"""Tests for latency-aware routing and hedging in RoutingProvider."""
+
+import asyncio
+
+import pytest
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk
+from nanobot.providers.routing import BackendProfile, RoutingProvider, allow_hedging, hedging
+
+
+class _TimedProvider(LLMProvider):
+    """Answers after ``delay`` seconds, or with an error when ``fail`` is set."""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            return LLMResponse(content="Error calling LLM: 503", finish_reason="error")
+        return LLMResponse(content=f"from {self.name}")
+
+    def get_default_model(self) -> str:
+        return self.name
+
+
+def _warm(router: RoutingProvider, latencies: dict[str, float], samples: int = 10) -> None:
+    for backend in router.backends:
+        for _ in range(samples):
+            backend.profile.record(latencies[backend.model], ok=True)
+
+
+@pytest.fixture(autouse=True)
+def _no_hedging():
+    allow_hedging(False)
+    yield
+    allow_hedging(False)
+
+
+@pytest.mark.asyncio
+async def test_routes_to_fastest_backend_and_fails_over() -> None:
+    slow, fast = _TimedProvider("slow"), _TimedProvider("fast")
+    router = RoutingProvider([(slow, "slow"), (fast, "fast")], explore=0)
+    _warm(router, {"slow": 2.0, "fast": 0.5})
+
+    assert (await router.chat([])).content == "from fast"
+    assert slow.calls == 0
+
+    fast.fail = True
+    assert (await router.chat([])).content == "from slow"
+    assert router.stats()[1]["error_rate"] > 0
+
+
+@pytest.mark.asyncio
+async def test_untried_backends_are_tried_first() -> None:
+    known, new = _TimedProvider("known"), _TimedProvider("new")
+    router = RoutingProvider([(known, "known"), (new, "new")], explore=0)
+    router.backends[0].profile.record(0.1, ok=True)
+
+    await router.chat([])
+    assert new.calls == 1 and known.calls == 0
+
+
+def test_backend_with_only_lost_hedges_counts_as_untried() -> None:
+    profile = BackendProfile()
+    profile.record_lost()
+    assert profile.score() == 0.0
+
+    profile.record(0.5, ok=True)
+    assert profile.score() > 0.5
+
+
+def test_hedging_scope_restores_previous_setting() -> None:
+    from nanobot.providers.routing import _hedging
+
+    with hedging(True):
+        assert _hedging.get() is True
+        with hedging(False):
+            assert _hedging.get() is False
+        assert _hedging.get() is True
+    assert _hedging.get() is False
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_when_allowed() -> None:
+    primary, backup = _TimedProvider("primary", delay=0.5), _TimedProvider("backup", delay=0.01)
+    router = RoutingProvider([(primary, "primary"), (backup, "backup")], hedge=True, min_hedge_delay=0.05, explore=0)
+    _warm(router, {"primary": 0.01, "backup": 0.02})
+
+    allow_hedging(True)
+    assert (await router.chat([])).content == "from backup"
+    await asyncio.sleep(0)
+    assert primary.calls == 1 and primary.cancelled == 1
+
+    # The abandoned call is not a latency sample, but it does count against the backend.
+    slow = router.backends[0].profile
+    assert len(slow.latencies) == 10 and slow.lost_rate > 0
+    assert router.stats()[0]["hedges_lost"] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_permission() -> None:
+    primary, backup = _TimedProvider("primary", delay=0.2), _TimedProvider("backup", delay=0.01)
+    router = RoutingProvider([(primary, "primary"), (backup, "backup")], hedge=True, min_hedge_delay=0.05, explore=0)
+    _warm(router, {"primary": 0.01, "backup": 0.02})
+
+    assert (await router.chat([])).content == "from primary"
+    assert backup.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_until_text_is_sent() -> None:
+    class _Streaming(_TimedProvider):
+        def __init__(self, name: str, deltas: list[str], fail: bool):
+            super().__init__(name, fail=fail)
+            self.deltas = deltas
+
+        async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            self.calls += 1
+            for delta in self.deltas:
+                yield StreamChunk(delta=delta)
+            if self.fail:
+                yield StreamChunk(response=LLMResponse(content="Error: 503", finish_reason="error"))
+            else:
+                yield StreamChunk(response=LLMResponse(content="".join(self.deltas)))
+
+    down = _Streaming("down", [], fail=True)
+    up = _Streaming("up", ["he", "llo"], fail=False)
+    router = RoutingProvider([(down, "down"), (up, "up")], explore=0)
+    _warm(router, {"down": 0.1, "up": 0.2})
+
+    chunks = [c async for c in router.chat_stream([])]
+    assert [c.delta for c in chunks if c.delta] == ["he", "llo"]
+    assert chunks[-1].response.content == "hello" and down.calls == 1
+
+    # A backend that fails mid-stream ends the turn: its text was already sent.
+    partial = _Streaming("partial", ["par"], fail=True)
+    router = RoutingProvider([(partial, "partial"), (up, "up")], explore=0)
+    _warm(router, {"partial": 0.1, "up": 0.2})
+    chunks = [c async for c in router.chat_stream([])]
+    assert chunks[-1].response.finish_reason == "error" and up.calls == 1
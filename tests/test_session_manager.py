@@ -0,0 +1,309 @@
+"""Tests for SessionManager persistence."""
+
+import json
+from pathlib import Path
+
+from nanobot.session.manager import Session, SessionManager
+
+
+def _lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def test_save_appends_only_new_messages(tmp_path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("test:append")
+    session.add_message("user", "one")
+    manager.save(session)
+    path = manager.store._get_session_path("test:append")
+    first_bytes = path.read_bytes()
+
+    session.add_message("assistant", "two")
+    session.last_consolidated = 1
+    manager.save(session)
+
+    records = _lines(path)
+    assert [r.get("content") for r in records if r.get("_type") != "metadata"] == ["one", "two"]
+    assert records[-1]["_type"] == "metadata"
+    assert records[-1]["last_consolidated"] == 1
+    # The first save's bytes are untouched by the second save.
+    assert path.read_bytes().startswith(first_bytes)
+    assert len([r for r in records if r.get("_type") == "metadata"]) == 2
+
+
+def test_reload_uses_latest_metadata_record(tmp_path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("test:reload")
+    for i in range(3):
+        session.add_message("user", f"m{i}")
+        session.last_consolidated = i
+        manager.save(session)
+
+    fresh = SessionManager(tmp_path).get_or_create("test:reload")
+    assert [m["content"] for m in fresh.messages] == ["m0", "m1", "m2"]
+    assert fresh.last_consolidated == 2
+
+
+def test_clear_rewrites_file(tmp_path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("test:clear")
+    session.add_message("user", "old")
+    manager.save(session)
+
+    session.clear()
+    session.add_message("user", "new")
+    manager.save(session)
+
+    records = _lines(manager.store._get_session_path("test:clear"))
+    assert [r.get("content") for r in records if r.get("_type") != "metadata"] == ["new"]
+    assert len([r for r in records if r.get("_type") == "metadata"]) == 1
+
+
+def test_compacts_after_many_metadata_records(tmp_path) -> None:
+    manager = SessionManager(tmp_path)
+    manager.store._COMPACT_AFTER = 3
+    session = manager.get_or_create("test:compact")
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+
+    records = _lines(manager.store._get_session_path("test:compact"))
+    assert len([r for r in records if r.get("_type") == "metadata"]) <= 3
+    assert [r["content"] for r in records if r.get("_type") != "metadata"] == [f"m{i}" for i in range(5)]
+
+
+def test_torn_trailing_write_is_skipped_and_repaired(tmp_path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("test:torn")
+    session.add_message("user", "kept")
+    manager.save(session)
+    path = manager.store._get_session_path("test:torn")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"role": "user", "content": "half')
+
+    reloaded = SessionManager(tmp_path).get_or_create("test:torn")
+    assert [m["content"] for m in reloaded.messages] == ["kept"]
+
+    reloaded.add_message("user", "after")
+    SessionManager(tmp_path).save(reloaded)
+    assert [r.get("content") for r in _lines(path) if r.get("_type") != "metadata"] == ["kept", "after"]
+
+
+def test_legacy_metadata_first_line_is_readable(tmp_path) -> None:
+    manager = SessionManager(tmp_path)
+    path = manager.store._get_session_path("test:legacy")
+    meta = {
+        "_type": "metadata", "key": "test:legacy", "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-02T00:00:00", "metadata": {}, "last_consolidated": 1,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(meta) + "\n")
+        f.write(json.dumps({"role": "user", "content": "hi"}) + "\n")
+
+    session = manager.get_or_create("test:legacy")
+    assert session.last_consolidated == 1
+    assert [m["content"] for m in session.messages] == ["hi"]
+    assert manager.list_sessions()[0]["updated_at"] == "2026-01-02T00:00:00"
+
+
+def test_list_sessions_reads_trailing_metadata(tmp_path) -> None:
+    manager = SessionManager(tmp_path)
+    session = Session(key="test:list")
+    session.add_message("user", "x" * 20000)
+    manager.save(session)
+
+    listed = manager.list_sessions()
+    assert listed[0]["key"] == "test:list"
+    assert listed[0]["updated_at"] == session.updated_at.isoformat()
+
+
+def test_lru_evicts_and_flushes_least_recently_used(tmp_path) -> None:
+    manager = SessionManager(tmp_path, max_cached=2)
+    a = manager.get_or_create("test:a")
+    a.add_message("user", "unsaved")
+    manager.get_or_create("test:b")
+    manager.get_or_create("test:a")  # a is now most recently used
+    manager.get_or_create("test:c")  # evicts b, which never had anything to flush
+
+    assert list(manager._cache) == ["test:a", "test:c"]
+    assert not manager.store._get_session_path("test:b").exists()
+
+    manager.get_or_create("test:d")  # evicts a and flushes its pending message
+    assert "test:a" not in manager._cache
+    reloaded = manager.get_or_create("test:a")
+    assert reloaded is not a
+    assert [m["content"] for m in reloaded.messages] == ["unsaved"]
+    assert manager.cache_stats["evictions"] == 3
+    assert manager.cache_stats["hits"] == 1
+
+
+def test_idle_sessions_are_evicted_but_pinned_ones_stay(tmp_path, monkeypatch) -> None:
+    import nanobot.session.manager as mod
+
+    now = [1000.0]
+    monkeypatch.setattr(mod.time, "monotonic", lambda: now[0])
+    manager = SessionManager(tmp_path, idle_ttl=60)
+    idle = manager.get_or_create("test:idle")
+    pinned = manager.get_or_create("test:pinned")
+    manager.pin("test:pinned")
+
+    now[0] += 120
+    manager.get_or_create("test:fresh")
+    assert "test:idle" not in manager._cache
+    assert manager.get_or_create("test:pinned") is pinned
+
+    manager.unpin("test:pinned")
+    now[0] += 120
+    manager.get_or_create("test:fresh")
+    assert list(manager._cache) == ["test:fresh"]
+    assert idle is not manager.get_or_create("test:idle")
+
+
+def test_byte_bound_keeps_the_session_in_use(tmp_path) -> None:
+    manager = SessionManager(tmp_path, max_cached_bytes=1000)
+    big = manager.get_or_create("test:big")
+    big.add_message("user", "x" * 2000)
+    manager.save(big)
+    assert "test:big" in manager._cache  # over the bound, but just used
+
+    manager.get_or_create("test:small")
+    assert list(manager._cache) == ["test:small"]
+
+
+def test_sqlite_store_round_trip_and_tail(tmp_path) -> None:
+    from nanobot.session.sqlite_store import SqliteSessionStore
+
+    store = SqliteSessionStore(tmp_path / "sessions.db")
+    manager = SessionManager(tmp_path, store=store)
+    session = manager.get_or_create("test:sql")
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+        session.last_consolidated = i
+        manager.save(session)
+    other = manager.get_or_create("test:other")
+    other.add_message("user", "newer")
+    manager.save(other)
+
+    assert store.tail("test:sql", 2) == session.messages[-2:]
+    assert [s["key"] for s in manager.list_sessions()] == ["test:other", "test:sql"]
+    manager.close()
+
+    reopened = SqliteSessionStore(tmp_path / "sessions.db")
+    loaded = reopened.load("test:sql")
+    assert [m["content"] for m in loaded.messages_from(0)] == [f"m{i}" for i in range(5)]
+    assert loaded.last_consolidated == 4
+
+    loaded.clear()
+    loaded.add_message("user", "fresh")
+    reopened.save(loaded)
+    assert [m["content"] for m in reopened.load("test:sql").messages] == ["fresh"]
+    reopened.close()
+
+
+def test_migrate_jsonl_sessions_to_sqlite(tmp_path) -> None:
+    from nanobot.session.store import create_store, migrate_sessions
+
+    manager = SessionManager(tmp_path)
+    for key in ("test:one", "test:two"):
+        session = manager.get_or_create(key)
+        session.add_message("user", key)
+        session.last_consolidated = 1
+        manager.save(session)
+
+    target = create_store(tmp_path, "sqlite")
+    assert migrate_sessions(manager.store, target) == 2
+    assert migrate_sessions(manager.store, target) == 2  # re-running replaces, not duplicates
+    migrated = target.load("test:two")
+    assert [m["content"] for m in migrated.messages_from(0)] == ["test:two"]
+    assert migrated.last_consolidated == 1
+    assert migrated.updated_at == manager.get_or_create("test:two").updated_at
+    target.close()
+
+
+def test_large_session_loads_only_unconsolidated_tail(tmp_path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("test:tail")
+    for i in range(10):
+        session.add_message("user", f"m{i}")
+    session.last_consolidated = 6
+    manager.save(session)
+
+    store = SessionManager(tmp_path).store
+    store._LAZY_MIN_BYTES = 0
+    store._TAIL_BLOCK = 64  # force several backward reads
+    lazy = store.load("test:tail")
+    assert lazy._offset == 6
+    assert [m["content"] for m in lazy.messages] == ["m6", "m7", "m8", "m9"]
+    assert lazy.message_count == 10
+    assert [m["content"] for m in lazy.get_history()] == ["m6", "m7", "m8", "m9"]
+
+    lazy.add_message("user", "m10")
+    store.save(lazy)  # appends without reading the head
+    assert lazy._offset == 6
+
+    assert [m["content"] for m in lazy.messages_from(0)] == [f"m{i}" for i in range(11)]
+    assert lazy._offset == 0
+    full = SessionManager(tmp_path).get_or_create("test:tail")
+    assert [m["content"] for m in full.messages] == [f"m{i}" for i in range(11)]
+
+
+def test_tail_load_falls_back_for_files_without_message_count(tmp_path) -> None:
+    manager = SessionManager(tmp_path)
+    path = manager.store._get_session_path("test:old")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"role": "user", "content": "a"}) + "\n")
+        f.write(json.dumps({"_type": "metadata", "key": "test:old", "last_consolidated": 1}) + "\n")
+
+    manager.store._LAZY_MIN_BYTES = 0
+    session = manager.get_or_create("test:old")
+    assert session._offset == 0
+    assert [m["content"] for m in session.messages] == ["a"]
+    assert session.last_consolidated == 1
+
+
+def test_sqlite_store_loads_tail_and_materializes_on_demand(tmp_path) -> None:
+    from nanobot.session.sqlite_store import SqliteSessionStore
+
+    store = SqliteSessionStore(tmp_path / "sessions.db")
+    session = Session(key="test:sqltail")
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+    session.last_consolidated = 3
+    store.save(session)
+
+    lazy = store.load("test:sqltail")
+    assert [m["content"] for m in lazy.messages] == ["m3", "m4"]
+    assert [m["content"] for m in lazy.messages_from(1)] == ["m1", "m2", "m3", "m4"]
+    store.close()
+
+
+def test_sqlite_store_keeps_counts_on_the_session_row(tmp_path) -> None:
+    import sqlite3
+
+    from nanobot.session.sqlite_store import SqliteSessionStore
+
+    path = tmp_path / "sessions.db"
+    store = SqliteSessionStore(path)
+    session = Session(key="test:counts")
+    for i in range(3):
+        session.add_message("user", f"m{i}")
+    store.save(session)
+    session.add_message("user", "m3")
+    store.save(session)
+    store.close()
+
+    # A database from before the columns existed is backfilled on open.
+    db = sqlite3.connect(str(path))
+    db.execute("ALTER TABLE sessions DROP COLUMN message_count")
+    db.execute("ALTER TABLE sessions DROP COLUMN byte_size")
+    db.commit()
+    db.close()
+
+    store = SqliteSessionStore(path)
+    count, size = store._db.execute(
+        "SELECT message_count, byte_size FROM sessions WHERE key = 'test:counts'"
+    ).fetchone()
+    loaded = store.load("test:counts")
+    assert count == loaded._persisted == 4
+    assert size == loaded._file_size == session._file_size
+    store.close()
@@ -0,0 +1,63 @@
+"""Tests for the indexed SkillsLoader."""
+
+from pathlib import Path
+
+from nanobot.agent.skills import SkillsLoader
+
+
+def _write_skill(root: Path, name: str, frontmatter: str, body: str = "Body.") -> Path:
+    skill_dir = root / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    path = skill_dir / "SKILL.md"
+    path.write_text(f"---\n{frontmatter}\n---\n{body}\n", encoding="utf-8")
+    return path
+
+
+def test_index_reads_each_skill_once(tmp_path, monkeypatch) -> None:
+    builtin = tmp_path / "builtin"
+    _write_skill(builtin, "alpha", "description: Alpha skill")
+    _write_skill(builtin, "beta", 'description: Beta\nmetadata: {"nanobot": {"always": true}}')
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=builtin)
+
+    reads = []
+    original = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: reads.append(self) or original(self, *a, **k))
+
+    for _ in range(3):
+        summary = loader.build_skills_summary()
+        assert loader.get_always_skills() == ["beta"]
+        assert loader.list_skills()
+        loader.signature()
+    assert "Alpha skill" in summary
+    assert len(reads) == 2
+
+
+def test_index_picks_up_new_and_edited_workspace_skills(tmp_path) -> None:
+    workspace = tmp_path / "ws"
+    loader = SkillsLoader(workspace, builtin_skills_dir=tmp_path / "builtin")
+    assert loader.list_skills() == []
+
+    path = _write_skill(workspace / "skills", "gamma", "description: First")
+    assert loader.get_skill_metadata("gamma")["description"] == "First"
+
+    path.write_text("---\ndescription: Second version\n---\nBody.\n", encoding="utf-8")
+    assert loader.get_skill_metadata("gamma")["description"] == "Second version"
+
+
+def test_requirement_lookups_are_cached(tmp_path, monkeypatch) -> None:
+    import nanobot.agent.skills as mod
+
+    builtin = tmp_path / "builtin"
+    _write_skill(builtin, "tool", 'metadata: {"nanobot": {"requires": {"bins": ["sometool"]}}}')
+    calls = []
+    monkeypatch.setattr(mod.shutil, "which", lambda b: calls.append(b) or None)
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=builtin, requirements_ttl=60)
+
+    assert loader.list_skills() == []
+    assert "CLI: sometool" in loader.build_skills_summary()
+    assert calls == ["sometool"]
+
+    monkeypatch.setattr(mod.shutil, "which", lambda b: "/usr/bin/" + b)
+    assert loader.list_skills() == []  # still cached
+    loader._which.clear()  # TTL expired
+    assert [s["name"] for s in loader.list_skills()] == ["tool"]
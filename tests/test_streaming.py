@@ -0,0 +1,161 @@
+"""Tests for streamed LLM responses and progressive outbound edits."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamAccumulator, StreamChunk
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls, reasoning_content=None)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)],
+        usage=usage,
+    )
+
+
+def _tc_delta(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def test_accumulator_assembles_text_and_tool_call_fragments() -> None:
+    acc = StreamAccumulator()
+    deltas = [
+        acc.add(_chunk(content="Hel")),
+        acc.add(_chunk(content="lo")),
+        acc.add(_chunk(tool_calls=[_tc_delta(0, id="call_1", name="web_fetch", arguments='{"url": ')])),
+        acc.add(_chunk(tool_calls=[_tc_delta(0, arguments='"https://x.io"}')])),
+        acc.add(_chunk(finish_reason="tool_calls")),
+    ]
+    response = acc.response()
+
+    assert deltas == ["Hel", "lo", "", "", ""]
+    assert response.content == "Hello"
+    assert response.finish_reason == "tool_calls"
+    assert len(response.tool_calls) == 1
+    assert response.tool_calls[0].id == "call_1"
+    assert response.tool_calls[0].name == "web_fetch"
+    assert response.tool_calls[0].arguments == {"url": "https://x.io"}
+
+
+class _StaticProvider(LLMProvider):
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        return LLMResponse(content="done")
+
+    def get_default_model(self) -> str:
+        return "static"
+
+
+@pytest.mark.asyncio
+async def test_default_chat_stream_falls_back_to_chat() -> None:
+    chunks = [c async for c in _StaticProvider().chat_stream(messages=[])]
+    assert len(chunks) == 1
+    assert chunks[0].delta == ""
+    assert chunks[0].response.content == "done"
+
+
+class _StreamingProvider(LLMProvider):
+    def __init__(self, parts: list[str]):
+        super().__init__()
+        self.parts = parts
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        raise AssertionError("chat() should not be used when streaming")
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        for part in self.parts:
+            yield StreamChunk(delta=part)
+        yield StreamChunk(response=LLMResponse(content="".join(self.parts)))
+
+    def get_default_model(self) -> str:
+        return "streaming"
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_publishes_stream_edits_and_tags_final_reply(tmp_path) -> None:
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.events import InboundMessage
+    from nanobot.bus.queue import MessageBus
+    from nanobot.config.schema import ChannelsConfig
+
+    bus = MessageBus()
+    provider = _StreamingProvider(["Hello", " <think>hidden", "</think>", " world"])
+    loop = AgentLoop(
+        bus=bus, provider=provider, workspace=tmp_path,
+        channels_config=ChannelsConfig(stream_replies=True, stream_interval=0),
+    )
+
+    msg = InboundMessage(channel="telegram", sender_id="u1", chat_id="c1", content="hi")
+    response = await loop._process_message(msg)
+
+    updates = []
+    while bus.outbound_size:
+        updates.append(await bus.consume_outbound())
+
+    assert [u.content for u in updates] == ["Hello", "Hello  world"]
+    assert all(u.metadata["_stream"] for u in updates)
+    stream_id = updates[0].metadata["_stream_id"]
+    assert response.content == "Hello  world"
+    assert response.metadata["_stream_id"] == stream_id
+    assert "_stream" not in response.metadata
+
+
+@pytest.mark.asyncio
+async def test_codex_sse_yields_deltas_then_response() -> None:
+    from nanobot.providers.openai_codex_provider import _stream_sse
+
+    events = [
+        {"type": "response.output_text.delta", "delta": "Hi"},
+        {"type": "response.output_text.delta", "delta": " there"},
+        {"type": "response.completed", "response": {"status": "completed"}},
+    ]
+
+    async def _fake_iter_sse(_response):
+        for e in events:
+            yield e
+
+    with patch("nanobot.providers.openai_codex_provider._iter_sse", _fake_iter_sse):
+        chunks = [c async for c in _stream_sse(MagicMock())]
+
+    assert [c.delta for c in chunks[:-1]] == ["Hi", " there"]
+    assert chunks[-1].response.content == "Hi there"
+    assert chunks[-1].response.finish_reason == "stop"
+
+
+@pytest.mark.asyncio
+async def test_channel_manager_drops_stream_updates_for_non_streaming_channels() -> None:
+    from nanobot.bus.events import OutboundMessage
+    from nanobot.bus.queue import MessageBus
+    from nanobot.channels.manager import ChannelManager
+    from nanobot.config.schema import Config
+
+    bus = MessageBus()
+    manager = ChannelManager(Config(), bus)
+    sent = []
+
+    class _Plain:
+        supports_streaming = False
+
+        async def send(self, m):
+            sent.append(m)
+
+    manager.channels["plain"] = _Plain()
+    await bus.publish_outbound(OutboundMessage(
+        channel="plain", chat_id="c", content="part", metadata={"_stream": True, "_stream_id": "s"},
+    ))
+    await bus.publish_outbound(OutboundMessage(channel="plain", chat_id="c", content="final"))
+
+    task = asyncio.create_task(manager._dispatch_outbound())
+    for _ in range(50):
+        if sent:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert [m.content for m in sent] == ["final"]
@@ -104,7 +104,7 @@ class TestDispatch:
         assert out.content == "hi"
 
     @pytest.mark.asyncio
-    async def test_processing_lock_serializes(self):
+    async def test_same_session_serializes(self):
         from nanobot.bus.events import InboundMessage, OutboundMessage
 
         loop, bus = _make_loop()
@@ -125,6 +125,150 @@ class TestDispatch:
         await asyncio.gather(t1, t2)
         assert order == ["start-a", "end-a", "start-b", "end-b"]
 
+    @pytest.mark.asyncio
+    async def test_different_sessions_run_concurrently(self):
+        from nanobot.bus.events import InboundMessage, OutboundMessage
+
+        loop, bus = _make_loop()
+        order = []
+
+        async def mock_process(m, **kwargs):
+            order.append(f"start-{m.chat_id}")
+            await asyncio.sleep(0.05)
+            order.append(f"end-{m.chat_id}")
+            return OutboundMessage(channel="test", chat_id=m.chat_id, content=m.content)
+
+        loop._process_message = mock_process
+        msg1 = InboundMessage(channel="test", sender_id="u1", chat_id="c1", content="a")
+        msg2 = InboundMessage(channel="test", sender_id="u2", chat_id="c2", content="b")
+
+        await asyncio.gather(loop._dispatch(msg1), loop._dispatch(msg2))
+        assert order[:2] == ["start-c1", "start-c2"]
+        assert not loop._scheduler.is_busy("test:c1")
+
+    @pytest.mark.asyncio
+    async def test_global_cap_limits_concurrent_sessions(self):
+        from nanobot.agent.scheduler import SessionScheduler
+        from nanobot.bus.events import InboundMessage, OutboundMessage
+
+        loop, bus = _make_loop()
+        loop._scheduler = SessionScheduler(max_concurrent=2)
+        active = 0
+        peak = 0
+
+        async def mock_process(m, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return OutboundMessage(channel="test", chat_id=m.chat_id, content=m.content)
+
+        loop._process_message = mock_process
+        msgs = [
+            InboundMessage(channel="test", sender_id="u", chat_id=f"c{i}", content="x")
+            for i in range(5)
+        ]
+        await asyncio.gather(*(loop._dispatch(m) for m in msgs))
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_background_turns_are_capped_separately(self):
+        from nanobot.agent.scheduler import SessionScheduler
+        from nanobot.bus.events import InboundMessage, OutboundMessage
+
+        loop, bus = _make_loop()
+        loop._scheduler = SessionScheduler(max_concurrent=3, max_background=1)
+        active: dict[str, int] = {"background": 0, "interactive": 0}
+        peak: dict[str, int] = {"background": 0, "interactive": 0}
+
+        async def mock_process(m, **kwargs):
+            lane = m.metadata.get("_lane", "interactive")
+            active[lane] += 1
+            peak[lane] = max(peak[lane], active[lane])
+            await asyncio.sleep(0.02)
+            active[lane] -= 1
+            return OutboundMessage(channel="test", chat_id=m.chat_id, content=m.content)
+
+        loop._process_message = mock_process
+        msgs = [
+            InboundMessage(channel="test", sender_id="u", chat_id=f"b{i}", content="x", metadata={"_lane": "background"})
+            for i in range(3)
+        ] + [InboundMessage(channel="test", sender_id="u", chat_id=f"c{i}", content="x") for i in range(2)]
+        await asyncio.gather(*(loop._dispatch(m) for m in msgs))
+        assert peak == {"background": 1, "interactive": 2}
+
+    @pytest.mark.asyncio
+    async def test_run_leaves_backlog_on_the_bus_until_a_slot_frees(self):
+        from nanobot.agent.scheduler import SessionScheduler
+        from nanobot.bus.events import InboundMessage
+
+        loop, bus = _make_loop()
+        loop._scheduler = SessionScheduler(max_concurrent=1)
+        release = asyncio.Event()
+        started = []
+
+        async def mock_process(m, **kwargs):
+            started.append(m.chat_id)
+            await release.wait()
+            return None
+
+        loop._process_message = mock_process
+        for i in range(3):
+            await bus.publish_inbound(InboundMessage(channel="test", sender_id="u", chat_id=f"c{i}", content="x"))
+        runner = asyncio.create_task(loop.run())
+        try:
+            await asyncio.sleep(0.05)
+            assert started == ["c0"] and bus.inbound_size == 2
+
+            # /stop still gets through while every slot is taken.
+            await bus.publish_inbound(InboundMessage(channel="test", sender_id="u", chat_id="c0", content="/stop"))
+            out = await asyncio.wait_for(bus.consume_outbound(), timeout=1.0)
+            assert "Stopped 1" in out.content
+            await asyncio.sleep(0.05)
+            assert started == ["c0", "c1"] and bus.inbound_size == 1
+
+            release.set()
+            await asyncio.sleep(0.05)
+            assert started == ["c0", "c1", "c2"] and bus.inbound_size == 0
+        finally:
+            release.set()
+            loop.stop()
+            await asyncio.wait_for(runner, timeout=2.0)
+
+    @pytest.mark.asyncio
+    async def test_system_message_serialized_with_origin_session(self):
+        from nanobot.bus.events import InboundMessage
+
+        loop, _ = _make_loop()
+        msg = InboundMessage(channel="system", sender_id="subagent", chat_id="test:c1", content="x")
+        assert loop._dispatch_key(msg) == "test:c1"
+
+    @pytest.mark.asyncio
+    async def test_tool_context_is_task_local(self):
+        from nanobot.agent.tools.message import MessageTool
+
+        sent = []
+
+        async def _send(msg):
+            sent.append((msg.channel, msg.chat_id))
+
+        tool = MessageTool(send_callback=_send)
+
+        async def turn(chat_id):
+            tool.set_context("test", chat_id)
+            tool.start_turn()
+            await asyncio.sleep(0.01)
+            await tool.execute(content="hi")
+            return tool._sent_in_turn
+
+        results = await asyncio.gather(
+            asyncio.create_task(turn("c1")), asyncio.create_task(turn("c2")),
+        )
+        assert results == [True, True]
+        assert sorted(sent) == [("test", "c1"), ("test", "c2")]
+        assert tool._sent_in_turn is False
+
 
 class TestSubagentCancellation:
     @pytest.mark.asyncio
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
@@ -86,3 +87,73 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+class _SlowTool(Tool):
+    def __init__(self, name: str, safe: bool, log: list[str]):
+        self._name = name
+        self._safe = safe
+        self._log = log
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "slow tool"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"tag": {"type": "string"}}}
+
+    @property
+    def concurrency_safe(self) -> bool:
+        return self._safe
+
+    async def execute(self, tag: str = "", **kwargs: Any) -> str:
+        self._log.append(f"start-{tag}")
+        await asyncio.sleep(0.01)
+        self._log.append(f"end-{tag}")
+        return tag
+
+
+async def test_execute_batch_runs_safe_calls_concurrently_in_order() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(_SlowTool("fetch", True, log))
+    results = await reg.execute_batch([("fetch", {"tag": "a"}), ("fetch", {"tag": "b"})])
+    assert results == ["a", "b"]
+    assert log[:2] == ["start-a", "start-b"]
+
+
+async def test_execute_batch_keeps_unsafe_calls_sequential() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(_SlowTool("fetch", True, log))
+    reg.register(_SlowTool("write", False, log))
+    results = await reg.execute_batch([
+        ("fetch", {"tag": "a"}), ("write", {"tag": "w"}), ("fetch", {"tag": "b"}),
+    ])
+    assert results == ["a", "w", "b"]
+    assert log == ["start-a", "end-a", "start-w", "end-w", "start-b", "end-b"]
+
+
+async def test_execute_batch_sequential_when_parallel_disabled() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(_SlowTool("fetch", True, log))
+    await reg.execute_batch([("fetch", {"tag": "a"}), ("fetch", {"tag": "b"})], parallel=False)
+    assert log == ["start-a", "end-a", "start-b", "end-b"]
+
+
+def test_definitions_are_cached_until_registry_changes() -> None:
+    reg = ToolRegistry()
+    reg.register(SampleTool())
+    first = reg.get_definitions()
+    assert reg.get_definitions() is first
+
+    reg.unregister("missing")
+    assert reg.get_definitions() is first
+    reg.unregister("sample")
+    assert reg.get_definitions() == []
@@ -0,0 +1,104 @@
+"""Tests for the web_fetch tool."""
+
+import json
+import threading
+
+import httpx
+import pytest
+
+from nanobot.agent.tools import web
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.agent.tools.web_cache import WebFetchCache
+from nanobot.utils.http import SharedHttpClient
+
+PAGE = (
+    "<html><head><title>Tea Guide</title></head><body><article>"
+    "<h2>Brewing</h2><p>Steep green tea at <a href='https://t.example/temp'>80 degrees</a> "
+    "for two minutes, then pour. Longer steeping makes it bitter.</p>"
+    "<p>" + "Black tea takes boiling water and four minutes. " * 20 + "</p>"
+    "</article></body></html>"
+)
+
+
+def _html_client(body: str) -> SharedHttpClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=body, headers={"content-type": "text/html"})
+
+    return SharedHttpClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_extraction_runs_off_the_event_loop(monkeypatch) -> None:
+    threads = []
+    extract = web.extract_readable
+
+    def tracking(page, mode):
+        threads.append(threading.current_thread())
+        return extract(page, mode)
+
+    monkeypatch.setattr(web, "extract_readable", tracking)
+    tool = WebFetchTool(http=_html_client(PAGE))
+
+    result = json.loads(await tool.execute("https://t.example/guide"))
+
+    assert threads and threads[0] is not threading.main_thread()
+    assert result["extractor"] == "readability"
+    assert result["text"].startswith("# Tea Guide")
+    assert "[80 degrees](https://t.example/temp)" in result["text"]
+
+
+@pytest.mark.asyncio
+async def test_page_is_capped_before_parsing(monkeypatch) -> None:
+    seen = []
+    monkeypatch.setattr(web, "extract_readable", lambda page, mode: seen.append(len(page)) or "x")
+    tool = WebFetchTool(http=_html_client(PAGE), max_html_chars=200)
+
+    await tool.execute("https://t.example/guide", extractMode="text")
+
+    assert seen == [200]
+
+
+def _counting_client(requests: list[httpx.Request]) -> SharedHttpClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="plain body", headers={"content-type": "text/plain", "etag": '"v1"'})
+
+    return SharedHttpClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_cached_page_is_served_then_revalidated(tmp_path) -> None:
+    requests: list[httpx.Request] = []
+    cache = WebFetchCache(tmp_path / "cache.db", ttl=3600)
+    tool = WebFetchTool(http=_counting_client(requests), cache=cache)
+
+    first = await tool.execute("https://t.example/a")
+    assert await tool.execute("https://t.example/a") == first
+    assert len(requests) == 1
+
+    # Another extract mode is a separate entry.
+    await tool.execute("https://t.example/a", extractMode="text")
+    assert len(requests) == 2
+
+    cache.ttl = 0
+    assert await tool.execute("https://t.example/a") == first
+    assert requests[-1].headers["if-none-match"] == '"v1"'
+    assert cache.stats == {"hits": 1, "revalidated": 1, "misses": 2}
+    cache.close()
+
+
+def test_cache_evicts_least_recently_used_and_matches_domain_ttls(tmp_path) -> None:
+    cache = WebFetchCache(tmp_path / "cache.db", max_bytes=250, domain_ttls={"github.com": 60, "api.github.com": 5})
+    cache.put("a", "x" * 100, None, None)
+    cache.put("b", "y" * 100, None, None)
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.put("c", "z" * 100, None, None)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.ttl_for("raw.github.com") == 60
+    assert cache.ttl_for("api.github.com") == 5
+    assert cache.ttl_for("example.com") == cache.ttl
+    cache.close()
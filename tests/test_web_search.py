@@ -0,0 +1,61 @@
+"""Tests for web_search result caching."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from nanobot.agent.tools.web import WebSearchTool
+from nanobot.agent.tools.web_cache import SearchCache
+from nanobot.utils.http import SharedHttpClient
+
+
+def _brave(calls: list[str], delay: float = 0.0, status: int = 200) -> SharedHttpClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["q"])
+        await asyncio.sleep(delay)
+        results = [{"title": "Tea", "url": "https://t.example", "description": "About tea"}]
+        return httpx.Response(status, json={"web": {"results": results}})
+
+    return SharedHttpClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_share_one_request() -> None:
+    calls: list[str] = []
+    cache = SearchCache(ttl=60)
+    tool = WebSearchTool(api_key="k", http=_brave(calls, delay=0.05), cache=cache)
+
+    results = await asyncio.gather(
+        tool.execute("green tea"), tool.execute("Green  Tea"), tool.execute("green tea"),
+    )
+    again = await tool.execute("GREEN TEA")
+
+    assert calls == ["green tea"]
+    assert len(set(results)) == 1 and again == results[0]
+    assert cache.stats == {"hits": 1, "misses": 1, "coalesced": 2, "hit_rate": 0.75}
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached() -> None:
+    calls: list[str] = []
+    tool = WebSearchTool(api_key="k", http=_brave(calls, status=500), cache=SearchCache(ttl=60))
+
+    assert (await tool.execute("tea")).startswith("Error:")
+    assert (await tool.execute("tea")).startswith("Error:")
+    assert calls == ["tea", "tea"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_request() -> None:
+    calls: list[str] = []
+    tool = WebSearchTool(api_key="k", http=_brave(calls, delay=0.05), cache=SearchCache(ttl=60))
+
+    first = asyncio.create_task(tool.execute("tea"))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(tool.execute("tea"))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert "Tea" in await second
+    assert calls == ["tea"]